@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import platform
+import random
+import sys
+import tempfile
+import timeit
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import job_finder as jf  # noqa: E402
+
+HERE = Path(__file__).resolve().parent
+FIXTURE_DIR = HERE / "bench_fixtures"
+BASELINE_PATH = HERE / "bench_baseline.json"
+PROFILE_PATH = HERE / "job_profile.moritzfrisch.json"
+DEFAULT_SIZES = [10, 100, 1000]
+
+# Pages recorded with --record: (fixture kind, source, url)
+RECORD_TARGETS = [
+    ("arbeitnow", "Arbeitnow", "https://www.arbeitnow.com/api/job-board-api?page=1"),
+    ("remotive", "Remotive", "https://remotive.com/api/remote-jobs"),
+    ("jsonld", "StepStone", "https://www.stepstone.de/jobs/politik/in-berlin"),
+    ("anchors", "GesinesJobtipps", "https://gesinesjobtipps.de/region/berlin-und-umgebung/"),
+    ("anchors", "Interamt", "https://interamt.de/koop/app/trefferliste?5"),
+    ("anchors", "BMI", "https://www.bmi.bund.de/DE/service/stellenangebote/stellenangebote-node.html"),
+    ("anchors", "BMWK", "https://www.bundeswirtschaftsministerium.de/Navigation/DE/Ministerium/Stellenangebote/stellenangebote.html"),
+    ("karriereportal", "KarriereportalBerlin", "https://www.karriereportal-stellen.berlin.de/stellenangebote.html?filter%5Bvolltext%5D="),
+]
+
+ROLES = ["Referent", "Referentin", "Sachbearbeiter", "Projektmanager", "Leitung", "Koordinator", "Manager", "Berater"]
+TOPICS = ["Politik", "Digitalpolitik", "Kommunikation", "Public Affairs", "Haushalt", "Grundsatzfragen", "Datenschutz", "Bildung", "Energie"]
+COMPANIES = ["Bundesministerium des Innern", "Stiftung Zukunft GmbH", "Verband Digitales e.V.", "Land Berlin", "Agentur Nord AG", "Deutsche Bahn", "Campact e.V."]
+PLACES = ["Berlin", "Potsdam", "Hamburg", "Remote", "Berlin-Mitte", "Bonn"]
+FILLER = '<div class="teaser"><p>Informationen zu Ausbildung, Karriere und Behördenalltag.</p><a href="/service/kontakt">Kontakt</a></div>\n'
+
+
+def rand_title(rng: random.Random) -> str:
+    title = f"{rng.choice(ROLES)} {rng.choice(TOPICS)} (m/w/d)"
+    if rng.random() < 0.3:
+        title += f" Referat Z {rng.randint(1, 40)}"
+    return title
+
+
+def rand_job(rng: random.Random, n: int) -> dict:
+    return {
+        "source": rng.choice(["StepStone", "Interamt", "BMI", "Arbeitnow"]),
+        "title": rand_title(rng),
+        "company": rng.choice(COMPANIES),
+        "location": rng.choice(PLACES),
+        "remote": rng.random() < 0.2,
+        "tags": [],
+        "description": f"Wir suchen Verstärkung für {rng.choice(TOPICS)} in {rng.choice(PLACES)}.",
+        "url": f"https://jobs.example.org/stelle/{n}",
+        "publishedAt": f"2026-10-{rng.randint(1, 18):02d}T08:00:00Z",
+        "ageDays": rng.randint(0, 30),
+    }
+
+
+def jsonld_page(rng: random.Random, size: int) -> str:
+    postings = []
+    for n in range(size):
+        job = rand_job(rng, n)
+        postings.append(
+            {
+                "@type": "JobPosting",
+                "title": job["title"],
+                "url": f"/stellenangebote--{job['title'].replace(' ', '-')}--{100000 + n}-inline.html",
+                "hiringOrganization": {"@type": "Organization", "name": job["company"]},
+                "jobLocation": {"@type": "Place", "address": {"addressLocality": job["location"]}},
+                "description": "<p>" + job["description"] + "</p>",
+                "datePosted": job["publishedAt"],
+            }
+        )
+    head = '<html><head><meta name="description" content="Stellenangebote"><script type="application/ld+json">'
+    body = json.dumps({"@context": "https://schema.org", "@graph": postings}, ensure_ascii=False)
+    return head + body + "</script></head><body>" + FILLER * size + "</body></html>"
+
+
+def anchor_page(rng: random.Random, size: int) -> str:
+    parts = ["<html><head><title>Stellenangebote</title></head><body><nav>"]
+    parts += [f'<a href="/navigation/{k}">Menüpunkt {k}</a>' for k in range(20)]
+    parts.append("</nav><ul>")
+    for n in range(size):
+        parts.append(f'<li><a class="job" href="/stellenangebote/{n}.html"><span>{rand_title(rng)}</span> <em>{rng.choice(PLACES)}</em></a></li>')
+        parts.append(FILLER)
+    parts.append("</ul></body></html>")
+    return "".join(parts)
+
+
+def karriereportal_page(rng: random.Random, size: int) -> str:
+    base = "https://www.karriereportal-stellen.berlin.de"
+    parts = ["<html><body>"]
+    for n in range(size):
+        slug = rand_title(rng).lower().replace(" ", "-").replace("(", "").replace(")", "").replace("/", "")
+        if n % 3:
+            parts.append(f'<a href="{base}/{slug}-de-j{5000 + n}.html" title="{slug}">{rand_title(rng)}</a>')
+        else:
+            parts.append(f'<script>var job = "{base}/{slug}-de-j{5000 + n}.html";</script>')
+        parts.append(FILLER)
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def arbeitnow_body(rng: random.Random, size: int) -> str:
+    data = []
+    for n in range(size):
+        job = rand_job(rng, n)
+        data.append({"title": job["title"], "company_name": job["company"], "location": job["location"], "remote": job["remote"],
+                     "tags": ["politics"], "description": job["description"], "url": job["url"], "created_at": 1760000000 + n})
+    return json.dumps({"data": data, "links": {"next": None}}, ensure_ascii=False)
+
+
+def remotive_body(rng: random.Random, size: int) -> str:
+    data = []
+    for n in range(size):
+        job = rand_job(rng, n)
+        data.append({"title": job["title"], "company_name": job["company"], "candidate_required_location": job["location"],
+                     "tags": [], "description": job["description"], "url": job["url"], "publication_date": job["publishedAt"]})
+    return json.dumps({"jobs": data}, ensure_ascii=False)
+
+
+def raw_titles(rng: random.Random, size: int) -> list[str]:
+    noise = ["", " GoodCompany Top-Arbeitgeber", " Zu den Ersten gehören", " <b>neu</b>", " .x-badge{color:red}"]
+    return [f"{rand_title(rng)} {rng.choice(COMPANIES)}{rng.choice(noise)}" for _ in range(size)]
+
+
+def job_list(rng: random.Random, size: int) -> list[dict]:
+    jobs = [rand_job(rng, n) for n in range(size)]
+    # Roughly every sixth posting is a cross-posted or slightly reworded copy.
+    for n in range(size // 6):
+        dup = dict(rng.choice(jobs[: size - size // 6] or jobs))
+        dup["source"] = "Interamt"
+        dup["url"] = f"https://interamt.de/koop/app/stelle?id={n}"
+        jobs.append(dup)
+    return [jf.Job.from_dict(j) for j in jobs]
+
+
+# Fixture kind -> parser that turns one recorded page into jobs.
+PARSERS = {
+    "jsonld": ("parse_jsonld_jobs", lambda body, source, url: jf.parse_jsonld_jobs(body, source, url)),
+    "anchors": ("parse_anchor_jobs", lambda body, source, url: jf.parse_anchor_jobs(body, source, url)),
+    "karriereportal": ("parse_karriereportal_berlin_jobs", lambda body, source, url: jf.parse_karriereportal_berlin_jobs(body, url)),
+    "arbeitnow": ("arbeitnow_jobs_from_body", lambda body, source, url: jf.arbeitnow_jobs_from_body(json.loads(body))),
+    "remotive": ("remotive_jobs_from_body", lambda body, source, url: jf.remotive_jobs_from_body(json.loads(body))),
+}
+SYNTHETIC_PAGES = {
+    "jsonld": ("StepStone", "https://www.stepstone.de/jobs/politik/in-berlin", jsonld_page),
+    "anchors": ("BMI", "https://www.bmi.bund.de/DE/service/stellenangebote/stellenangebote-node.html", anchor_page),
+    "karriereportal": ("KarriereportalBerlin", "https://www.karriereportal-stellen.berlin.de/stellenangebote.html", karriereportal_page),
+    "arbeitnow": ("Arbeitnow", "https://www.arbeitnow.com/api/job-board-api?page=1", arbeitnow_body),
+    "remotive": ("Remotive", "https://remotive.com/api/remote-jobs", remotive_body),
+}
+PAGES_PER_CASE = 5
+REFERENCE_NAME = "reference"
+# API feeds as the page strategies parse them: streamed in chunks, postings filtered as they arrive.
+STREAM_FEEDS = {"arbeitnow": ("data", jf.arbeitnow_job), "remotive": ("jobs", jf.remotive_job)}
+STREAM_CHUNK = 64 * 1024
+
+
+def load_fixtures(fixture_dir: Path) -> list[dict]:
+    index = fixture_dir / "index.json"
+    if not index.exists():
+        return []
+    entries = json.loads(index.read_text(encoding="utf-8"))
+    for e in entries:
+        e["body"] = (fixture_dir / e["file"]).read_text(encoding="utf-8")
+    return entries
+
+
+def record_fixtures(fixture_dir: Path) -> int:
+    fixture_dir.mkdir(parents=True, exist_ok=True)
+    entries = []
+    for n, (kind, source, url) in enumerate(RECORD_TARGETS):
+        try:
+            body = jf.fetch_text(url)
+        except Exception as e:
+            print(f"skip {source} ({url}): {e}", file=sys.stderr)
+            continue
+        name = f"{kind}-{jf.norm(source)}-{n}.{'json' if kind in {'arbeitnow', 'remotive'} else 'html'}"
+        (fixture_dir / name).write_text(body, encoding="utf-8")
+        entries.append({"file": name, "kind": kind, "source": source, "url": url})
+        print(f"recorded {name} ({len(body)} chars)")
+    (fixture_dir / "index.json").write_text(json.dumps(entries, indent=2) + "\n", encoding="utf-8")
+    jf.close_session()
+    return 0 if entries else 1
+
+
+def build_cases(sizes: list[int], fixtures: list[dict], config: dict) -> list[dict]:
+    # Each case: name, size label, inputs, number of pages, run(inputs) -> result list.
+    cases = []
+
+    def parse_all(kind):
+        parse = PARSERS[kind][1]
+        return lambda pages: [j for body, source, url in pages for j in parse(body, source, url)]
+
+    for kind, (name, _) in PARSERS.items():
+        source, url, make = SYNTHETIC_PAGES[kind]
+        for size in sizes:
+            rng = random.Random(f"{kind}-{size}")
+            pages = [(make(rng, size), source, url) for _ in range(PAGES_PER_CASE)]
+            cases.append({"name": name, "size": str(size), "inputs": pages, "pages": len(pages), "run": parse_all(kind)})
+        recorded = [(e["body"], e["source"], e["url"]) for e in fixtures if e["kind"] == kind]
+        if recorded:
+            cases.append({"name": name, "size": "recorded", "inputs": recorded, "pages": len(recorded), "run": parse_all(kind)})
+
+    # lookbackDays depends on today's date (unstable digests); allowedSources would drop whole feeds of the profile.
+    filters = [f for f in jf.job_filters(config) if f[0] not in {"lookbackDays", "allowedSources"}]
+
+    def stream_all(kind):
+        key, to_job = STREAM_FEEDS[kind]
+
+        def run(pages):
+            jobs = []
+            for body, _, _ in pages:
+                feed = jf.ApiFeed(key, to_job, filters)
+                for i in range(0, len(body), STREAM_CHUNK):
+                    feed.feed(body[i : i + STREAM_CHUNK])
+                feed.close()
+                jobs.extend(feed.jobs)
+            return jobs
+
+        return run
+
+    for kind in STREAM_FEEDS:
+        source, url, make = SYNTHETIC_PAGES[kind]
+        for size in sizes:
+            rng = random.Random(f"{kind}-{size}")
+            pages = [(make(rng, size), source, url) for _ in range(PAGES_PER_CASE)]
+            cases.append({"name": f"ApiFeed.{kind}", "size": str(size), "inputs": pages, "pages": len(pages), "run": stream_all(kind)})
+
+    recorded_jobs = [j for e in fixtures for j in PARSERS[e["kind"]][1](e["body"], e["source"], e["url"])]
+    for j in recorded_jobs:
+        j.ageDays = jf.days_since(j.publishedAt)
+
+    job_inputs = [(str(size), lambda size=size: job_list(random.Random(f"jobs-{size}"), size)) for size in sizes]
+    if recorded_jobs:
+        job_inputs.append(("recorded", lambda: [j.copy() for j in recorded_jobs]))
+    for size, make_jobs in job_inputs:
+        jobs = make_jobs()
+        titles = [j.title for j in jobs] if size == "recorded" else raw_titles(random.Random(f"titles-{size}"), len(jobs))
+        cases.append({"name": "clean_job_title", "size": size, "inputs": titles, "pages": 0, "run": lambda ts: [jf.clean_job_title(t) for t in ts]})
+        # Merging fills the best record of a group in place, so dedupe gets its own copy of the list.
+        cases.append({"name": "dedupe_and_merge_jobs", "size": size, "inputs": make_jobs(), "pages": 0,
+                      "run": lambda js: jf.dedupe_and_merge_jobs(js, bool(config["nearDuplicates"]), float(config["nearDuplicateThreshold"]))})
+        cases.append({"name": "score", "size": size, "inputs": jobs, "pages": 0,
+                      "run": lambda js: [(jf.score(j, config).score, j.reasons) for j in js]})
+        if jf.numpy_module() is not None:
+            # Same output as "score" (digests match), via the NumPy backend incl. building the matrix.
+            cases.append({"name": "ScoreMatrix", "size": size, "inputs": jobs, "pages": 0, "run": matrix_scores(config)})
+    return cases
+
+
+def matrix_scores(config):
+    def run(jobs):
+        matrix = jf.ScoreMatrix(jobs, [config])
+        scores, _ = matrix.scores(config)
+        return [(int(sc), jf.score_reasons(matrix.hits(j, config), j.remote)) for sc, j in zip(scores, jobs)]
+
+    return run
+
+
+def e2e_case(sources: int, config_path: str) -> dict:
+    # Full job_finder.main run against the in-process stand-in server with synthesized sources.
+    def run(_):
+        with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            out = Path(tmp) / "jobs.json"
+            argv = sys.argv
+            sys.argv = ["job_finder.py", "--config", config_path, "--no-cache", "--replay", "--fake-sources", str(sources), "--json", str(out)]
+            try:
+                jf.main()
+            finally:
+                sys.argv = argv
+            return json.loads(out.read_text(encoding="utf-8"))
+
+    # Output depends on today's date (ageDays, lookback), so only timing and memory are compared.
+    return {"name": "job_finder.main", "size": f"{sources}src", "inputs": None, "pages": sources, "run": run, "stable": False}
+
+
+def reference_case() -> dict:
+    # Fixed pure-Python workload, measured in every run: timings are compared relative to it, so a
+    # baseline recorded on a faster or slower machine (or a busy one) does not read as a regression.
+    rng = random.Random("reference")
+    lines = [" ".join(rng.choice(ROLES + TOPICS + PLACES) for _ in range(12)) for _ in range(2000)]
+
+    def run(inputs):
+        counts = {}
+        for line in inputs:
+            for tok in line.lower().split():
+                counts[tok] = counts.get(tok, 0) + 1
+        return sorted(counts.items())
+
+    return {"name": REFERENCE_NAME, "size": str(len(lines)), "inputs": lines, "pages": 0, "run": run}
+
+
+def to_json(o):
+    # Job records hash like the dicts they replaced, so digests stay comparable with older baselines.
+    return o.to_dict() if isinstance(o, jf.Job) else str(o)
+
+
+def digest(result) -> str:
+    return hashlib.sha256(json.dumps(result, sort_keys=True, ensure_ascii=False, default=to_json).encode("utf-8")).hexdigest()[:16]
+
+
+def measure(case: dict, repeat: int) -> dict:
+    run, inputs = case["run"], case["inputs"]
+    result = run(inputs)
+    timer = timeit.Timer(lambda: run(inputs))
+    # Small inputs run in batches of >= 0.2 s so timer resolution and noise do not dominate.
+    loops, _ = timer.autorange()
+    best = min(timer.repeat(repeat, loops)) / loops
+    # Separate pass: tracemalloc slows allocation-heavy code down too much to time under it.
+    tracemalloc.start()
+    run(inputs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    best = max(best, 1e-9)
+    return {
+        "seconds": round(best, 6),
+        "pagesPerSec": round(case["pages"] / best, 1) if case["pages"] else None,
+        "itemsPerSec": round(len(result) / best, 1),
+        "peakKB": round(peak / 1024, 1),
+        "count": len(result),
+        "digest": digest(result) if case.get("stable", True) else None,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float, perf: bool = False) -> list[str]:
+    # Output (digest, count) always; speed and memory only with perf, speed as time relative to the
+    # reference case of the same run. Absolute numbers in the baseline are informational.
+    problems = []
+    for key, cur in results.items():
+        old = (baseline.get("cases") or {}).get(key)
+        if not old:
+            continue
+        if cur["digest"] and old.get("digest") != cur["digest"]:
+            problems.append(f"{key}: output changed (count {old.get('count')} -> {cur['count']})")
+        elif cur["digest"] and old.get("count") != cur["count"]:
+            problems.append(f"{key}: count changed ({old.get('count')} -> {cur['count']})")
+        if not perf:
+            continue
+        if old.get("relative") and cur["relative"] > old["relative"] * (1 + tolerance):
+            problems.append(f"{key}: slower ({old['relative']:.3f} -> {cur['relative']:.3f} x reference)")
+        if old.get("peakKB") and cur["peakKB"] > old["peakKB"] * (1 + tolerance) and cur["peakKB"] - old["peakKB"] > 64:
+            problems.append(f"{key}: more memory ({old['peakKB']:.0f} -> {cur['peakKB']:.0f} KB peak)")
+    return problems
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Offline benchmark for job_finder parsers, dedupe and scoring.")
+    ap.add_argument("--fixtures", default=str(FIXTURE_DIR), help="directory with recorded pages (index.json)")
+    ap.add_argument("--record", action="store_true", help="fetch RECORD_TARGETS live into --fixtures and exit")
+    ap.add_argument("--config", default=str(PROFILE_PATH), help="profile used for scoring")
+    ap.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES), help="postings per synthetic page / jobs per list")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--only", default="", help="comma-separated case names")
+    ap.add_argument("--baseline", default=str(BASELINE_PATH))
+    ap.add_argument("--save-baseline", action="store_true")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown / memory growth")
+    ap.add_argument("--perf", action="store_true", help="also flag slowdowns (relative to the reference case) and memory growth")
+    ap.add_argument("--e2e", default="", help="comma-separated fake source counts for full job_finder.main runs (stand-in server)")
+    ap.add_argument("--json", help="write results to this file")
+    args = ap.parse_args()
+
+    fixture_dir = Path(args.fixtures)
+    if args.record:
+        return record_fixtures(fixture_dir)
+
+    config = jf.DEFAULT_CONFIG.copy()
+    config.update(json.loads(Path(args.config).read_text(encoding="utf-8")))
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    only = {s.strip() for s in args.only.split(",") if s.strip()}
+
+    results = {}
+    print(f"{'case':<36} {'size':>8} {'ms':>9} {'pages/s':>9} {'items/s':>11} {'peak KB':>9} {'items':>7}")
+    cases = [reference_case()] + build_cases(sizes, load_fixtures(fixture_dir), config)
+    cases += [e2e_case(int(n), args.config) for n in args.e2e.split(",") if n.strip()]
+    reference = None
+    for case in cases:
+        if only and case["name"] not in only | {REFERENCE_NAME}:
+            continue
+        key = f"{case['name']}@{case['size']}"
+        r = results[key] = measure(case, max(1, args.repeat))
+        reference = reference or r["seconds"]
+        r["relative"] = round(r["seconds"] / reference, 4)
+        pages = f"{r['pagesPerSec']:.0f}" if r["pagesPerSec"] is not None else "-"
+        print(f"{case['name']:<36} {case['size']:>8} {r['seconds'] * 1000:>9.2f} {pages:>9} {r['itemsPerSec']:>11.0f} {r['peakKB']:>9.0f} {r['count']:>7}")
+
+    report = {"python": platform.python_version(), "machine": platform.machine(), "cases": results}
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        if only and baseline_path.exists():
+            merged = json.loads(baseline_path.read_text(encoding="utf-8"))
+            merged.setdefault("cases", {}).update(results)
+            merged.update({"python": report["python"], "machine": report["machine"]})
+            report = merged
+        baseline_path.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"Baseline written: {baseline_path}")
+        return 0
+    if not baseline_path.exists():
+        return 0
+
+    problems = compare(results, json.loads(baseline_path.read_text(encoding="utf-8")), args.tolerance, args.perf)
+    for p in problems:
+        print(f"REGRESSION {p}")
+    if not problems:
+        checked = f"output, speed and memory (tolerance {args.tolerance:.0%})" if args.perf else "output"
+        print(f"No regressions against {baseline_path.name}: {checked}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,12 +2,14 @@
 import argparse
 import json
 import os
-import subprocess
 import sys
 from datetime import datetime
 from pathlib import Path
 from zoneinfo import ZoneInfo
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from crawl_store import shared_crawl, warning_lines  # noqa: E402
+
 
 def strtobool(v: str) -> bool:
     return str(v).strip().lower() in {"1", "true", "yes", "y", "on"}
@@ -20,21 +22,6 @@ def should_run_now(target_tz: str, target_hour: int, force_run: bool) -> tuple[b
     return now_local.hour == target_hour, now_local
 
 
-def run_finder(config_path: str, out_md: Path, out_json: Path) -> tuple[int, str, str]:
-    cmd = [
-        sys.executable,
-        "tools/job_finder/job_finder.py",
-        "--config",
-        config_path,
-        "--out",
-        str(out_md),
-        "--json",
-        str(out_json),
-    ]
-    proc = subprocess.run(cmd, capture_output=True, text=True)
-    return proc.returncode, proc.stdout.strip(), proc.stderr.strip()
-
-
 def published_text(job: dict) -> str:
     age = job.get("ageDays")
     if isinstance(age, int) and age >= 0 and age != 9999:
@@ -112,6 +99,7 @@ def main() -> int:
     ap.add_argument("--target-hour", type=int, default=8)
     ap.add_argument("--workdir", default=".")
     ap.add_argument("--output-dir", default="jobs")
+    ap.add_argument("--store-dir", help="shared crawl-result store (default ~/.cache/job_finder/crawls, empty string disables)")
     args = ap.parse_args()
 
     force_run = strtobool(os.getenv("FORCE_RUN", "false"))
@@ -121,20 +109,15 @@ def main() -> int:
         return 0
 
     os.chdir(args.workdir)
-    tmp_md = Path("/tmp/jobfinder_cloud_jobs.md")
-    tmp_json = Path("/tmp/jobfinder_cloud_jobs.json")
     out_dir = Path(args.output_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    code, stdout_text, stderr_text = run_finder(args.config, tmp_md, tmp_json)
-    jobs = []
-    if tmp_json.exists():
-        try:
-            jobs = json.loads(tmp_json.read_text(encoding="utf-8"))
-        except Exception:
-            jobs = []
+    [(result, how)] = shared_crawl([args.config], now_local.strftime("%Y-%m-%dT%H"), args.store_dir)
+    print(f"Crawl result: {how}")
+    jobs = result["jobs"]
+    metrics = result["metrics"]
 
-    md = build_markdown(now_local, jobs, stdout_text, stderr_text)
+    md = build_markdown(now_local, jobs, "\n".join(result["summary"]), "\n".join(warning_lines(result)))
     (out_dir / "latest.md").write_text(md, encoding="utf-8")
     (out_dir / "latest.json").write_text(json.dumps(jobs, ensure_ascii=False, indent=2), encoding="utf-8")
     (out_dir / "latest.meta.json").write_text(
@@ -142,8 +125,10 @@ def main() -> int:
             {
                 "generatedAt": now_local.isoformat(),
                 "timezone": args.target_tz,
-                "finderExitCode": code,
+                "finderExitCode": 1 if result["error"] else 0,
+                "crawl": how,
                 "count": len(jobs),
+                "metrics": metrics,
             },
             ensure_ascii=False,
             indent=2,
@@ -152,8 +137,8 @@ def main() -> int:
     )
 
     print(f"Wrote {out_dir / 'latest.md'} and {out_dir / 'latest.json'} ({len(jobs)} jobs)")
-    if code != 0:
-        print(f"Finder exited with code {code}")
+    if result["error"]:
+        print(f"Finder failed: {result['error']}")
     return 0
 
 
@@ -4,13 +4,21 @@ import json
 import os
 import re
 import smtplib
-import subprocess
 import sys
 from datetime import datetime
 from email.message import EmailMessage
 from pathlib import Path
 from zoneinfo import ZoneInfo
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import job_finder  # noqa: E402
+from crawl_store import shared_crawl, warning_lines  # noqa: E402
+
+# Selection of the mail as in job_finder.mjs: newest first, at most SOURCE_CAPS per source before the rest
+# fills up to maxResults, then sources below SOURCE_QUOTAS are topped up, even below minimumScore.
+SOURCE_CAPS = {"stepstone": 10, "studysmarter": 10, "gesinesjobtipps": 10, "interamt": 5, "karriereportalberlin": 5, "arbeitsagentur": 5, "goodjobs": 5}
+SOURCE_QUOTAS = {"stepstone": 10, "studysmarter": 10, "gesinesjobtipps": 10}
+
 
 def strtobool(v: str) -> bool:
     return str(v).strip().lower() in {"1", "true", "yes", "y", "on"}
@@ -23,19 +31,43 @@ def should_send_now(target_tz: str, target_hour: int, force_send: bool) -> tuple
     return now_local.hour == target_hour, now_local
 
 
-def run_finder(config_path: str, out_md: Path, out_json: Path) -> tuple[int, str, str]:
-    cmd = [
-        os.getenv("NODE_BIN", "node"),
-        "tools/job_finder/job_finder.mjs",
-        "--config",
-        config_path,
-        "--out",
-        str(out_md),
-        "--json",
-        str(out_json),
-    ]
-    proc = subprocess.run(cmd, capture_output=True, text=True)
-    return proc.returncode, proc.stdout.strip(), proc.stderr.strip()
+def age_for_sort(job: dict) -> int:
+    age = job.get("ageDays")
+    return age if isinstance(age, int) else 9999
+
+
+def select_jobs(candidates: list[dict], minimum_score: float, max_results: int) -> list[dict]:
+    # applySourceCaps and fillSourceQuotas of job_finder.mjs over the scored candidates of the shared crawl.
+    def source(job):
+        return str(job.get("source") or "").lower()
+
+    def key(job):
+        return job_finder.canonical_url(job.get("url")) or f"{job_finder.norm(job.get('title'))}|{job_finder.norm(job.get('company'))}"
+
+    newest = sorted(candidates, key=lambda j: (age_for_sort(j), -float(j.get("score") or 0)))
+    used = {}
+    picked, rest = [], []
+    for j in newest:
+        if float(j.get("score") or 0) < minimum_score:
+            continue
+        if used.get(source(j), 0) < SOURCE_CAPS.get(source(j), max_results):
+            picked.append(j)
+            used[source(j)] = used.get(source(j), 0) + 1
+        else:
+            rest.append(j)
+    out = (picked + rest)[:max_results]
+    seen = {key(j) for j in out}
+    for name, minimum in SOURCE_QUOTAS.items():
+        current = sum(1 for j in out if source(j) == name)
+        for j in newest:
+            if current >= minimum or len(out) >= max_results:
+                break
+            if source(j) != name or key(j) in seen:
+                continue
+            out.append(j)
+            seen.add(key(j))
+            current += 1
+    return out
 
 
 def published_text(job: dict) -> str:
@@ -144,10 +176,6 @@ def compose_body(now_local: datetime, jobs: list[dict], stdout_text: str, stderr
         ("GoodJobs", "🟧", "GoodJobs", 5),
     ]
 
-    def age_for_sort(job: dict) -> int:
-        age = job.get("ageDays")
-        return age if isinstance(age, int) else 9999
-
     for source_key, emoji, label, max_items in sections:
         lines.append(f"{emoji} {label} (max. {max_items})")
         lines.append("=" * len(lines[-1]))
@@ -186,14 +214,18 @@ def compose_body(now_local: datetime, jobs: list[dict], stdout_text: str, stderr
     return "\n".join(lines)
 
 
-def send_mail(subject: str, body: str, smtp_host: str, smtp_port: int, smtp_user: str, smtp_password: str,
-              mail_from: str, mail_to: str, use_starttls: bool = True) -> None:
+def build_message(subject: str, body: str, mail_from: str, mail_to: str) -> EmailMessage:
     msg = EmailMessage()
     msg["Subject"] = subject
     msg["From"] = mail_from
     msg["To"] = mail_to
     msg.set_content(body)
+    return msg
 
+
+def send_mails(messages: list[EmailMessage], smtp_host: str, smtp_port: int, smtp_user: str, smtp_password: str,
+               use_starttls: bool = True) -> None:
+    # All digests over one connection: a single handshake and login per run.
     with smtplib.SMTP(smtp_host, smtp_port, timeout=30) as smtp:
         smtp.ehlo()
         if use_starttls:
@@ -201,7 +233,19 @@ def send_mail(subject: str, body: str, smtp_host: str, smtp_port: int, smtp_user
             smtp.ehlo()
         if smtp_user:
             smtp.login(smtp_user, smtp_password)
-        smtp.send_message(msg)
+        for msg in messages:
+            smtp.send_message(msg)
+
+
+def profile_mail_to(config_path: str, default: str) -> str:
+    # Optional "mailTo" in the profile (address or list), so each profile's digest reaches its owner.
+    try:
+        mail_to = json.loads(Path(config_path).read_text(encoding="utf-8")).get("mailTo")
+    except Exception:
+        mail_to = None
+    if isinstance(mail_to, list):
+        mail_to = ", ".join(str(m).strip() for m in mail_to if str(m).strip())
+    return str(mail_to or "").strip() or default
 
 
 def first_env(*names: str) -> str:
@@ -221,10 +265,11 @@ def require_any_env(*names: str) -> str:
 
 def main() -> int:
     ap = argparse.ArgumentParser()
-    ap.add_argument("--config", required=True)
+    ap.add_argument("--config", required=True, action="append", help="job profile; repeat to send one digest per profile from a single crawl")
     ap.add_argument("--target-tz", default="Europe/Berlin")
     ap.add_argument("--target-hour", type=int, default=8)
     ap.add_argument("--workdir", default=".")
+    ap.add_argument("--store-dir", help="shared crawl-result store (default ~/.cache/job_finder/crawls, empty string disables)")
     args = ap.parse_args()
 
     force_send = strtobool(os.getenv("FORCE_SEND", "false"))
@@ -234,19 +279,7 @@ def main() -> int:
         return 0
 
     os.chdir(args.workdir)
-    out_md = Path("/tmp/jobfinder_cloud_jobs.md")
-    out_json = Path("/tmp/jobfinder_cloud_jobs.json")
-
-    code, stdout_text, stderr_text = run_finder(args.config, out_md, out_json)
-    jobs = []
-    if out_json.exists():
-        try:
-            jobs = json.loads(out_json.read_text(encoding="utf-8"))
-        except Exception:
-            jobs = []
-    body = compose_body(now_local, jobs, stdout_text, stderr_text)
-
-    subject = f"Daily Job Update Berlin/Potsdam - {now_local.strftime('%Y-%m-%d %H:%M %Z')}"
+    crawled = shared_crawl(args.config, now_local.strftime("%Y-%m-%dT%H"), args.store_dir)
 
     smtp_host = require_any_env("SMTP_HOST", "SMTP_SERVER")
     smtp_port = int(first_env("SMTP_PORT", "SMTP_SERVER_PORT") or "587")
@@ -258,21 +291,29 @@ def main() -> int:
     mail_to = first_env("MAIL_TO", "EMAIL_TO", mail_from)
     use_starttls = strtobool(os.getenv("SMTP_USE_STARTTLS", "true"))
 
-    send_mail(
-        subject=subject,
-        body=body,
+    messages = []
+    for config_path, (result, how) in zip(args.config, crawled):
+        print(f"Crawl result for {config_path}: {how}")
+        if result["error"]:
+            print(f"Finder failed: {result['error']}")
+        cfg = job_finder.load_config(config_path)
+        jobs = select_jobs(result["candidates"], float(cfg["minimumScore"]), int(cfg["maxResults"]))
+        body = compose_body(now_local, jobs, "\n".join(result["summary"]), "\n".join(warning_lines(result)))
+        subject = f"Daily Job Update Berlin/Potsdam - {now_local.strftime('%Y-%m-%d %H:%M %Z')}"
+        if len(args.config) > 1:
+            subject += f" ({Path(config_path).stem})"
+        messages.append(build_message(subject, body, mail_from, profile_mail_to(config_path, mail_to)))
+
+    send_mails(
+        messages,
         smtp_host=smtp_host,
         smtp_port=smtp_port,
         smtp_user=smtp_user,
         smtp_password=smtp_password,
-        mail_from=mail_from,
-        mail_to=mail_to,
         use_starttls=use_starttls,
     )
 
-    print("Mail sent")
-    if code != 0:
-        print(f"Finder exited with code {code}")
+    print(f"Mail sent ({len(messages)})")
     return 0
 
 
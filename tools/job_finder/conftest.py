@@ -0,0 +1,42 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import job_finder  # noqa: E402
+from standin_server import StandIn  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def fresh_state():
+    # job_finder keeps HTTP, cache, cookie and health state in module globals; every test starts from defaults.
+    job_finder.configure_run(dict(job_finder.DEFAULT_CONFIG, retryBaseSeconds=0.01))
+    job_finder.COOKIE_JAR.clear()
+    job_finder.HOST_LIMITS.clear()
+    job_finder.METRICS.reset()
+    yield
+    job_finder.close_session()
+    job_finder.configure_replay()
+
+
+@pytest.fixture
+def standin(tmp_path):
+    # start({url: body or (status, headers, body)}, **StandIn options) serves those responses locally
+    # and routes every job_finder request there; returns the StandIn for its stats().
+    servers = []
+
+    def start(responses=None, **kwargs):
+        archive = job_finder.HttpArchive(tmp_path / f"standin-{len(servers)}.jsonl.gz")
+        for url, entry in (responses or {}).items():
+            status, headers, body = entry if isinstance(entry, tuple) else (200, {}, entry)
+            archive.add(url, status, body, headers)
+        archive.save()
+        server = StandIn(archive.path, **kwargs)
+        servers.append(server)
+        job_finder.configure_replay(upstream=server.start())
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
@@ -0,0 +1,160 @@
+import fcntl
+import hashlib
+import json
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import job_finder
+
+
+DEFAULT_STORE_DIR = job_finder.DEFAULT_CACHE_DIR / "crawls"
+# Bumped when the stored result layout changes; entries of other versions are ignored.
+FORMAT = 3
+FRESH_SECONDS = 2 * 3600
+STALE_SECONDS = 36 * 3600
+# How long a consumer waits for another process's crawl before falling back to a stale result.
+STALE_WAIT_SECONDS = 120
+LOCK_TIMEOUT_SECONDS = 45 * 60
+
+
+class CrawlStore:
+    """Crawl results shared between processes, keyed by profile and time bucket, with a lock and TTL."""
+
+    def __init__(self, root=DEFAULT_STORE_DIR, fresh_seconds: float = FRESH_SECONDS, stale_seconds: float = STALE_SECONDS,
+                 stale_wait_seconds: float = STALE_WAIT_SECONDS, lock_timeout_seconds: float = LOCK_TIMEOUT_SECONDS):
+        self.root = Path(root)
+        self.fresh_seconds = fresh_seconds
+        self.stale_seconds = stale_seconds
+        self.stale_wait_seconds = stale_wait_seconds
+        self.lock_timeout_seconds = lock_timeout_seconds
+
+    @staticmethod
+    def profile_key(config_path: str) -> str:
+        # By content, so the same profile checked out at different paths shares its crawl.
+        return hashlib.sha256(Path(config_path).read_bytes()).hexdigest()[:16]
+
+    def _path(self, key: str, bucket: str) -> Path:
+        return self.root / key / f"{bucket}.json"
+
+    @staticmethod
+    def _read(path: Path):
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except Exception:
+            return None
+
+    def get(self, key: str, bucket: str):
+        entry = self._read(self._path(key, bucket))
+        if entry is None or entry.get("format") != FORMAT or time.time() - entry.get("created", 0) > self.fresh_seconds:
+            return None
+        return entry
+
+    def latest(self, key: str):
+        # Newest entry of any bucket that is still inside the stale window.
+        best = None
+        for path in (self.root / key).glob("*.json"):
+            entry = self._read(path)
+            if entry is not None and entry.get("format") == FORMAT and (best is None or entry.get("created", 0) > best.get("created", 0)):
+                best = entry
+        if best is None or time.time() - best.get("created", 0) > self.stale_seconds:
+            return None
+        return best
+
+    def put(self, key: str, bucket: str, result: dict) -> None:
+        path = self._path(key, bucket)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        now = time.time()
+        entry = {"format": FORMAT, "bucket": bucket, "created": now, "createdAt": datetime.fromtimestamp(now, timezone.utc).isoformat(), "result": result}
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+        for old in path.parent.glob("*.json"):
+            if now - old.stat().st_mtime > self.stale_seconds:
+                old.unlink(missing_ok=True)
+
+    def fetch(self, config_paths, bucket: str, crawl) -> list:
+        # One (result, how) per profile: "reused" a fresh entry, crawled "fresh", or served "stale" while
+        # another process is still crawling. crawl(paths) returns one (result, cacheable) per path and runs
+        # only for the profiles without a fresh entry, all in one batch; failed crawls are not stored.
+        keys = [self.profile_key(p) for p in config_paths]
+        found = {}
+
+        def collect():
+            for k in keys:
+                entry = found.get(k) or self.get(k, bucket)
+                if entry is not None:
+                    found[k] = entry
+            return [p for p, k in zip(config_paths, keys) if k not in found]
+
+        def answer(how, extra=None):
+            extra = extra or {}
+            return [(found[k]["result"], "reused") if k in found else (extra[k], how) for k in keys]
+
+        if not collect():
+            return answer("reused")
+        self.root.mkdir(parents=True, exist_ok=True)
+        started = time.time()
+        # One lock for the whole store: batch crawls cover different sets of profiles.
+        with open(self.root / "crawl.lock", "a+") as lock:
+            locked = False
+            while True:
+                try:
+                    fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    locked = True
+                    break
+                except BlockingIOError:
+                    pass
+                waited = time.time() - started
+                if waited >= self.stale_wait_seconds:
+                    stale = {k: self.latest(k) for k in keys if k not in found}
+                    if all(stale.values()):
+                        return answer("stale", {k: e["result"] for k, e in stale.items()})
+                if waited >= self.lock_timeout_seconds:
+                    # The lock holder looks stuck; crawl anyway rather than send nothing.
+                    break
+                time.sleep(1)
+            try:
+                # The process we waited for may have stored some of these profiles in the meantime.
+                missing = collect()
+                if not missing:
+                    return answer("reused")
+                fresh = {}
+                for path, (result, cacheable) in zip(missing, crawl(missing)):
+                    key = self.profile_key(path)
+                    fresh[key] = result
+                    if cacheable:
+                        self.put(key, bucket, result)
+                return answer("fresh", fresh)
+            finally:
+                if locked:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def run_finder(config_paths) -> list:
+    # In-process batch crawl; a crash becomes an "error" result instead of taking the caller down.
+    # Results carry the scored candidates as well, so each consumer can make its own selection.
+    try:
+        results = job_finder.find_jobs_batch(config_paths, candidates=True)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        return [{"jobs": [], "delta": [], "candidates": [], "warnings": [], "summary": [], "metrics": None, "error": error} for _ in config_paths]
+    return [{**result, "error": ""} for result in results]
+
+
+def warning_lines(result: dict) -> list[str]:
+    lines = [f"[Warnung] {w}" for w in result["warnings"]]
+    if result["error"]:
+        lines.append(f"[Fehler] {result['error']}")
+    return lines
+
+
+def shared_crawl(config_paths, bucket: str, store_dir=None) -> list:
+    # One crawl per bucket for all consumers and profiles; store_dir="" disables sharing.
+    def crawl(paths):
+        return [(result, not result["error"] and bool(result["jobs"])) for result in run_finder(paths)]
+
+    if store_dir == "":
+        return [(result, "fresh") for result, _ in crawl(config_paths)]
+    return CrawlStore(store_dir or DEFAULT_STORE_DIR).fetch(config_paths, bucket, crawl)
@@ -1,15 +1,34 @@
 #!/usr/bin/env python3
 import argparse
+import codecs
+import functools
+import gzip
+import hashlib
+import http.client
 import http.cookiejar
 import json
+import math
+import os
+import random
 import re
+import signal
+import sqlite3
+import ssl
+import struct
 import sys
-from datetime import datetime, timezone
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
 from html import unescape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
 from urllib.parse import quote, urljoin
-from urllib.request import HTTPCookieProcessor, Request, build_opener
+from urllib.error import HTTPError
+from urllib.request import HTTPCookieProcessor, Request, build_opener, getproxies
 
 
 DEFAULT_CONFIG = {
@@ -24,56 +43,756 @@ DEFAULT_CONFIG = {
     "allowedSources": [],
     "strictLocations": [],
     "interamtSearchUrl": "https://interamt.de/koop/app/trefferliste?5",
+    "crawlConcurrency": 8,
+    "hostConcurrency": 2,
+    "cacheMaxMB": 200,
+    "maxBodyMB": 15,
+    "enrichConcurrency": 6,
+    "detailCacheTtlHours": 168,
+    "keywordMatch": "substring",
+    "indexRetentionDays": 90,
+    "nearDuplicates": True,
+    "nearDuplicateThreshold": 0.8,
+    "sources": [],
+    "retryAttempts": 2,
+    "retryBaseSeconds": 0.5,
+    "circuitFailureThreshold": 3,
+    "circuitCooldownHours": 6,
+    "daemonRefreshMinutes": 60,
+    "scoringBackend": "python",
+    "relevance": "rules",
+    "relevanceWeight": 10,
 }
 
-COOKIE_JAR = http.cookiejar.CookieJar()
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "job_finder"
+# Bump when a parser changes its output, so cached parse results are not reused.
+PARSER_VERSION = "2"
+
+COOKIE_JAR = http.cookiejar.LWPCookieJar()
+# Only used when a proxy is configured; everything else goes through HTTP_POOL.
 HTTP_OPENER = build_opener(HTTPCookieProcessor(COOKIE_JAR))
+HTTP_TIMEOUT = 25
+MAX_REDIRECTS = 5
+
+HOST_CONCURRENCY = 2
+MAX_BODY_BYTES = 15 * 1024 * 1024
+READ_CHUNK_BYTES = 64 * 1024
+ENRICH_CONCURRENCY = 6
+DETAIL_CACHE_TTL_HOURS = 168
+RETRY_ATTEMPTS = 2
+RETRY_BASE_SECONDS = 0.5
+RETRY_MAX_SECONDS = 8.0
+TRANSIENT_STATUS = {429, 500, 502, 503, 504}
+# Record/replay: responses are written to HTTP_ARCHIVE, requests are sent to HTTP_UPSTREAM (stand-in server).
+HTTP_ARCHIVE = None
+HTTP_UPSTREAM = None
+# Per-host limits from the source registry; other hosts use HOST_CONCURRENCY.
+HOST_LIMITS = {}
+_HOST_SLOTS = {}
+_HOST_SLOTS_LOCK = threading.Lock()
+
+
+class RunMetrics:
+    """Wall time, transfer volume and job counts per source and pipeline stage of one run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started = time.monotonic()
+            self.sources = {}
+            self.stages = {}
+            self.filters = {}
+            # Dedupe keys of postings dropped while parsing; the run total counts them after dedupe.
+            self.streamed_out = set()
+
+    def _source(self, name: str):
+        rec = self.sources.get(name)
+        if rec is None:
+            rec = self.sources[name] = {"seconds": 0.0, "parseSeconds": 0.0, "requests": 0, "bytes": 0, "status": {}, "jobs": 0, "errors": []}
+        return rec
+
+    @contextmanager
+    def attribute(self, source: str):
+        # Requests made by this thread inside the block are booked on `source`.
+        prev = getattr(self._local, "source", None)
+        self._local.source = source
+        try:
+            yield
+        finally:
+            self._local.source = prev
+
+    def add_bytes(self, n: int) -> None:
+        with self._lock:
+            self._source(getattr(self._local, "source", None) or "-")["bytes"] += n
+
+    def add_request(self, status) -> None:
+        with self._lock:
+            rec = self._source(getattr(self._local, "source", None) or "-")
+            rec["requests"] += 1
+            rec["status"][str(status)] = rec["status"].get(str(status), 0) + 1
+
+    def add_parse(self, seconds: float) -> None:
+        with self._lock:
+            self._source(getattr(self._local, "source", None) or "-")["parseSeconds"] += seconds
+
+    def add_source_run(self, source: str, seconds: float, jobs: int, error=None) -> None:
+        with self._lock:
+            rec = self._source(source)
+            rec["seconds"] += seconds
+            rec["jobs"] += jobs
+            if error is not None:
+                rec["errors"].append(str(error))
+
+    @contextmanager
+    def stage(self, name: str, jobs_in=None):
+        # The caller may set rec["out"] to the number of jobs the stage produced.
+        rec = {"in": jobs_in} if jobs_in is not None else {}
+        t0 = time.monotonic()
+        try:
+            yield rec
+        finally:
+            rec["seconds"] = time.monotonic() - t0
+            with self._lock:
+                prev = self.stages.get(name)
+                if prev:
+                    # Repeated stages (enrichment runs before and after dedupe) add up their time;
+                    # "in" stays the first call's, everything else is the latest.
+                    rec = {**prev, **rec, "in": prev.get("in"), "seconds": prev["seconds"] + rec["seconds"]}
+                self.stages[name] = rec
+
+    def dropped(self, name: str, before: int, after: int) -> None:
+        with self._lock:
+            self.filters[name] = self.filters.get(name, 0) + before - after
+
+    def add_streamed_out(self, keys) -> None:
+        with self._lock:
+            self.streamed_out.update(keys)
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            sources = {
+                k: {**v, "seconds": round(v["seconds"], 3), "parseSeconds": round(v["parseSeconds"], 3)}
+                for k, v in sorted(self.sources.items(), key=lambda kv: -kv[1]["seconds"])
+            }
+            stages = {k: {**v, "seconds": round(v["seconds"], 3)} for k, v in self.stages.items()}
+            stages.setdefault("parse", {"seconds": round(sum(v["parseSeconds"] for v in self.sources.values()), 3)})
+            return {
+                "totalSeconds": round(time.monotonic() - self.started, 3),
+                "stages": stages,
+                "sources": sources,
+                "filtersDropped": dict(self.filters),
+            }
 
 
-def fetch_text(url: str) -> str:
-    req = Request(
-        url,
-        headers={
-            "User-Agent": "job-finder-script/1.0",
-            "Accept": "text/html,application/xhtml+xml,application/json",
-            "Accept-Language": "de-DE,de;q=0.9,en;q=0.6",
-            "Connection": "keep-alive",
-        },
-    )
-    with HTTP_OPENER.open(req, timeout=25) as r:
-        return r.read().decode("utf-8", errors="replace")
+METRICS = RunMetrics()
+
+
+def host_limit(host: str) -> int:
+    # host as in a URL's netloc, which is what HOST_LIMITS is keyed by.
+    return max(1, HOST_LIMITS.get(host) or HOST_CONCURRENCY)
+
+
+def host_slot(url: str):
+    # One semaphore per host, so parallel crawling never hammers a single portal.
+    host = urlparse(url).netloc.lower()
+    limit = host_limit(host)
+    with _HOST_SLOTS_LOCK:
+        limit_and_slot = _HOST_SLOTS.get(host)
+        if limit_and_slot is None or limit_and_slot[0] != limit:
+            limit_and_slot = _HOST_SLOTS[host] = (limit, threading.BoundedSemaphore(limit))
+    return limit_and_slot[1]
+
+
+class ResponseCache:
+    """On-disk store for HTTP bodies (with ETag/Last-Modified) and parse results, keyed by canonical URL."""
+
+    def __init__(self, root: Path, max_bytes: int):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        (self.root / "http").mkdir(parents=True, exist_ok=True)
+        (self.root / "parsed").mkdir(parents=True, exist_ok=True)
+        (self.root / "details").mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(canonical_url(url).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _read(path: Path):
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except Exception:
+            return None
+
+    @staticmethod
+    def _write(path: Path, data) -> None:
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def get(self, url: str):
+        return self._read(self.root / "http" / f"{self._key(url)}.json")
+
+    def put(self, url: str, body: str, etag: str, last_modified: str, keep: bool = False) -> None:
+        # Without validators a body is only useful for sources with a refresh interval.
+        if not etag and not last_modified and not keep:
+            return
+        entry = {
+            "url": url,
+            "etag": etag or "",
+            "lastModified": last_modified or "",
+            "fetchedAt": datetime.now(timezone.utc).isoformat(),
+            "body": body,
+        }
+        self._write(self.root / "http" / f"{self._key(url)}.json", entry)
+
+    def fresh(self, url: str, max_age_hours: float):
+        path = self.root / "http" / f"{self._key(url)}.json"
+        try:
+            age = time.time() - path.stat().st_mtime
+        except OSError:
+            return None
+        if age > max_age_hours * 3600:
+            return None
+        entry = self._read(path)
+        return entry.get("body") if entry else None
+
+    def touch(self, url: str) -> None:
+        try:
+            os.utime(self.root / "http" / f"{self._key(url)}.json")
+        except OSError:
+            pass
+
+    def parsed(self, url: str, name: str, digest: str):
+        entry = self._read(self.root / "parsed" / f"{self._key(url)}-{name}.json")
+        if not entry or entry.get("digest") != digest:
+            return None
+        return [Job.from_dict(j) for j in entry.get("jobs") or []]
+
+    def store_parsed(self, url: str, name: str, digest: str, jobs) -> None:
+        self._write(self.root / "parsed" / f"{self._key(url)}-{name}.json", {"digest": digest, "jobs": [j.to_dict() for j in jobs]})
+
+    def detail(self, url: str, ttl_hours: float):
+        entry = self._read(self.root / "details" / f"{self._key(url)}.json")
+        if not entry or ttl_hours <= 0:
+            return None
+        try:
+            fetched = datetime.fromisoformat(entry["fetchedAt"])
+        except Exception:
+            return None
+        if (datetime.now(timezone.utc) - fetched).total_seconds() > ttl_hours * 3600:
+            return None
+        return entry.get("patch")
+
+    def store_detail(self, url: str, patch) -> None:
+        entry = {"url": url, "fetchedAt": datetime.now(timezone.utc).isoformat(), "patch": patch}
+        self._write(self.root / "details" / f"{self._key(url)}.json", entry)
+
+    def evict(self) -> None:
+        files = []
+        for sub in ["http", "parsed", "details"]:
+            for f in (self.root / sub).glob("*.json"):
+                try:
+                    st = f.stat()
+                except OSError:
+                    continue
+                files.append((st.st_mtime, st.st_size, f))
+        total = sum(size for _, size, _ in files)
+        for _, size, f in sorted(files, key=lambda x: x[0]):
+            if total <= self.max_bytes:
+                break
+            try:
+                f.unlink()
+                total -= size
+            except OSError:
+                pass
+
+
+HTTP_CACHE = None
+
+
+class ConnectionPool:
+    """Keeps idle keep-alive connections per (scheme, host, port) for reuse across requests."""
+
+    def __init__(self):
+        self._idle = {}
+        self._lock = threading.Lock()
+        self._ssl = ssl.create_default_context()
+
+    def _acquire(self, key):
+        with self._lock:
+            idle = self._idle.get(key) or []
+            if idle:
+                return idle.pop(), True
+        scheme, host, port = key
+        if HTTP_UPSTREAM is not None:
+            return http.client.HTTPConnection(*HTTP_UPSTREAM, timeout=HTTP_TIMEOUT), False
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=HTTP_TIMEOUT, context=self._ssl), False
+        return http.client.HTTPConnection(host, port, timeout=HTTP_TIMEOUT), False
+
+    def release(self, key, conn, response) -> None:
+        # Only a fully read response leaves the connection in a reusable state.
+        if response is None or not response.isclosed() or response.will_close:
+            conn.close()
+            return
+        # Keep as many idle connections as the host may have requests in flight.
+        scheme, host, port = key
+        limit = host_limit(host if port == (443 if scheme == "https" else 80) else f"{host}:{port}")
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < limit:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def request(self, url: str, headers):
+        p = urlparse(url)
+        scheme = p.scheme.lower()
+        if scheme not in {"http", "https"}:
+            raise ValueError(f"Nicht unterstuetztes URL-Schema: {url}")
+        key = (scheme, p.hostname or "", p.port or (443 if scheme == "https" else 80))
+        # The stand-in gets the absolute URL in the request line, like a forward proxy.
+        path = url if HTTP_UPSTREAM is not None else urlunparse(("", "", p.path or "/", p.params, p.query, ""))
+        while True:
+            conn, reused = self._acquire(key)
+            try:
+                conn.request("GET", path, headers=headers)
+                return key, conn, conn.getresponse()
+            except (http.client.RemoteDisconnected, http.client.BadStatusLine, ConnectionResetError, BrokenPipeError):
+                conn.close()
+                # The server dropped an idle connection; retry once on a fresh one.
+                if not reused:
+                    raise
+            except Exception:
+                conn.close()
+                raise
+
+    def close_all(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+
+HTTP_POOL = ConnectionPool()
+
+
+class HttpArchive:
+    """Gzip-compressed JSON-lines archive of fetched responses, keyed by URL."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.entries = {}
+        self._lock = threading.Lock()
+        if self.path.exists():
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.entries[entry["url"]] = entry
+
+    def add(self, url: str, status: int, body: str = "", headers=None) -> None:
+        with self._lock:
+            self.entries[url] = {"url": url, "status": status, "headers": headers or {}, "body": body}
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with self._lock, gzip.open(tmp, "wt", encoding="utf-8") as f:
+            for entry in self.entries.values():
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        os.replace(tmp, self.path)
+
+
+@contextmanager
+def open_url(url: str, headers):
+    if HTTP_UPSTREAM is None and urlparse(url).scheme.lower() in getproxies():
+        with HTTP_OPENER.open(Request(url, headers=headers), timeout=HTTP_TIMEOUT) as r:
+            yield r
+        return
+
+    for _ in range(MAX_REDIRECTS + 1):
+        req = Request(url, headers=headers)
+        COOKIE_JAR.add_cookie_header(req)
+        key, conn, r = HTTP_POOL.request(url, dict(req.header_items()))
+        COOKIE_JAR.extract_cookies(r, req)
+        location = r.getheader("Location")
+        if r.status in {301, 302, 303, 307, 308} and location:
+            r.read()
+            HTTP_POOL.release(key, conn, r)
+            url = urljoin(url, location)
+            continue
+        if r.status >= 300:
+            if r.status == 304:
+                r.read()
+            HTTP_POOL.release(key, conn, r)
+            raise HTTPError(url, r.status, r.reason, r.headers, None)
+        r.url = url
+        try:
+            yield r
+        finally:
+            HTTP_POOL.release(key, conn, r)
+        return
+    raise HTTPError(url, 310, "Zu viele Weiterleitungen", None, None)
+
 
+def configure_session(cookie_file) -> None:
+    # Persist cookies (incl. session cookies) so portal sessions survive between runs.
+    COOKIE_JAR.filename = str(cookie_file) if cookie_file else None
+    if COOKIE_JAR.filename and Path(COOKIE_JAR.filename).exists():
+        try:
+            COOKIE_JAR.load(ignore_discard=True)
+        except (OSError, http.cookiejar.LoadError):
+            pass
+
+
+def close_session() -> None:
+    HTTP_POOL.close_all()
+    if HTTP_ARCHIVE is not None:
+        HTTP_ARCHIVE.save()
+    if COOKIE_JAR.filename:
+        try:
+            COOKIE_JAR.save(ignore_discard=True)
+            os.chmod(COOKIE_JAR.filename, 0o600)
+        except OSError:
+            pass
+
+
+def configure_cache(cache_dir, max_mb) -> None:
+    global HTTP_CACHE
+    HTTP_CACHE = ResponseCache(Path(cache_dir), int(float(max_mb) * 1024 * 1024)) if cache_dir else None
+
+
+def configure_replay(record=None, upstream=None) -> None:
+    global HTTP_ARCHIVE, HTTP_UPSTREAM
+    HTTP_ARCHIVE = HttpArchive(record) if record else None
+    HTTP_UPSTREAM = upstream
+
+
+def configure_http(config) -> None:
+    global HOST_CONCURRENCY, MAX_BODY_BYTES, ENRICH_CONCURRENCY, DETAIL_CACHE_TTL_HOURS, RETRY_ATTEMPTS, RETRY_BASE_SECONDS
+    HOST_CONCURRENCY = int(config.get("hostConcurrency") or 2)
+    MAX_BODY_BYTES = int(float(config.get("maxBodyMB") or 15) * 1024 * 1024)
+    ENRICH_CONCURRENCY = int(config.get("enrichConcurrency") or 1)
+    DETAIL_CACHE_TTL_HOURS = float(config.get("detailCacheTtlHours") or 0)
+    RETRY_ATTEMPTS = max(0, int(config.get("retryAttempts") or 0))
+    RETRY_BASE_SECONDS = float(config.get("retryBaseSeconds") or 0)
+
+
+def cached_parse(name: str, url: str, html: str, parse):
+    # Same page content and parser version -> reuse the jobs parsed last time.
+    t0 = time.monotonic()
+    if HTTP_CACHE is None:
+        jobs = parse(html)
+    else:
+        digest = hashlib.sha256(f"{PARSER_VERSION}\n{html}".encode("utf-8")).hexdigest()
+        jobs = HTTP_CACHE.parsed(url, name, digest)
+        if jobs is None:
+            jobs = parse(html)
+            HTTP_CACHE.store_parsed(url, name, digest, jobs)
+    METRICS.add_parse(time.monotonic() - t0)
+    return jobs
 
-def fetch_json(url: str):
-    return json.loads(fetch_text(url))
+
+def response_charset(headers) -> str:
+    charset = headers.get_content_charset() or "utf-8"
+    try:
+        return codecs.lookup(charset).name
+    except LookupError:
+        return "utf-8"
+
+
+def iter_response_bytes(r, limit: int):
+    # Decompresses gzip/deflate chunk by chunk and enforces the size limit on the decoded body.
+    encoding = (r.headers.get("Content-Encoding") or "").strip().lower()
+    if encoding in {"gzip", "x-gzip"}:
+        decomp = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    elif encoding == "deflate":
+        decomp = zlib.decompressobj()
+    else:
+        decomp = None
+    first = True
+    size = 0
+    while True:
+        raw = r.read(READ_CHUNK_BYTES)
+        if not raw:
+            break
+        METRICS.add_bytes(len(raw))
+        while raw:
+            if decomp is None:
+                data, raw = raw, b""
+            else:
+                try:
+                    data = decomp.decompress(raw, READ_CHUNK_BYTES)
+                except zlib.error:
+                    # Some servers send raw deflate without the zlib header.
+                    if not (first and encoding == "deflate"):
+                        raise
+                    decomp = zlib.decompressobj(-zlib.MAX_WBITS)
+                    data = decomp.decompress(raw, READ_CHUNK_BYTES)
+                raw = decomp.unconsumed_tail
+            first = False
+            size += len(data)
+            if size > limit:
+                raise ValueError(f"Antwort groesser als {limit} Bytes")
+            if data:
+                yield data
+    if decomp is not None:
+        data = decomp.flush()
+        if size + len(data) > limit:
+            raise ValueError(f"Antwort groesser als {limit} Bytes")
+        if data:
+            yield data
+
+
+def iter_response_text(r, limit: int):
+    decoder = codecs.getincrementaldecoder(response_charset(r.headers))(errors="replace")
+    for data in iter_response_bytes(r, limit):
+        text = decoder.decode(data)
+        if text:
+            yield text
+    text = decoder.decode(b"", final=True)
+    if text:
+        yield text
+
+
+def is_transient(err) -> bool:
+    if isinstance(err, HTTPError):
+        return err.code in TRANSIENT_STATUS
+    # Timeouts are not retried: a hanging host would cost the full timeout again.
+    if isinstance(err, TimeoutError):
+        return False
+    return isinstance(err, (ConnectionError, http.client.RemoteDisconnected, http.client.IncompleteRead))
+
+
+def retry_delay(attempt: int, err) -> float:
+    # Exponential backoff with full jitter; a short Retry-After from the server wins.
+    delay = random.uniform(0, min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * (2**attempt)))
+    retry_after = err.headers.get("Retry-After") if isinstance(err, HTTPError) and err.headers else None
+    if retry_after and retry_after.strip().isdigit():
+        delay = max(delay, min(RETRY_MAX_SECONDS, float(retry_after)))
+    return delay
+
+
+def fetch_text(url: str, on_chunk=None, max_age_hours: float = 0) -> str:
+    # max_age_hours > 0: a cached body younger than that is used without any request (source refresh interval).
+    if max_age_hours and HTTP_CACHE is not None:
+        body = HTTP_CACHE.fresh(url, max_age_hours)
+        if body is not None:
+            METRICS.add_request("fresh")
+            return body
+
+    delivered = False
+
+    def track(chunk):
+        nonlocal delivered
+        delivered = True
+        on_chunk(chunk)
+
+    attempt = 0
+    while True:
+        try:
+            return fetch_text_once(url, track if on_chunk is not None else None, keep=bool(max_age_hours))
+        except Exception as e:
+            # Once a streaming consumer has seen part of the body, a retry would feed it twice.
+            if attempt >= RETRY_ATTEMPTS or delivered or not is_transient(e):
+                raise
+            time.sleep(retry_delay(attempt, e))
+            attempt += 1
+
+
+def fetch_text_once(url: str, on_chunk=None, keep: bool = False) -> str:
+    headers = {
+        "User-Agent": "job-finder-script/1.0",
+        "Accept": "text/html,application/xhtml+xml,application/json",
+        "Accept-Language": "de-DE,de;q=0.9,en;q=0.6",
+        "Accept-Encoding": "gzip, deflate",
+        "Connection": "keep-alive",
+    }
+    cached = HTTP_CACHE.get(url) if HTTP_CACHE is not None else None
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("lastModified"):
+            headers["If-Modified-Since"] = cached["lastModified"]
+    with host_slot(url):
+        try:
+            with open_url(url, headers) as r:
+                parts = []
+                for chunk in iter_response_text(r, MAX_BODY_BYTES):
+                    parts.append(chunk)
+                    if on_chunk is not None:
+                        on_chunk(chunk)
+                body = "".join(parts)
+                METRICS.add_request(r.status)
+                etag = r.headers.get("ETag", "")
+                last_modified = r.headers.get("Last-Modified", "")
+                content_type = r.headers.get("Content-Type", "")
+        except HTTPError as e:
+            METRICS.add_request(e.code)
+            if e.code == 304 and cached:
+                HTTP_CACHE.touch(url)
+                if HTTP_ARCHIVE is not None:
+                    HTTP_ARCHIVE.add(url, 200, cached.get("body", ""))
+                return cached.get("body", "")
+            if HTTP_ARCHIVE is not None:
+                HTTP_ARCHIVE.add(url, e.code)
+            raise
+        except Exception:
+            METRICS.add_request("error")
+            raise
+    if HTTP_ARCHIVE is not None:
+        HTTP_ARCHIVE.add(url, 200, body, {"Content-Type": content_type, "ETag": etag, "Last-Modified": last_modified})
+    if HTTP_CACHE is not None:
+        HTTP_CACHE.put(url, body, etag, last_modified, keep)
+    return body
+
+
+def fetch_json(url: str, max_age_hours: float = 0):
+    return json.loads(fetch_text(url, max_age_hours=max_age_hours))
+
+
+JSON_WS_RE = re.compile(r"\s*")
+JSON_SEP_RE = re.compile(r"[\s,]*")
+# What may follow a complete value: separators, closing brackets, the colon after a key, whitespace.
+JSON_DELIMITERS = frozenset(",]}: \t\r\n")
+
+
+class JsonItemStream:
+    """Incremental parser for a JSON object: each element of the array under `key` goes to on_item as soon as it is complete.
+
+    The other top-level members are kept in `rest`; fed chunk by chunk, only the pending element is buffered.
+    """
+
+    def __init__(self, key: str, on_item):
+        self.key = key
+        self.on_item = on_item
+        self.rest = {}
+        self.fed = False
+        self.seconds = 0.0
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._state = "start"
+        self._member = None
+
+    def feed(self, chunk: str) -> None:
+        self.fed = True
+        t0 = time.monotonic()
+        self._buf += chunk
+        self._run(final=False)
+        self.seconds += time.monotonic() - t0
+
+    def close(self) -> None:
+        self._run(final=True)
+        if self._state != "done":
+            raise ValueError(f"JSON unvollstaendig (Zustand: {self._state})")
+
+    def _decode(self, pos: int, final: bool):
+        # A value may still continue past the buffer end or a cut ("-350." decodes as -350), so before the
+        # last chunk it only counts once a delimiter follows it; otherwise it waits for more input.
+        try:
+            value, end = self._decoder.raw_decode(self._buf, pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return None, pos
+        if not final and (end >= len(self._buf) or self._buf[end] not in JSON_DELIMITERS):
+            return None, pos
+        return value, end
+
+    def _run(self, final: bool) -> None:
+        buf = self._buf
+        pos = 0
+        while True:
+            pos = (JSON_SEP_RE if self._state in {"member", "items"} else JSON_WS_RE).match(buf, pos).end()
+            if pos >= len(buf) or self._state == "done":
+                break
+            c = buf[pos]
+            if self._state == "start":
+                if c != "{":
+                    raise ValueError("JSON-Objekt erwartet")
+                self._state, pos = "member", pos + 1
+            elif self._state == "member":
+                if c == "}":
+                    self._state, pos = "done", pos + 1
+                    continue
+                key, end = self._decode(pos, final)
+                if end == pos:
+                    break
+                self._member, self._state, pos = key, "colon", end
+            elif self._state == "colon":
+                if c != ":":
+                    raise ValueError("':' erwartet")
+                self._state, pos = "value", pos + 1
+            elif self._state == "value":
+                if self._member == self.key and c == "[":
+                    self._state, pos = "items", pos + 1
+                    continue
+                value, end = self._decode(pos, final)
+                if end == pos:
+                    break
+                self.rest[self._member] = value
+                self._state, pos = "member", end
+            else:
+                if c == "]":
+                    self._state, pos = "member", pos + 1
+                    continue
+                item, end = self._decode(pos, final)
+                if end == pos:
+                    break
+                self.on_item(item)
+                pos = end
+        self._buf = buf[pos:]
 
 
 def norm(v) -> str:
     return str(v or "").lower()
 
 
+TAG_RE = re.compile(r"<[^>]+>")
+WS_RE = re.compile(r"\s+")
+CSS_RULE_RE = re.compile(r"\.[a-z0-9_-]+\{[^}]*\}", re.I)
+CSS_MEDIA_RE = re.compile(r"@media\s+[^{]+\{[^}]*\}", re.I)
+# Typical injected tracking/script fragments from some job portals; everything after them is noise.
+SCRIPT_TAIL_RE = re.compile(
+    r"\b(?:var\s+[a-zA-Z_][a-zA-Z0-9_]*\s*=|document\.addEventListener\([^)]*\)|window\.Livewire|trackImpression).*$",
+    re.I,
+)
+GOODCOMPANY_RE = re.compile(r"\bGoodCompany\b.*?(?=Referent|Manager|Leitung|Projekt|$)", re.I)
+FIRST_APPLICANTS_RE = re.compile(r"\bZu den Ersten gehören\b.*$", re.I)
+JOB_HINT_RE = re.compile(r"job|stelle|stellen|referent|manager|leitung|projekt|koordination|sachbearbeiter", re.I)
+REMOTE_RE = re.compile(r"remote|home\s?office", re.I)
+
+
 def strip_html(s: str) -> str:
-    return re.sub(r"\s+", " ", re.sub(r"<[^>]+>", " ", unescape(s or ""))).strip()
+    return WS_RE.sub(" ", TAG_RE.sub(" ", unescape(s or ""))).strip()
 
 
 def clean_job_title(s: str) -> str:
     t = strip_html(s)
-    t = re.sub(r"\.[a-z0-9_-]+\{[^}]*\}", " ", t, flags=re.I)
-    t = re.sub(r"@media\s+[^{]+\{[^}]*\}", " ", t, flags=re.I)
-    # Drop typical injected tracking/script fragments from some job portals.
-    t = re.sub(r"\bvar\s+[a-zA-Z_][a-zA-Z0-9_]*\s*=\s*.*$", " ", t, flags=re.I)
-    t = re.sub(r"\bdocument\.addEventListener\([^)]*\).*$", " ", t, flags=re.I)
-    t = re.sub(r"\bwindow\.Livewire[^.]*.*$", " ", t, flags=re.I)
-    t = re.sub(r"\btrackImpression\w*.*$", " ", t, flags=re.I)
-    t = re.sub(r"\bGoodCompany\b.*?(?=Referent|Manager|Leitung|Projekt|$)", " ", t, flags=re.I)
-    t = re.sub(r"\bZu den Ersten gehören\b.*$", " ", t, flags=re.I)
-    t = re.sub(r"\s+", " ", t).strip()
+    if "{" in t:
+        t = CSS_RULE_RE.sub(" ", t)
+        t = CSS_MEDIA_RE.sub(" ", t)
+    t = SCRIPT_TAIL_RE.sub(" ", t)
+    t = GOODCOMPANY_RE.sub(" ", t)
+    t = FIRST_APPLICANTS_RE.sub(" ", t)
+    t = WS_RE.sub(" ", t).strip()
     if len(t) > 220:
         t = t[:220].rsplit(" ", 1)[0].strip()
     return t
 
 
 def abs_url(base: str, maybe_rel: str) -> str:
+    # Fast path for the common root-relative link; urljoin only for anything that needs resolving.
+    if maybe_rel.startswith("/") and not maybe_rel.startswith("//") and "/." not in maybe_rel and "://" in base:
+        scheme, rest = base.split("://", 1)
+        return f"{scheme}://{rest.split('/', 1)[0].split('?', 1)[0].split('#', 1)[0]}{maybe_rel}"
     try:
         return urljoin(base, maybe_rel)
     except Exception:
@@ -223,18 +942,221 @@ def source_enabled(config, source_name: str) -> bool:
 def matches_strict_locations(job, locations) -> bool:
     if not locations:
         return True
-    hay = norm(" ".join([job.get("title", ""), job.get("location", ""), job.get("description", ""), job.get("url", "")]))
+    hay = norm(" ".join([job.title, job.location, job.description, job.url]))
     return any(norm(loc) in hay for loc in locations)
 
 
-def parse_jsonld_jobs(html: str, source: str, base: str):
+PAGE_TAG_RE = re.compile(r"<(?:(script)\b([^>]*)>|(a)\b([^>]*)>|(meta)\b([^>]*)>|(/a)\s*>)", re.I)
+# Same groups as PAGE_TAG_RE, but anchors can never match.
+HEAD_TAG_RE = re.compile(r"<(?:(script)\b([^>]*)>|(?!)(a)()|(meta)\b([^>]*)>|(?!)(/a))", re.I)
+SCRIPT_END_RE = re.compile(r"</script\s*>", re.I)
+ATTR_RE = re.compile(r"([a-zA-Z_:][-a-zA-Z0-9_:.]*)\s*=\s*(?:\"([^\"]*)\"|'([^']*)'|([^\s\"'>]+))")
+
+
+def tag_attrs(raw: str):
+    return {m.group(1).lower(): unescape(m.group(2) if m.group(2) is not None else m.group(3) if m.group(3) is not None else m.group(4)) for m in ATTR_RE.finditer(raw)}
+
+
+class PageExtractor:
+    """Single streaming pass over a page: JSON-LD bodies, anchors, meta description and leading text.
+
+    Only <script>, <a>, </a> and <meta> tags are looked at, so the scan itself stays in the regex engine.
+    Feed decoded chunks as they arrive and call close() at the end.
+    """
+
+    def __init__(self, url_pattern=None, stop_after_jobposting: bool = False, text_limit: int = 0, anchors: bool = True):
+        self.jsonld = []
+        self.anchors = []
+        self.meta_description = ""
+        self.urls = []
+        self.fed = False
+        self.done = False
+        self._url_pattern = url_pattern
+        self._url_tail = ""
+        self._stop_after_jobposting = stop_after_jobposting
+        self._text_limit = text_limit
+        self._text = []
+        self._text_len = 0
+        self._buf = ""
+        self._pos = 0
+        self._anchor = None
+        self._tag_re = PAGE_TAG_RE if anchors else HEAD_TAG_RE
+
+    def feed(self, data: str) -> None:
+        self.fed = True
+        if self._url_pattern is not None:
+            self._scan_urls(data)
+        if self._text_len < self._text_limit:
+            piece = strip_html(data)
+            self._text.append(piece)
+            self._text_len += len(piece)
+        if not self.done:
+            self._buf += data
+            self._scan()
+
+    def close(self) -> None:
+        if self._url_pattern is not None and self._url_tail:
+            self.urls.extend(m.group(0) for m in self._url_pattern.finditer(self._url_tail))
+            self._url_tail = ""
+        self._buf = ""
+        self._pos = 0
+        self._anchor = None
+
+    @property
+    def text(self) -> str:
+        return " ".join(t for t in self._text if t)
+
+    def _scan_urls(self, data: str) -> None:
+        # Raw URL scan over the undecoded markup; the trailing token is carried into the next chunk.
+        buf = self._url_tail + data
+        cut = max(buf.rfind(c) for c in " \t\r\n\"'") + 1
+        if len(buf) - cut > 8192:
+            cut = len(buf)
+        self.urls.extend(m.group(0) for m in self._url_pattern.finditer(buf, 0, cut))
+        self._url_tail = buf[cut:]
+
+    def _scan(self) -> None:
+        buf = self._buf
+        pos = self._pos
+        while not self.done:
+            m = self._tag_re.search(buf, pos)
+            if m is None:
+                # A tag cut off at the chunk boundary is rescanned with the next chunk.
+                lt = buf.rfind("<", pos)
+                if lt != -1:
+                    pos = lt
+                break
+            if m.group(1):
+                if norm(tag_attrs(m.group(2)).get("type")).strip() == "application/ld+json":
+                    end = SCRIPT_END_RE.search(buf, m.end())
+                    if end is None:
+                        pos = m.start()
+                        break
+                    body = buf[m.end() : end.start()]
+                    self.jsonld.append(body)
+                    pos = end.end()
+                    if self._stop_after_jobposting and "JobPosting" in body:
+                        self.done = True
+                    continue
+            elif m.group(3):
+                if self._anchor is None:
+                    attrs = tag_attrs(m.group(4))
+                    if attrs.get("href"):
+                        self._anchor = (attrs["href"], attrs.get("title") or "", m.end())
+            elif m.group(5):
+                if not self.meta_description:
+                    attrs = tag_attrs(m.group(6))
+                    if norm(attrs.get("name") or attrs.get("property")) in {"description", "og:description"} and attrs.get("content"):
+                        self.meta_description = strip_html(attrs["content"])
+            elif self._anchor is not None:
+                href, title, start = self._anchor
+                self.anchors.append((href, title, buf[start : m.start()]))
+                self._anchor = None
+            pos = m.end()
+
+        # Drop everything that is fully processed, but keep the inner markup of an open anchor.
+        keep = pos if self._anchor is None else min(pos, self._anchor[2])
+        if keep:
+            if self._anchor is not None:
+                href, title, start = self._anchor
+                self._anchor = (href, title, start - keep)
+            buf = buf[keep:]
+            pos -= keep
+        self._buf = buf
+        self._pos = pos
+
+
+def extract_page(html: str, **kwargs) -> PageExtractor:
+    page = PageExtractor(**kwargs)
+    page.feed(html or "")
+    page.close()
+    return page
+
+
+def fetch_page(url: str, max_age_hours: float = 0, **kwargs):
+    # Tokenizes while the body downloads; cached (304 or still fresh) bodies are fed afterwards.
+    page = PageExtractor(**kwargs)
+    html = fetch_text(url, on_chunk=page.feed, max_age_hours=max_age_hours)
+    if not page.fed:
+        page.feed(html)
+    page.close()
+    return html, page
+
+
+def fetch_parsed(name: str, url: str, parse, max_age_hours: float = 0, **kwargs):
+    # fetch_page() plus cached_parse(): parse(page) returns the jobs. A downloaded body is tokenized while
+    # it streams in; a cached one (304 or still fresh) only if its content digest misses the parse cache.
+    page = PageExtractor(**kwargs)
+    html = fetch_text(url, on_chunk=page.feed, max_age_hours=max_age_hours)
+
+    def run(body):
+        if not page.fed:
+            page.feed(body)
+        page.close()
+        return parse(page)
+
+    return cached_parse(name, url, html, run)
+
+
+JOB_FIELDS = ("source", "title", "company", "location", "remote", "tags", "description", "url", "publishedAt", "ageDays", "reasons", "score")
+# Few distinct values across thousands of postings: one shared string object each.
+INTERNED_FIELDS = frozenset({"source", "company", "location"})
+
+
+def intern_text(v):
+    return sys.intern(v) if type(v) is str else v
+
+
+class Job:
+    """One posting as a slotted record with attribute access; to_dict() gives the JSON schema.
+
+    ageDays, reasons and score stay unset (and out of to_dict) until the pipeline sets them.
+    """
+
+    __slots__ = JOB_FIELDS
+
+    def __init__(self, source="", title="", company="", location="", remote=False, tags=None, description="", url="", publishedAt=None):
+        self.source = sys.intern(source) if type(source) is str else source
+        self.title = title
+        self.company = sys.intern(company) if type(company) is str else company
+        self.location = sys.intern(location) if type(location) is str else location
+        self.remote = remote
+        self.tags = [] if tags is None else tags
+        self.description = description
+        self.url = url
+        self.publishedAt = publishedAt
+
+    @classmethod
+    def from_dict(cls, d):
+        job = cls()
+        job.update(**{k: d[k] for k in JOB_FIELDS if k in d})
+        return job
+
+    def to_dict(self) -> dict:
+        return {k: getattr(self, k) for k in JOB_FIELDS if hasattr(self, k)}
+
+    def update(self, **fields) -> None:
+        # Fields set from parsed or stored data by name; unknown names raise AttributeError.
+        for k, v in fields.items():
+            setattr(self, k, intern_text(v) if k in INTERNED_FIELDS else v)
+
+    def copy(self, **changes) -> "Job":
+        job = Job.__new__(Job)
+        for k in JOB_FIELDS:
+            if hasattr(self, k):
+                setattr(job, k, getattr(self, k))
+        job.update(**changes)
+        return job
+
+    def __repr__(self) -> str:
+        return f"Job({self.to_dict()!r})"
+
+
+def jobs_from_jsonld(scripts, source: str, base: str):
     out = []
-    scripts = re.findall(
-        r"<script[^>]*type=[\"']application/ld\+json[\"'][^>]*>([\s\S]*?)</script>",
-        html,
-        flags=re.I,
-    )
     for raw in scripts:
+        if "JobPosting" not in raw:
+            continue
         try:
             obj = json.loads(raw.strip())
         except Exception:
@@ -254,30 +1176,36 @@ def parse_jsonld_jobs(html: str, source: str, base: str):
             if norm(source) == "stepstone" and is_platform_company(company):
                 company = infer_company_from_title(title, company)
             out.append(
-                {
-                    "source": source,
-                    "title": title,
-                    "company": company,
-                    "location": strip_html(loc_text),
-                    "remote": bool(re.search(r"remote|home\s?office", json.dumps(n, ensure_ascii=False), re.I)),
-                    "tags": [],
-                    "description": strip_html(n.get("description", "")),
-                    "url": url,
-                    "publishedAt": n.get("datePosted"),
-                }
+                Job(
+                    source=source,
+                    title=title,
+                    company=company,
+                    location=strip_html(loc_text),
+                    remote=bool(REMOTE_RE.search(json.dumps(n, ensure_ascii=False))),
+                    tags=[],
+                    description=strip_html(n.get("description", "")),
+                    url=url,
+                    publishedAt=n.get("datePosted"),
+                )
             )
     return out
 
 
-def parse_anchor_jobs(html: str, source: str, base: str):
+def parse_jsonld_jobs(html: str, source: str, base: str):
+    return jobs_from_jsonld(extract_page(html, anchors=False).jsonld, source, base)
+
+
+def jobs_from_anchors(anchors, source: str, base: str):
     out = []
     seen = set()
-    for href, label in re.findall(r"<a[^>]*href=[\"']([^\"']+)[\"'][^>]*>([\s\S]*?)</a>", html, flags=re.I):
+    for href, _, label in anchors:
+        # Cleaning only removes text, so anchors without any job hint can be skipped up front.
+        if not (JOB_HINT_RE.search(label) or JOB_HINT_RE.search(href)):
+            continue
         text = clean_job_title(label)
         if len(text) < 8:
             continue
-        probe = f"{text} {href}"
-        if not re.search(r"job|stelle|stellen|referent|manager|leitung|projekt|koordination|sachbearbeiter", probe, re.I):
+        if not JOB_HINT_RE.search(f"{text} {href}"):
             continue
         url = abs_url(base, href)
         key = f"{norm(url)}|{norm(text)}"
@@ -286,21 +1214,25 @@ def parse_anchor_jobs(html: str, source: str, base: str):
         seen.add(key)
         company = infer_company_from_title(text, source)
         out.append(
-            {
-                "source": source,
-                "title": text,
-                "company": company,
-                "location": "",
-                "remote": bool(re.search(r"remote|home\s?office", text, re.I)),
-                "tags": [],
-                "description": "",
-                "url": url,
-                "publishedAt": None,
-            }
+            Job(
+                source=source,
+                title=text,
+                company=company,
+                location="",
+                remote=bool(REMOTE_RE.search(text)),
+                tags=[],
+                description="",
+                url=url,
+                publishedAt=None,
+            )
         )
     return out
 
 
+def parse_anchor_jobs(html: str, source: str, base: str):
+    return jobs_from_anchors(extract_page(html).anchors, source, base)
+
+
 def title_from_job_url(url: str) -> str:
     try:
         p = urlparse(url)
@@ -314,36 +1246,32 @@ def title_from_job_url(url: str) -> str:
         return ""
 
 
-def parse_karriereportal_berlin_jobs(html: str, base: str):
+KARRIEREPORTAL_URL_RE = re.compile(r"https?://[^\s\"']*karriereportal-stellen\.berlin\.de[^\s\"']+", re.I)
+KARRIEREPORTAL_JOB_URL_RE = re.compile(r"stellen|job|vakanz|ausschreibung|-de-j\d+|/de/jobs?/|/de/stellen", re.I)
+NON_JOB_LINK_RE = re.compile(r"impressum|datenschutz|kontakt|newsletter|barrierefrei|hilfe|login|registr", re.I)
+
+
+def karriereportal_jobs_from_page(page: PageExtractor, base: str):
     out = []
     seen = set()
 
     # 1) Anchor-based extraction with looser rules than generic parser.
-    for m in re.finditer(r"<a([^>]*?)href=[\"']([^\"']+)[\"']([^>]*)>([\s\S]*?)</a>", html, flags=re.I):
-        attrs_l = (m.group(1) or "") + " " + (m.group(3) or "")
-        href = m.group(2) or ""
-        inner = m.group(4) or ""
-        text = clean_job_title(inner)
-        if not text:
-            t_m = re.search(r"title=[\"']([^\"']+)[\"']", attrs_l, flags=re.I)
-            if t_m:
-                text = clean_job_title(t_m.group(1))
-
+    for href, title_attr, inner in page.anchors:
         url = abs_url(base, href)
         low_url = norm(url)
         if "karriereportal-stellen.berlin.de" not in low_url:
             continue
-
-        likely_job_url = bool(
-            re.search(r"stellen|job|vakanz|ausschreibung|-de-j\d+|/de/jobs?/|/de/stellen", low_url, flags=re.I)
-        )
-        if not likely_job_url:
+        if not KARRIEREPORTAL_JOB_URL_RE.search(low_url):
             continue
+
+        text = clean_job_title(inner)
+        if not text and title_attr:
+            text = clean_job_title(title_attr)
         if len(text) < 6:
             text = title_from_job_url(url)
         if len(text) < 6:
             continue
-        if re.search(r"impressum|datenschutz|kontakt|newsletter|barrierefrei|hilfe|login|registr", text, re.I):
+        if NON_JOB_LINK_RE.search(text):
             continue
 
         key = canonical_url(url)
@@ -351,22 +1279,22 @@ def parse_karriereportal_berlin_jobs(html: str, base: str):
             continue
         seen.add(key)
         out.append(
-            {
-                "source": "KarriereportalBerlin",
-                "title": text,
-                "company": "Land Berlin",
-                "location": "Berlin",
-                "remote": False,
-                "tags": [],
-                "description": "",
-                "url": url,
-                "publishedAt": None,
-            }
+            Job(
+                source="KarriereportalBerlin",
+                title=text,
+                company="Land Berlin",
+                location="Berlin",
+                remote=False,
+                tags=[],
+                description="",
+                url=url,
+                publishedAt=None,
+            )
         )
 
     # 2) URL-pattern fallback for JS-rendered pages.
-    for url in re.findall(r"https?://[^\s\"']*karriereportal-stellen\.berlin\.de[^\s\"']+", html, flags=re.I):
-        if not re.search(r"stellen|job|vakanz|ausschreibung|-de-j\d+|/de/jobs?/|/de/stellen", url, flags=re.I):
+    for url in page.urls:
+        if not KARRIEREPORTAL_JOB_URL_RE.search(url):
             continue
         key = canonical_url(url)
         if key in seen:
@@ -374,133 +1302,549 @@ def parse_karriereportal_berlin_jobs(html: str, base: str):
         seen.add(key)
         title = title_from_job_url(url) or "Stellenangebot (Land Berlin)"
         out.append(
-            {
-                "source": "KarriereportalBerlin",
-                "title": clean_job_title(title),
-                "company": "Land Berlin",
-                "location": "Berlin",
-                "remote": False,
-                "tags": [],
-                "description": "",
-                "url": url,
-                "publishedAt": None,
-            }
+            Job(
+                source="KarriereportalBerlin",
+                title=clean_job_title(title),
+                company="Land Berlin",
+                location="Berlin",
+                remote=False,
+                tags=[],
+                description="",
+                url=url,
+                publishedAt=None,
+            )
         )
 
     return out
 
 
-def fetch_karriereportal_berlin_jobs():
-    jobs = []
-    urls = [
-        "https://www.karriereportal-stellen.berlin.de/stellenangebote.html?filter%5Bvolltext%5D=",
-        "https://www.karriereportal-stellen.berlin.de/stellenangebote.html?filter%5Bvolltext%5D=referent",
-    ]
-    for u in urls:
-        html = fetch_text(u)
-        jobs.extend(parse_karriereportal_berlin_jobs(html, u))
+def parse_karriereportal_berlin_jobs(html: str, base: str):
+    return karriereportal_jobs_from_page(extract_page(html, url_pattern=KARRIEREPORTAL_URL_RE), base)
+
+
+def arbeitnow_job(i):
+    return Job(
+        source="Arbeitnow",
+        title=i.get("title", ""),
+        company=i.get("company_name", ""),
+        location=i.get("location") or ("Remote" if i.get("remote") else ""),
+        remote=bool(i.get("remote")),
+        tags=i.get("tags", []),
+        description=i.get("description", ""),
+        url=i.get("url", ""),
+        publishedAt=i.get("created_at"),
+    )
+
+
+def remotive_job(i):
+    return Job(
+        source="Remotive",
+        title=i.get("title", ""),
+        company=i.get("company_name", ""),
+        location=i.get("candidate_required_location", ""),
+        remote=True,
+        tags=i.get("tags", []),
+        description=i.get("description", ""),
+        url=i.get("url", ""),
+        publishedAt=i.get("publication_date"),
+    )
+
+
+def studysmarter_job(i):
+    def names(key):
+        return [str(x.get("name")) for x in i.get(key) or [] if isinstance(x, dict) and x.get("name")]
+
+    posted = str(i.get("posted") or "").strip()
+    return Job(
+        source="StudySmarter",
+        title=strip_html(i.get("title") or ""),
+        company=strip_html(i.get("company_name") or "StudySmarter"),
+        location=strip_html(", ".join(str(l) for l in i.get("locations") or [] if l)),
+        remote=bool(re.search(r"yes|true|remote", str(i.get("is_remote_positions") or ""), re.I)),
+        tags=names("job_categories") + names("job_types") + names("job_industries"),
+        description="",
+        url=str(i.get("link") or ""),
+        publishedAt=posted.replace(" ", "T", 1) if posted else None,
+    )
+
+
+def arbeitnow_jobs_from_body(body):
+    return [arbeitnow_job(i) for i in body.get("data", [])]
+
+
+def remotive_jobs_from_body(body):
+    return [remotive_job(i) for i in body.get("jobs", [])]
+
+
+# Profile filters applied while API feeds stream in (set by configure_stream_filters); none of these
+# sources has detail pages, so every filter is decidable from the feed item.
+STREAM_FILTERS = []
+STREAM_LOOKBACK_DAYS = 0.0
+
+
+def configure_stream_filters(config) -> None:
+    global STREAM_FILTERS, STREAM_LOOKBACK_DAYS
+    STREAM_FILTERS = job_filters(config)
+    STREAM_LOOKBACK_DAYS = float(config.get("lookbackDays") or 0)
+
+
+class ApiFeed:
+    """One API feed page parsed while it downloads; postings failing a filter are dropped as they arrive."""
+
+    def __init__(self, key: str, to_job, filters=None, lookback_days=None):
+        self.to_job = to_job
+        self.filters = STREAM_FILTERS if filters is None else filters
+        self.lookback_days = STREAM_LOOKBACK_DAYS if lookback_days is None else lookback_days
+        self.jobs = []
+        self.dropped = {}
+        self.dropped_keys = set()
+        # Any posting inside lookbackDays, dropped or not; without filters every page counts as recent.
+        self.recent = not self.filters
+        self.stream = JsonItemStream(key, self._item)
+
+    def _item(self, item) -> None:
+        if not isinstance(item, dict):
+            return
+        job = self.to_job(item)
+        if not self.recent:
+            age = days_since(job.publishedAt)
+            self.recent = age == 9999 or age <= self.lookback_days
+        failed = next((name for name, _, keep in self.filters if not keep(job)), None)
+        if failed is None:
+            self.jobs.append(job)
+        else:
+            self.dropped[failed] = self.dropped.get(failed, 0) + 1
+            self.dropped_keys.add(dedupe_key(job))
+
+    def feed(self, chunk: str) -> None:
+        self.stream.feed(chunk)
+
+    def close(self) -> None:
+        self.stream.close()
+
+
+def stream_api_jobs(url: str, key: str, to_job, max_age_hours: float = 0):
+    # Only survivors (and their descriptions) are kept. Returns the feed with jobs, other members (stream.rest) and recent.
+    feed = ApiFeed(key, to_job)
+    text = fetch_text(url, on_chunk=feed.feed, max_age_hours=max_age_hours)
+    if not feed.stream.fed:
+        feed.feed(text)
+    feed.close()
+    METRICS.add_parse(feed.stream.seconds)
+    for name, n in feed.dropped.items():
+        METRICS.dropped(name, n, 0)
+    METRICS.add_streamed_out(feed.dropped_keys)
+    return feed
+
+
+def listing_jobs_from_page(page: PageExtractor, source: str, url: str):
+    jobs = jobs_from_jsonld(page.jsonld, source, url)
+    if source == "KarriereportalBerlin":
+        jobs.extend(karriereportal_jobs_from_page(page, url))
+    else:
+        jobs.extend(jobs_from_anchors(page.anchors, source, url))
     return jobs
 
 
-def fetch_sources(config):
-    jobs = []
-    warnings = []
-    if source_enabled(config, "Arbeitnow"):
-        try:
-            for p in [1, 2, 3]:
-                body = fetch_json(f"https://www.arbeitnow.com/api/job-board-api?page={p}")
-                for i in body.get("data", []):
-                    jobs.append(
-                        {
-                            "source": "Arbeitnow",
-                            "title": i.get("title", ""),
-                            "company": i.get("company_name", ""),
-                            "location": i.get("location") or ("Remote" if i.get("remote") else ""),
-                            "remote": bool(i.get("remote")),
-                            "tags": i.get("tags", []),
-                            "description": i.get("description", ""),
-                            "url": i.get("url", ""),
-                            "publishedAt": i.get("created_at"),
-                        }
-                    )
-                if not (body.get("links") or {}).get("next"):
-                    break
-        except Exception as e:
-            warnings.append(f"Arbeitnow fehlgeschlagen: {e}")
+def fetch_listing_jobs(source: str, url: str, max_age_hours: float = 0):
+    pattern = KARRIEREPORTAL_URL_RE if source == "KarriereportalBerlin" else None
+    return fetch_parsed(f"listing-{norm(source)}", url, lambda page: listing_jobs_from_page(page, source, url), max_age_hours, url_pattern=pattern)
 
-    if source_enabled(config, "Remotive"):
-        try:
-            body = fetch_json("https://remotive.com/api/remote-jobs")
-            for i in body.get("jobs", []):
-                loc = i.get("candidate_required_location", "")
-                jobs.append(
-                    {
-                        "source": "Remotive",
-                        "title": i.get("title", ""),
-                        "company": i.get("company_name", ""),
-                        "location": loc,
-                        "remote": True,
-                        "tags": i.get("tags", []),
-                        "description": i.get("description", ""),
-                        "url": i.get("url", ""),
-                        "publishedAt": i.get("publication_date"),
-                    }
-                )
-        except Exception as e:
-            warnings.append(f"Remotive fehlgeschlagen: {e}")
-
-    interamt_url = str(config.get("interamtSearchUrl") or "https://interamt.de/koop/app/trefferliste?5").strip()
-
-    for source, urls in [
-        ("GesinesJobtipps", ["https://gesinesjobtipps.de/region/berlin-und-umgebung/"]),
-        ("Interamt", [interamt_url]),
-        ("BundService", ["https://bund.service.de/", "https://service.bund.de/"]),
-        ("BMWK", ["https://www.bundeswirtschaftsministerium.de/Navigation/DE/Ministerium/Stellenangebote/stellenangebote.html"]),
-        ("BMG", ["https://www.bundesgesundheitsministerium.de/ministerium/karriere/stellenangebote"]),
-        ("BMI", ["https://www.bmi.bund.de/DE/service/stellenangebote/stellenangebote-node.html"]),
-        ("BMBFSFJ", ["https://www.bmbfsfj.bund.de/bmbfsfj/ministerium/bmbfsfj-als-arbeitgeber/ausschreibungen"]),
-        ("BMDS", ["https://bmds.bund.de/ministerium/bmds-als-arbeitgeber"]),
-        ("BMF", ["https://www.bundesfinanzministerium.de/Web/DE/Ministerium/Arbeiten-Ausbildung/Stellenangebote/stellenangebote.html"]),
-        ("Arbeitsagentur", ["https://www.arbeitsagentur.de/jobsuche/suche?angebotsart=1&wo=Berlin"]),
-        ("LinkedInJobs", ["https://de.linkedin.com/jobs/search/?keywords=Public%20Affairs&location=Berlin"]),
-        ("GoodJobs", ["https://goodjobs.eu/jobs"]),
-    ]:
-        if not source_enabled(config, source):
+
+# Parser strategies fetch one result page and return (jobs, has_more).
+def listing_page_strategy(source: str, url: str, max_age_hours: float):
+    jobs = fetch_listing_jobs(source, url, max_age_hours)
+    return jobs, bool(jobs)
+
+
+def karriereportal_page_strategy(source: str, url: str, max_age_hours: float):
+    jobs = fetch_parsed("karriereportal", url, lambda page: karriereportal_jobs_from_page(page, url), max_age_hours, url_pattern=KARRIEREPORTAL_URL_RE)
+    return jobs, bool(jobs)
+
+
+def arbeitnow_page_strategy(source: str, url: str, max_age_hours: float):
+    feed = stream_api_jobs(url, "data", arbeitnow_job, max_age_hours)
+    # The feed is newest first: a page without any posting inside lookbackDays ends the crawl,
+    # even though its postings were already dropped.
+    return feed.jobs, feed.recent and bool((feed.stream.rest.get("links") or {}).get("next"))
+
+
+def remotive_page_strategy(source: str, url: str, max_age_hours: float):
+    return stream_api_jobs(url, "jobs", remotive_job, max_age_hours).jobs, False
+
+
+def studysmarter_page_strategy(source: str, url: str, max_age_hours: float):
+    return [j for j in stream_api_jobs(url, "data", studysmarter_job, max_age_hours).jobs if j.url and j.title], False
+
+
+PARSER_STRATEGIES = {
+    "listing": listing_page_strategy,
+    "karriereportal": karriereportal_page_strategy,
+    "arbeitnow": arbeitnow_page_strategy,
+    "remotive": remotive_page_strategy,
+    "studysmarter": studysmarter_page_strategy,
+}
+
+# Built-in sources, in merge order. Profile entries under "sources" override them by name or add new ones.
+# URL templates may use {page}, {keyword}, {stepstoneLocation} and any plain config value (e.g. {interamtSearchUrl}).
+BUILTIN_SOURCES = [
+    {"name": "Arbeitnow", "urls": ["https://www.arbeitnow.com/api/job-board-api?page={page}"], "parser": "arbeitnow", "pagination": {"start": 1, "maxPages": 10}},
+    {"name": "Remotive", "urls": ["https://remotive.com/api/remote-jobs"], "parser": "remotive"},
+    {"name": "GesinesJobtipps", "urls": ["https://gesinesjobtipps.de/region/berlin-und-umgebung/"]},
+    {"name": "Interamt", "urls": ["{interamtSearchUrl}"]},
+    {"name": "BundService", "urls": ["https://bund.service.de/", "https://service.bund.de/"]},
+    {"name": "BMWK", "urls": ["https://www.bundeswirtschaftsministerium.de/Navigation/DE/Ministerium/Stellenangebote/stellenangebote.html"]},
+    {"name": "BMG", "urls": ["https://www.bundesgesundheitsministerium.de/ministerium/karriere/stellenangebote"]},
+    {"name": "BMI", "urls": ["https://www.bmi.bund.de/DE/service/stellenangebote/stellenangebote-node.html"]},
+    {"name": "BMBFSFJ", "urls": ["https://www.bmbfsfj.bund.de/bmbfsfj/ministerium/bmbfsfj-als-arbeitgeber/ausschreibungen"]},
+    {"name": "BMDS", "urls": ["https://bmds.bund.de/ministerium/bmds-als-arbeitgeber"]},
+    {"name": "BMF", "urls": ["https://www.bundesfinanzministerium.de/Web/DE/Ministerium/Arbeiten-Ausbildung/Stellenangebote/stellenangebote.html"]},
+    {"name": "Arbeitsagentur", "urls": ["https://www.arbeitsagentur.de/jobsuche/suche?angebotsart=1&wo=Berlin"]},
+    {"name": "LinkedInJobs", "urls": ["https://de.linkedin.com/jobs/search/?keywords=Public%20Affairs&location=Berlin"]},
+    {"name": "GoodJobs", "urls": ["https://goodjobs.eu/jobs"]},
+    {
+        "name": "KarriereportalBerlin",
+        "urls": [
+            "https://www.karriereportal-stellen.berlin.de/stellenangebote.html?filter%5Bvolltext%5D=",
+            "https://www.karriereportal-stellen.berlin.de/stellenangebote.html?filter%5Bvolltext%5D=referent",
+        ],
+        "parser": "karriereportal",
+    },
+    {"name": "StepStone", "urls": ["https://www.stepstone.de/jobs/{keyword}/in-{stepstoneLocation}?page={page}"], "pagination": {"start": 1, "maxPages": 5}},
+    {
+        "name": "StudySmarter",
+        "urls": [
+            "https://talents.studysmarter.de/wp-json/studysmarter/v1/jobs/?keyword={keyword}&page_number=1&city=Berlin"
+            "&job_listing_type=&job_listing_category=&job_listing_tag=&job_listing_company_size=&job_listing_industry="
+            "&job_listing_seniority_level=&is_remote_position=&radius=&isResetClicked=false&easy_apply=&salary_min="
+            "&salary_max=&job_age=&premium_only=",
+        ],
+        "parser": "studysmarter",
+    },
+]
+SOURCE_DEFAULTS = {
+    "parser": "listing",
+    "pagination": None,
+    "hostConcurrency": 0,
+    "requestBudget": 0,
+    "refreshHours": 0,
+    "enabled": True,
+}
+
+
+class PartialFetch(Exception):
+    """A later result page failed; the jobs of the pages before it are still usable."""
+
+    def __init__(self, jobs, error):
+        super().__init__(str(error))
+        self.jobs = jobs
+
+
+class RequestBudget:
+    """Caps the listing requests one source may make per run (0 = unlimited)."""
+
+    def __init__(self, limit: int):
+        self.left = int(limit) if limit and int(limit) > 0 else None
+        self._lock = threading.Lock()
+
+    def take(self, n: int) -> int:
+        with self._lock:
+            if self.left is None:
+                return n
+            granted = min(n, self.left)
+            self.left -= granted
+            return granted
+
+
+def source_registry(config):
+    entries = [dict(e) for e in BUILTIN_SOURCES]
+    by_name = {norm(e["name"]): e for e in entries}
+    for spec in config.get("sources") or []:
+        if not isinstance(spec, dict) or not str(spec.get("name") or "").strip():
             continue
-        for u in urls:
+        spec = dict(spec)
+        if "url" in spec:
+            spec.setdefault("urls", [spec.pop("url")])
+        current = by_name.get(norm(spec["name"]))
+        if current is not None:
+            spec["name"] = current["name"]
+            current.update(spec)
+        else:
+            entries.append(spec)
+            by_name[norm(spec["name"])] = spec
+    return [{**SOURCE_DEFAULTS, **e} for e in entries if e.get("enabled", True) is not False]
+
+
+def template_vars(config):
+    values = {k: str(v) for k, v in config.items() if isinstance(v, (str, int, float)) and not isinstance(v, bool)}
+    values["interamtSearchUrl"] = str(config.get("interamtSearchUrl") or DEFAULT_CONFIG["interamtSearchUrl"]).strip()
+    values["keyword"] = quote((config.get("keywordsMust") or ["politik"])[0])
+    loc_pref = "-".join([l for l in config.get("locationsPreferred", []) if re.search(r"berlin|potsdam", l, re.I)]) or "berlin"
+    values["stepstoneLocation"] = quote(loc_pref)
+    return values
+
+
+def page_is_stale(jobs, lookback_days: float, known) -> bool:
+    # Only postings outside the lookback window or already known: deeper pages will not add anything new.
+    for j in jobs:
+        age = days_since(j.publishedAt)
+        if age != 9999 and age > lookback_days:
+            continue
+        if job_key(j) in known:
+            continue
+        return False
+    return True
+
+
+def crawl_source_url(spec, template: str, values, budget: RequestBudget, lookback_days: float = 0, known=frozenset(), stopped=None):
+    # stopped: collects sources whose crawl ended on already known postings (their deeper pages are carried over from the index).
+    name = spec["name"]
+    strategy = PARSER_STRATEGIES.get(spec["parser"])
+    if strategy is None:
+        raise ValueError(f"Unbekannte Parser-Strategie: {spec['parser']}")
+    refresh = float(spec.get("refreshHours") or 0)
+    if "{page}" not in template:
+        return strategy(name, template.format_map(values), refresh)[0] if budget.take(1) else []
+
+    pagination = spec.get("pagination") or {}
+    start, step = int(pagination.get("start", 1)), int(pagination.get("step", 1))
+    max_pages = max(1, int(pagination.get("maxPages") or 1))
+    window = max(1, int(spec.get("hostConcurrency") or HOST_CONCURRENCY))
+
+    def fetch(page_url):
+        with METRICS.attribute(name):
             try:
-                html = fetch_text(u)
-                jobs.extend(parse_jsonld_jobs(html, source, u))
-                if source == "KarriereportalBerlin":
-                    jobs.extend(parse_karriereportal_berlin_jobs(html, u))
-                else:
-                    jobs.extend(parse_anchor_jobs(html, source, u))
+                return strategy(name, page_url, refresh), None
             except Exception as e:
-                warnings.append(f"{source} fehlgeschlagen: {e}")
+                return ([], False), e
+
+    stop_when_stale = bool(pagination.get("stopWhenStale", True)) and lookback_days > 0
+    jobs = []
+    seen = set()
+    done = 0
+    while done < max_pages:
+        # Pages are fetched in windows of the host limit; a window ends the crawl once a page says "no more"
+        # or, with stopWhenStale, holds nothing but postings that are too old or already known.
+        count = budget.take(min(window, max_pages - done))
+        if not count:
+            break
+        urls = [template.format_map({**values, "page": start + (done + k) * step}) for k in range(count)]
+        if count == 1:
+            results = [fetch(urls[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=count, thread_name_prefix="job-finder-page") as pool:
+                results = list(pool.map(fetch, urls))
+        last = False
+        for (page_jobs, has_more), err in results:
+            if err is not None:
+                if not jobs:
+                    raise err
+                raise PartialFetch(jobs, err)
+            if stop_when_stale and page_jobs and page_is_stale(page_jobs, lookback_days, known | seen):
+                last = True
+                if stopped is not None and any(job_key(j) in known for j in page_jobs):
+                    stopped.add(name)
+            seen.update(job_key(j) for j in page_jobs)
+            jobs.extend(page_jobs)
+            last = last or not has_more
+        if last:
+            break
+        done += count
+    return jobs
+
+
+def source_tasks(config, known=frozenset(), stopped=None, only=None):
+    # Ordered list of (source, fetch callable). The order defines how results are merged.
+    tasks = []
+    values = template_vars(config)
+    lookback = float(config.get("lookbackDays") or 0)
+    for spec in source_registry(config):
+        if not source_enabled(config, spec["name"]) or (only is not None and spec["name"] not in only):
+            continue
+        budget = RequestBudget(spec.get("requestBudget") or 0)
+        for template in spec.get("urls") or []:
+            template = str(template).strip()
+            if spec.get("hostConcurrency"):
+                host = urlparse(template.format_map({**values, "page": 1})).netloc.lower()
+                HOST_LIMITS[host] = int(spec["hostConcurrency"])
+            tasks.append(
+                (
+                    spec["name"],
+                    lambda spec=spec, template=template, budget=budget: crawl_source_url(spec, template, values, budget, lookback, known, stopped),
+                )
+            )
+    return tasks
+
+
+class SourceHealth:
+    """Persisted per-source run history with a circuit breaker (closed -> open -> half-open -> closed)."""
+
+    LATENCY_WINDOW = 10
+
+    def __init__(self, path=None, failure_threshold: int = 3, cooldown_hours: float = 6):
+        self.path = Path(path) if path else None
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.cooldown = timedelta(hours=float(cooldown_hours))
+        self.sources = {}
+        self.skipped = {}
+        self._lock = threading.Lock()
+        if self.path is not None and self.path.exists():
+            try:
+                self.sources = json.loads(self.path.read_text(encoding="utf-8")).get("sources", {})
+            except (OSError, ValueError):
+                self.sources = {}
+
+    def _rec(self, source: str):
+        rec = self.sources.get(source)
+        if rec is None:
+            rec = self.sources[source] = {
+                "state": "closed",
+                "runs": 0,
+                "successes": 0,
+                "consecutiveFailures": 0,
+                "latencies": [],
+                "lastError": "",
+                "lastErrorAt": None,
+                "lastSuccessAt": None,
+                "openUntil": None,
+            }
+        return rec
+
+    def allow(self, source: str, now=None) -> bool:
+        now = now or datetime.now(timezone.utc)
+        with self._lock:
+            rec = self._rec(source)
+            if rec["state"] == "open":
+                if rec["openUntil"] and now < datetime.fromisoformat(rec["openUntil"]):
+                    self.skipped[source] = rec["openUntil"]
+                    return False
+                # Cooldown over: let this run probe the source.
+                rec["state"] = "half-open"
+            self.skipped.pop(source, None)
+            return True
+
+    def record(self, source: str, ok: bool, seconds: float, error: str = "", now=None) -> None:
+        now = now or datetime.now(timezone.utc)
+        with self._lock:
+            rec = self._rec(source)
+            rec["runs"] += 1
+            rec["latencies"] = (rec["latencies"] + [round(seconds, 3)])[-self.LATENCY_WINDOW :]
+            if ok:
+                rec.update({"state": "closed", "successes": rec["successes"] + 1, "consecutiveFailures": 0, "lastSuccessAt": now.isoformat(), "openUntil": None})
+                return
+            rec["consecutiveFailures"] += 1
+            rec.update({"lastError": str(error)[:300], "lastErrorAt": now.isoformat()})
+            if rec["state"] == "half-open" or rec["consecutiveFailures"] >= self.failure_threshold:
+                rec.update({"state": "open", "openUntil": (now + self.cooldown).isoformat()})
+
+    def describe(self, source: str) -> str:
+        rec = self.sources[source]
+        until = datetime.fromisoformat(rec["openUntil"]).astimezone().strftime("%d.%m. %H:%M") if rec["openUntil"] else "?"
+        return f"{source} pausiert bis {until} ({rec['consecutiveFailures']} Fehler in Folge, zuletzt: {rec['lastError'] or 'unbekannt'})"
+
+    def summary_lines(self):
+        with self._lock:
+            lines = []
+            for source in sorted(self.sources):
+                rec = self.sources[source]
+                if source in self.skipped:
+                    lines.append(f"Uebersprungen: {self.describe(source)}")
+                elif rec["state"] == "open":
+                    lines.append(f"Circuit geoeffnet: {self.describe(source)}")
+                elif rec["consecutiveFailures"]:
+                    lines.append(f"Instabil: {source} ({rec['consecutiveFailures']} Fehler in Folge, zuletzt: {rec['lastError']})")
+            return lines
+
+    def report(self) -> dict:
+        with self._lock:
+            out = {}
+            for source, rec in sorted(self.sources.items()):
+                lat = rec["latencies"]
+                out[source] = {
+                    "state": rec["state"],
+                    "skipped": source in self.skipped,
+                    "successRate": round(rec["successes"] / rec["runs"], 3) if rec["runs"] else None,
+                    "avgSeconds": round(sum(lat) / len(lat), 3) if lat else None,
+                    "consecutiveFailures": rec["consecutiveFailures"],
+                    "lastError": rec["lastError"],
+                    "openUntil": rec["openUntil"],
+                }
+            return out
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        with self._lock:
+            tmp.write_text(json.dumps({"sources": self.sources}, indent=2, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+SOURCE_HEALTH = SourceHealth()
+
+
+def configure_health(path, config) -> None:
+    global SOURCE_HEALTH
+    SOURCE_HEALTH = SourceHealth(path, config.get("circuitFailureThreshold") or 3, config.get("circuitCooldownHours") or 0)
 
-    if source_enabled(config, "KarriereportalBerlin"):
-        try:
-            jobs.extend(fetch_karriereportal_berlin_jobs())
-        except Exception as e:
-            warnings.append(f"KarriereportalBerlin fehlgeschlagen: {e}")
 
-    if source_enabled(config, "StepStone"):
+def run_source_task(source: str, fn):
+    t0 = time.monotonic()
+    with METRICS.attribute(source):
         try:
-            kw = quote((config.get("keywordsMust") or ["politik"])[0])
-            loc_pref = "-".join([l for l in config.get("locationsPreferred", []) if re.search(r"berlin|potsdam", l, re.I)]) or "berlin"
-            url = f"https://www.stepstone.de/jobs/{kw}/in-{quote(loc_pref)}"
-            html = fetch_text(url)
-            jobs.extend(parse_jsonld_jobs(html, "StepStone", url))
-            jobs.extend(parse_anchor_jobs(html, "StepStone", url))
+            jobs = fn()
+        except PartialFetch as e:
+            METRICS.add_source_run(source, time.monotonic() - t0, len(e.jobs), e)
+            return e.jobs, [f"{source} unvollstaendig (weitere Seiten fehlgeschlagen): {e}"], time.monotonic() - t0
         except Exception as e:
-            warnings.append(f"StepStone fehlgeschlagen: {e}")
+            METRICS.add_source_run(source, time.monotonic() - t0, 0, e)
+            return [], [f"{source} fehlgeschlagen: {e}"], time.monotonic() - t0
+    METRICS.add_source_run(source, time.monotonic() - t0, len(jobs))
+    return jobs, [], time.monotonic() - t0
 
+
+def fetch_sources(config, known=frozenset(), stopped=None, only=None, by_source=None):
+    # only: source names to crawl (default all enabled). by_source, if given, receives {source: (ok, jobs)}.
+    tasks = []
+    warnings = []
+    allowed = {}
+    for source, fn in source_tasks(config, known, stopped, only):
+        if source not in allowed:
+            allowed[source] = SOURCE_HEALTH.allow(source)
+            if not allowed[source]:
+                warnings.append(f"{SOURCE_HEALTH.describe(source)} - uebersprungen")
+        if allowed[source]:
+            tasks.append((source, fn))
+    workers = max(1, min(int(config.get("crawlConcurrency") or 1), len(tasks) or 1))
+
+    if workers == 1:
+        results = [run_source_task(source, fn) for source, fn in tasks]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job-finder") as pool:
+            futures = [pool.submit(run_source_task, source, fn) for source, fn in tasks]
+            results = [f.result() for f in futures]
+
+    # Merge in task order, not completion order, so output stays deterministic.
+    jobs = []
+    outcomes = {}
+    for (source, _), (source_jobs, source_warnings, seconds) in zip(tasks, results):
+        jobs.extend(source_jobs)
+        warnings.extend(source_warnings)
+        # A source with several URLs counts as healthy if any of them worked.
+        ok, total, error = outcomes.get(source, (False, 0.0, ""))
+        outcomes[source] = (ok or bool(source_jobs) or not source_warnings, total + seconds, source_warnings[-1] if source_warnings else error)
+        if by_source is not None:
+            by_source.setdefault(source, (False, []))[1].extend(source_jobs)
+    for source, (ok, seconds, error) in outcomes.items():
+        SOURCE_HEALTH.record(source, ok, seconds, error.split(": ", 1)[-1])
+        if by_source is not None:
+            by_source[source] = (ok, by_source[source][1])
     return jobs, warnings
 
 
 def extract_meta_description(html: str) -> str:
-    m = re.search(r"<meta[^>]+(?:name|property)=[\"'](?:description|og:description)[\"'][^>]+content=[\"']([^\"']+)[\"'][^>]*>", html, flags=re.I)
-    return strip_html(m.group(1)) if m else ""
+    return extract_page(html, anchors=False).meta_description
 
 
 def infer_location_from_text(*parts) -> str:
@@ -512,178 +1856,566 @@ def infer_location_from_text(*parts) -> str:
     return ""
 
 
-def enrich_gesines_jobs(jobs, warnings, max_to_enrich: int = 40):
-    cache = {}
-    enriched = 0
-    out = []
-    for j in jobs:
-        if norm(j.get("source")) != "gesinesjobtipps" or not str(j.get("url") or "").startswith("http"):
-            out.append(j)
+def gesines_detail_patch(url: str, title: str):
+    _, page = fetch_page(url, text_limit=8000, anchors=False)
+    detail = jobs_from_jsonld(page.jsonld, "GesinesJobtipps", url)
+    best = None
+    for d in detail:
+        if norm(d.title) == norm(title):
+            best = d
+            break
+    if best is None and detail:
+        best = detail[0]
+    meta_desc = page.meta_description
+    body_hint = page.text[:8000]
+
+    patch = {}
+    if best:
+        if str(best.company or "").strip() and norm(best.company) != "gesinesjobtipps":
+            patch["company"] = best.company
+        if str(best.location or "").strip():
+            patch["location"] = best.location
+        if str(best.publishedAt or "").strip():
+            patch["publishedAt"] = best.publishedAt
+        if str(best.description or "").strip():
+            patch["description"] = best.description
+
+    if not patch.get("description") and meta_desc:
+        patch["description"] = meta_desc
+    if not patch.get("location"):
+        loc = infer_location_from_text(best.location if best else "", meta_desc, body_hint)
+        if loc:
+            patch["location"] = loc
+    return patch
+
+
+def stepstone_detail_patch(url: str):
+    _, page = fetch_page(url, stop_after_jobposting=True, anchors=False)
+    detail_jobs = jobs_from_jsonld(page.jsonld, "StepStone", url)
+    if not detail_jobs:
+        return {}
+    d = detail_jobs[0]
+    return {k: getattr(d, k) for k in ["company", "location", "publishedAt", "description"] if str(getattr(d, k) or "").strip()}
+
+
+def fetch_detail_patches(requests, label: str, warnings, max_fetches=None):
+    # requests: ordered (url, fetch callable). Fresh cache entries cost no request;
+    # the rest is fetched in parallel, at most max_fetches of them.
+    patches = {}
+    todo = []
+    seen = set()
+    for url, fn in requests:
+        if url in seen:
             continue
-        if enriched >= max_to_enrich:
-            out.append(j)
+        seen.add(url)
+        patch = HTTP_CACHE.detail(url, DETAIL_CACHE_TTL_HOURS) if HTTP_CACHE is not None else None
+        if patch is not None:
+            patches[url] = patch
             continue
-        enriched += 1
+        if max_fetches is not None and len(todo) >= max_fetches:
+            continue
+        todo.append((url, fn))
 
-        url = str(j.get("url") or "")
-        patch = cache.get(url)
-        if patch is None:
-            patch = {}
+    def run(item):
+        url, fn = item
+        with METRICS.attribute(f"{label}-Detail"):
             try:
-                html = fetch_text(url)
-                detail = parse_jsonld_jobs(html, "GesinesJobtipps", url)
-                best = None
-                for d in detail:
-                    if norm(d.get("title")) == norm(j.get("title")):
-                        best = d
-                        break
-                if best is None and detail:
-                    best = detail[0]
-                meta_desc = extract_meta_description(html)
-                body_hint = strip_html(html)[:8000]
-
-                if best:
-                    if str(best.get("company") or "").strip() and norm(best.get("company")) != "gesinesjobtipps":
-                        patch["company"] = best.get("company")
-                    if str(best.get("location") or "").strip():
-                        patch["location"] = best.get("location")
-                    if str(best.get("publishedAt") or "").strip():
-                        patch["publishedAt"] = best.get("publishedAt")
-                    if str(best.get("description") or "").strip():
-                        patch["description"] = best.get("description")
-
-                if not patch.get("description") and meta_desc:
-                    patch["description"] = meta_desc
-                if not patch.get("location"):
-                    loc = infer_location_from_text((best or {}).get("location", ""), meta_desc, body_hint)
-                    if loc:
-                        patch["location"] = loc
+                return url, fn(), None
             except Exception as e:
-                warnings.append(f"GesinesJobtipps-Detail fehlgeschlagen ({url}): {e}")
-            cache[url] = patch
-
-        merged = dict(j)
-        for k in ["company", "location", "publishedAt", "description", "remote"]:
-            if patch.get(k):
-                merged[k] = patch[k]
-        if norm(merged.get("company")) == "gesinesjobtipps":
-            merged["company"] = company_fallback_from_url(merged.get("url", ""), merged.get("company", "GesinesJobtipps"))
-        out.append(merged)
-    return out
+                return url, {}, e
+
+    workers = max(1, min(ENRICH_CONCURRENCY, len(todo) or 1))
+    if workers == 1:
+        results = [run(item) for item in todo]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job-finder-detail") as pool:
+            results = list(pool.map(run, todo))
+    for url, patch, err in results:
+        patches[url] = patch
+        if err is not None:
+            warnings.append(f"{label}-Detail fehlgeschlagen ({url}): {err}")
+        elif HTTP_CACHE is not None:
+            HTTP_CACHE.store_detail(url, patch)
+    return patches
 
 
-def enrich_stepstone_jobs(jobs, warnings):
+GESINES_DETAIL_FIELDS = {"company", "location", "publishedAt", "description", "remote"}
+
+
+def gesines_target(j, skip=frozenset()) -> bool:
+    url = str(j.url or "")
+    return norm(j.source) == "gesinesjobtipps" and url.startswith("http") and job_key(j) not in skip
+
+
+def enrich_gesines_jobs(jobs, warnings, max_to_enrich: int = 40, skip=frozenset(), priority=None):
+    # priority: optional url -> rank; the fetch budget goes to the highest ranks first.
+    requests = []
     for j in jobs:
-        if norm(j.get("source")) != "stepstone":
-            continue
-        needs_company = norm(j.get("company")) in {"", "stepstone"}
-        needs_location = not str(j.get("location") or "").strip()
-        needs_date = not str(j.get("publishedAt") or "").strip()
-        if not (needs_company or needs_location or needs_date):
+        if gesines_target(j, skip):
+            url = str(j.url)
+            requests.append((url, lambda url=url, title=j.title: gesines_detail_patch(url, title)))
+    if priority:
+        requests.sort(key=lambda r: priority.get(r[0], 0), reverse=True)
+    patches = fetch_detail_patches(requests, "GesinesJobtipps", warnings, max_fetches=max_to_enrich)
+
+    # Patched in place: the jobs belong to this run, nothing else holds them.
+    for j in jobs:
+        patch = None
+        if norm(j.source) == "gesinesjobtipps" and job_key(j) not in skip:
+            patch = patches.get(str(j.url or ""))
+        if patch is None:
             continue
+        j.update(**{k: patch[k] for k in GESINES_DETAIL_FIELDS if patch.get(k)})
+        if norm(j.company) == "gesinesjobtipps":
+            j.update(company=company_fallback_from_url(j.url, j.company))
+    return jobs
+
+
+def stepstone_needs(j):
+    return {
+        "company": norm(j.company) in {"", "stepstone"},
+        "location": not str(j.location or "").strip(),
+        "publishedAt": not str(j.publishedAt or "").strip(),
+    }
 
-        url = str(j.get("url") or "")
-        if "stepstone.de/job/" not in url and "stepstone.de/stellenangebote" not in url:
+
+def stepstone_target(j, skip=frozenset()) -> bool:
+    if norm(j.source) != "stepstone" or not any(stepstone_needs(j).values()) or job_key(j) in skip:
+        return False
+    url = str(j.url or "")
+    return "stepstone.de/job/" in url or "stepstone.de/stellenangebote" in url
+
+
+def enrich_stepstone_jobs(jobs, warnings, skip=frozenset()):
+    targets = [j for j in jobs if stepstone_target(j, skip)]
+    patches = fetch_detail_patches(
+        [(str(j.url), lambda url=str(j.url): stepstone_detail_patch(url)) for j in targets],
+        "StepStone",
+        warnings,
+    )
+
+    for j in targets:
+        d = patches.get(str(j.url)) or {}
+        j.update(**{field: d[field] for field, needed in stepstone_needs(j).items() if needed and d.get(field)})
+        if not str(j.description or "").strip() and d.get("description"):
+            j.description = d["description"]
+
+
+def job_key(job) -> str:
+    return canonical_url(job.url) or f"{norm(job.title)}|{norm(job.company)}"
+
+
+NATIVE_ID_PATTERNS = [
+    ("stepstone", "stepstone.de", re.compile(r"(?:--|/job/)(\d{5,})(?:-inline)?(?:\.html|/|$)", re.I)),
+    ("interamt", "interamt.de", re.compile(r"(?:stellenangebotid=|[?&]id=|/stellenangebot/)(\d+)", re.I)),
+    ("karriereportal", "karriereportal-stellen.berlin.de", re.compile(r"-de-j(\d+)", re.I)),
+]
+GENDER_MARKER_RE = re.compile(r"\(\s*[mwdfx]\s*/\s*[mwdfx]\s*(?:/\s*[mwdfx]\s*)?\)|\b[mwd]/[mwd](?:/[mwd])?\b|[*:_/]-?in(?:nen)?\b", re.I)
+FEMININE_SUFFIX_RE = re.compile(r"(ent|er|or|ant)in(?:nen)?$")
+LEGAL_FORM_RE = re.compile(r"\b(?:ggmbh|gmbh|mbh|e\.\s?v|ev|ag|kg|se|ug|co|kgaa)\b\.?", re.I)
+DUP_STOPWORDS = {"und", "oder", "der", "die", "das", "den", "dem", "des", "für", "fuer", "im", "in", "am", "an", "zum", "zur", "mit", "bei", "als", "von", "a", "the", "and", "of", "for"}
+COMPANY_STOPWORDS = {"und", "für", "fuer", "der", "die", "das", "des", "and", "of", "the"}
+MAX_DUP_BUCKET = 64
+MINHASH_BANDS = 8
+MINHASH_ROWS = 4
+_MINHASH_STRUCT = struct.Struct(f">{MINHASH_BANDS * MINHASH_ROWS}H")
+
+
+@functools.lru_cache(maxsize=65536)
+def minhash_token(token: str):
+    # One 64-byte digest gives all 32 hash functions (16 bit each) for a token.
+    return _MINHASH_STRUCT.unpack(hashlib.blake2b(token.encode("utf-8"), digest_size=2 * MINHASH_BANDS * MINHASH_ROWS).digest())
+
+
+def native_job_id(job) -> str:
+    # Portal-native posting IDs are stronger keys than URLs (tracking paths, slugs and mirrors differ).
+    url = str(job.url or "")
+    low = url.lower()
+    for name, host, pat in NATIVE_ID_PATTERNS:
+        if host in low:
+            m = pat.search(url)
+            if m:
+                return f"{name}:{m.group(1)}"
+    return ""
+
+
+def dup_tokens(text: str):
+    t = GENDER_MARKER_RE.sub(" ", norm(strip_html(text)))
+    out = set()
+    for tok in MATCH_TOKEN_RE.findall(t):
+        if tok in DUP_STOPWORDS or len(tok) < 2 and not tok.isdigit():
             continue
+        out.add(FEMININE_SUFFIX_RE.sub(r"\1", tok) if len(tok) > 6 else tok)
+    return out
+
+
+def is_placeholder_company(job) -> bool:
+    company = strip_html(job.company or "")
+    if not company or norm(company) == norm(job.source) or is_platform_company(company):
+        return True
+    # company_fallback_from_url yields a bare host name
+    return " " not in company and "." in company
+
+
+def company_tokens(job):
+    if is_placeholder_company(job):
+        return set()
+    return set(MATCH_TOKEN_RE.findall(LEGAL_FORM_RE.sub(" ", norm(strip_html(job.company))))) - COMPANY_STOPWORDS
+
+
+def jaccard(a, b) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def minhash_bands(tokens):
+    sig = list(map(min, zip(*[minhash_token(t) for t in tokens])))
+    return [(i, tuple(sig[i * MINHASH_ROWS : (i + 1) * MINHASH_ROWS])) for i in range(MINHASH_BANDS)]
 
-        try:
-            html = fetch_text(url)
-            detail_jobs = parse_jsonld_jobs(html, "StepStone", url)
-            if not detail_jobs:
-                continue
-            d = detail_jobs[0]
-            if needs_company and str(d.get("company") or "").strip():
-                j["company"] = d.get("company")
-            if needs_location and str(d.get("location") or "").strip():
-                j["location"] = d.get("location")
-            if needs_date and str(d.get("publishedAt") or "").strip():
-                j["publishedAt"] = d.get("publishedAt")
-            if not str(j.get("description") or "").strip() and str(d.get("description") or "").strip():
-                j["description"] = d.get("description")
-        except Exception as e:
-            warnings.append(f"StepStone-Detail fehlgeschlagen ({url}): {e}")
 
+def near_duplicate(a, b, threshold: float) -> bool:
+    ta, tb = a["title"], b["title"]
+    if a["numbers"] != b["numbers"]:
+        return False
+    if a["location"] and b["location"] and not (a["location"] & b["location"]):
+        return False
+    if a["company"] and b["company"]:
+        smaller, larger = sorted([a["company"], b["company"]], key=len)
+        if jaccard(smaller, larger) < 0.5 and not (len(smaller) >= 2 and smaller <= larger):
+            return False
+        return min(len(ta), len(tb)) >= 2 and jaccard(ta, tb) >= threshold
+    # Without two known employers only long, practically identical titles count as the same posting.
+    return min(len(ta), len(tb)) >= 3 and jaccard(ta, tb) >= max(threshold, 0.9)
+
+
+def merge_near_duplicate_groups(groups, threshold: float = 0.8):
+    # MinHash/LSH over normalized title tokens: only postings sharing a band are compared.
+    profiles = []
+    for group in groups:
+        rep = best_of_group(group)
+        title = dup_tokens(rep.title)
+        profiles.append(
+            {
+                "title": title,
+                "numbers": {t for t in title if t.isdigit()},
+                "company": set().union(*[company_tokens(j) for j in group]),
+                "location": dup_tokens(" ".join(str(j.location or "") for j in group)),
+            }
+        )
+
+    parent = list(range(len(groups)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
 
-def dedupe_and_merge_jobs(jobs):
     buckets = {}
-    for j in jobs:
-        key = canonical_url(j.get("url", "")) or f"{norm(j.get('title'))}|{norm(j.get('company'))}"
-        buckets.setdefault(key, []).append(j)
+    for i, prof in enumerate(profiles):
+        if len(prof["title"]) < 2:
+            continue
+        for band in minhash_bands(prof["title"]):
+            buckets.setdefault(band, []).append(i)
 
-    out = []
-    for _, group in buckets.items():
-        best = group[0]
-        for cand in group[1:]:
-            if title_quality(cand.get("title", ""), cand.get("company", "")) > title_quality(best.get("title", ""), best.get("company", "")):
-                best = cand
-
-        merged = dict(best)
-        # Fill missing fields from siblings with same URL.
+    compared = set()
+    for members in buckets.values():
+        # Oversized buckets come from generic titles ("Referent (m/w/d)") and are not worth comparing.
+        if len(members) < 2 or len(members) > MAX_DUP_BUCKET:
+            continue
+        for x, i in enumerate(members):
+            for k in members[x + 1 :]:
+                # Similar titles share several bands; compare each pair once.
+                if (i, k) in compared:
+                    continue
+                compared.add((i, k))
+                ri, rk = find(i), find(k)
+                if ri != rk and near_duplicate(profiles[i], profiles[k], threshold):
+                    parent[max(ri, rk)] = min(ri, rk)
+
+    merged = {}
+    for i, group in enumerate(groups):
+        merged.setdefault(find(i), []).extend(group)
+    return [merged[k] for k in sorted(merged)]
+
+
+def best_of_group(group):
+    best = group[0]
+    for cand in group[1:]:
+        if title_quality(cand.title, cand.company) > title_quality(best.title, best.company):
+            best = cand
+    return best
+
+
+def merge_job_group(group, best=None):
+    # The best record (or `best`) absorbs its siblings in place; the others are dropped with the group.
+    merged = best if best is not None else best_of_group(group)
+    # Fill missing fields from siblings with same URL.
+    for sib in group:
+        for field in ["company", "location", "publishedAt", "description", "url"]:
+            if (not str(getattr(merged, field) or "").strip()) and str(getattr(sib, field) or "").strip():
+                setattr(merged, field, getattr(sib, field))
+        if not merged.remote and sib.remote:
+            merged.remote = True
+    # A real employer from a sibling beats a portal/placeholder name.
+    if is_placeholder_company(merged):
         for sib in group:
-            for field in ["company", "location", "publishedAt", "description", "url"]:
-                if (not str(merged.get(field) or "").strip()) and str(sib.get(field) or "").strip():
-                    merged[field] = sib.get(field)
-            if not merged.get("remote") and sib.get("remote"):
-                merged["remote"] = True
-
-        # If title equals company, try to pick a better title from siblings.
-        if norm(merged.get("title")) == norm(merged.get("company")):
-            for sib in group:
-                if title_quality(sib.get("title", ""), merged.get("company", "")) > title_quality(merged.get("title", ""), merged.get("company", "")):
-                    merged["title"] = sib.get("title")
-
-        out.append(merged)
+            if not is_placeholder_company(sib):
+                merged.company = sib.company
+                break
+
+    # If title equals company, try to pick a better title from siblings.
+    if norm(merged.title) == norm(merged.company):
+        for sib in group:
+            if title_quality(sib.title, merged.company) > title_quality(merged.title, merged.company):
+                merged.title = sib.title
+    return merged
+
+
+def dedupe_key(job) -> str:
+    return native_job_id(job) or job_key(job)
+
+
+def dedupe_groups(jobs):
+    buckets = {}
+    for j in jobs:
+        buckets.setdefault(dedupe_key(j), []).append(j)
+    return list(buckets.values())
+
+
+def maybe_near_duplicates(groups, threshold: float = 0.8):
+    # Indices of groups merge_near_duplicate_groups might join with another group, judged from the titles
+    # of all members (detail pages do not change titles): a shared band with a title passing the title
+    # test of near_duplicate(), or a shared band bucket too large to tell.
+    titles, buckets = [], {}
+    for i, group in enumerate(groups):
+        for j in group:
+            tokens = dup_tokens(j.title)
+            if len(tokens) < 2:
+                continue
+            for band in minhash_bands(tokens):
+                buckets.setdefault(band, []).append(len(titles))
+            titles.append((i, tokens, {t for t in tokens if t.isdigit()}))
+    out = set()
+    for members in buckets.values():
+        owners = {titles[k][0] for k in members}
+        if len(owners) < 2:
+            continue
+        if len(members) > MAX_DUP_BUCKET:
+            out |= owners
+            continue
+        for x, a in enumerate(members):
+            ga, ta, na = titles[a]
+            for b in members[x + 1 :]:
+                gb, tb, nb = titles[b]
+                if ga != gb and na == nb and jaccard(ta, tb) >= threshold:
+                    out |= {ga, gb}
     return out
 
 
-def score(job, config):
-    hay = norm(" ".join([job.get("title", ""), job.get("company", ""), job.get("location", ""), " ".join(job.get("tags", []) or []), job.get("description", "")]))
-    must = [k for k in config["keywordsMust"] if norm(k) in hay]
-    nice = [k for k in config["keywordsNice"] if norm(k) in hay]
-    excl = [k for k in config["excludeKeywords"] if norm(k) in hay]
-    loc = [k for k in config["locationsPreferred"] if norm(k) in norm(job.get("location", ""))]
-    sc = len(must) * 5 + len(nice) * 2 + len(loc) * 3 + (2 if job.get("remote") else 0)
-    if job["ageDays"] <= 3:
+def dedupe_and_merge_jobs(jobs, near_duplicates: bool = True, threshold: float = 0.8):
+    groups = dedupe_groups(jobs)
+    if near_duplicates:
+        groups = merge_near_duplicate_groups(groups, threshold)
+    return [merge_job_group(g) for g in groups]
+
+
+MATCH_TOKEN_RE = re.compile(r"\w+")
+
+
+class KeywordMatcher:
+    """Profile keywords compiled once; one pass over a job's haystack yields the hits of every category.
+
+    mode "substring" keeps the classic `keyword in text` semantics, mode "word" matches whole words/phrases.
+    """
+
+    def __init__(self, must, nice, exclude, locations, mode: str = "substring"):
+        self.mode = "word" if norm(mode) == "word" else "substring"
+        self.categories = {
+            cat: [(k, self._term(k)) for k in ks] for cat, ks in [("must", must), ("nice", nice), ("exclude", exclude)]
+        }
+        self.locations = [(k, self._term(k)) for k in locations]
+        self._terms = sorted({t for pairs in self.categories.values() for _, t in pairs})
+        self._location_terms = sorted({t for _, t in self.locations})
+
+    def _term(self, keyword) -> str:
+        if self.mode == "word":
+            return " ".join(MATCH_TOKEN_RE.findall(norm(keyword)))
+        return norm(keyword)
+
+    def _scan(self, text: str, terms):
+        text = norm(text)
+        if self.mode == "substring":
+            return {t for t in terms if t in text}
+        tokens = MATCH_TOKEN_RE.findall(text)
+        words = set(tokens)
+        phrase = f" {' '.join(tokens)} "
+        return {t for t in terms if (t in words if " " not in t else f" {t} " in phrase) or not t}
+
+    def hits(self, job):
+        found = self._scan(job_haystack(job), self._terms)
+        out = {cat: [k for k, t in pairs if t in found] for cat, pairs in self.categories.items()}
+        loc_found = self._scan(job.location, self._location_terms)
+        out["location"] = [k for k, t in self.locations if t in loc_found]
+        return out
+
+
+_MATCHERS = {}
+_MATCHERS_LOCK = threading.Lock()
+
+
+def keyword_matcher(config) -> KeywordMatcher:
+    key = (
+        tuple(config.get("keywordsMust", [])),
+        tuple(config.get("keywordsNice", [])),
+        tuple(config.get("excludeKeywords", [])),
+        tuple(config.get("locationsPreferred", [])),
+        config.get("keywordMatch", "substring"),
+    )
+    with _MATCHERS_LOCK:
+        matcher = _MATCHERS.get(key)
+        if matcher is None:
+            matcher = KeywordMatcher(*key)
+            _MATCHERS[key] = matcher
+    return matcher
+
+
+def job_haystack(job) -> str:
+    return " ".join([job.title, job.company, job.location, " ".join(job.tags or []), job.description])
+
+
+def match_job(job, config):
+    return keyword_matcher(config).hits(job)
+
+
+def score_points(hits, remote, age_days, config) -> int:
+    sc = len(hits["must"]) * 5 + len(hits["nice"]) * 2 + len(hits["location"]) * 3 + (2 if remote else 0)
+    if age_days <= 3:
         sc += 2
-    elif job["ageDays"] <= 7:
+    elif age_days <= 7:
         sc += 1
-    sc -= len(excl) * 10
-    if config["keywordsMust"] and not must:
+    sc -= len(hits["exclude"]) * 10
+    if config["keywordsMust"] and not hits["must"]:
         sc = -999
-    job["reasons"] = []
-    if must:
-        job["reasons"].append("must: " + ", ".join(must))
-    if nice:
-        job["reasons"].append("nice: " + ", ".join(nice))
-    if loc:
-        job["reasons"].append("ort: " + ", ".join(loc))
-    if job.get("remote"):
-        job["reasons"].append("remote")
-    if excl:
-        job["reasons"].append("exclude: " + ", ".join(excl))
-    job["score"] = sc
+    return sc
+
+
+def score_reasons(hits, remote) -> list:
+    reasons = []
+    if hits["must"]:
+        reasons.append("must: " + ", ".join(hits["must"]))
+    if hits["nice"]:
+        reasons.append("nice: " + ", ".join(hits["nice"]))
+    if hits["location"]:
+        reasons.append("ort: " + ", ".join(hits["location"]))
+    if remote:
+        reasons.append("remote")
+    if hits["exclude"]:
+        reasons.append("exclude: " + ", ".join(hits["exclude"]))
+    return reasons
+
+
+def score(job, config, hits=None):
+    hits = hits if hits is not None else match_job(job, config)
+    sc = score_points(hits, job.remote, job.ageDays, config)
+    job.reasons = score_reasons(hits, job.remote)
+    job.score = sc
     return job
 
 
-def contains_excluded(job, config) -> bool:
-    hay = norm(
-        " ".join(
-            [
-                job.get("title", ""),
-                job.get("company", ""),
-                job.get("location", ""),
-                " ".join(job.get("tags", []) or []),
-                job.get("description", ""),
-            ]
-        )
-    )
-    return any(norm(k) in hay for k in config.get("excludeKeywords", []))
+def contains_excluded(job, config, hits=None) -> bool:
+    hits = hits if hits is not None else match_job(job, config)
+    return bool(hits["exclude"])
+
+
+@functools.lru_cache(maxsize=None)
+def numpy_module():
+    # numpy is optional: only the "numpy" scoringBackend needs it.
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def uses_score_matrix(config) -> bool:
+    return norm(config.get("scoringBackend")) == "numpy" and numpy_module() is not None
+
+
+class ScoreMatrix:
+    """Jobs scanned once against the keywords of all profiles; each profile's scores are one matrix-vector product."""
+
+    def __init__(self, jobs, profiles):
+        np = numpy_module()
+        self.rows = {id(j): i for i, j in enumerate(jobs)}
+        # Columns per match mode: haystack terms, then location terms, over the union of all profiles.
+        self.columns = {}
+        vocab = {}
+        for p in profiles:
+            m = keyword_matcher(p)
+            terms, locations = vocab.setdefault(m.mode, (set(), set()))
+            terms.update(m._terms)
+            locations.update(m._location_terms)
+        width = 0
+        for mode, (terms, locations) in vocab.items():
+            hay = {t: width + k for k, t in enumerate(sorted(terms))}
+            width += len(hay)
+            loc = {t: width + k for k, t in enumerate(sorted(locations))}
+            width += len(loc)
+            self.columns[mode] = (hay, loc)
+        # Binary term-document matrix; the vocabulary is just the profile keywords, so dense is small.
+        # float64 so the products run through BLAS; sums of small integers stay exact.
+        self.matrix = np.zeros((len(jobs), width))
+        for mode, (hay, loc) in self.columns.items():
+            scanner = KeywordMatcher([], [], [], [], mode)
+            for i, j in enumerate(jobs):
+                for t in scanner._scan(job_haystack(j), hay):
+                    self.matrix[i, hay[t]] = 1
+                for t in scanner._scan(j.location, loc):
+                    self.matrix[i, loc[t]] = 1
+        age = np.array([j.ageDays for j in jobs], dtype=np.int64)
+        remote = np.array([bool(j.remote) for j in jobs], dtype=np.int64)
+        self.base = 2 * remote + np.where(age <= 3, 2, np.where(age <= 7, 1, 0))
+        self._scores = {}
+
+    def scores(self, config):
+        # (score per job, excluded per job) for one profile, identical to score_points() / contains_excluded().
+        m = keyword_matcher(config)
+        if id(m) in self._scores:
+            return self._scores[id(m)]
+        np = numpy_module()
+        hay, loc = self.columns[m.mode]
+        weights = np.zeros(self.matrix.shape[1])
+        must = np.zeros_like(weights)
+        exclude = np.zeros_like(weights)
+        for cat, points, counter in (("must", 5, must), ("nice", 2, None), ("exclude", -10, exclude)):
+            for _, t in m.categories[cat]:
+                weights[hay[t]] += points
+                if counter is not None:
+                    counter[hay[t]] += 1
+        for _, t in m.locations:
+            weights[loc[t]] += 3
+        scores = (self.matrix @ weights).astype(np.int64) + self.base
+        if config["keywordsMust"]:
+            scores = np.where(self.matrix @ must == 0, -999, scores)
+        self._scores[id(m)] = result = (scores, self.matrix @ exclude > 0)
+        return result
+
+    def hits(self, job, config):
+        # Same as KeywordMatcher.hits(job), read from the job's matrix row.
+        m = keyword_matcher(config)
+        row = self.matrix[self.rows[id(job)]]
+        hay, loc = self.columns[m.mode]
+        out = {cat: [k for k, t in pairs if row[hay[t]]] for cat, pairs in m.categories.items()}
+        out["location"] = [k for k, t in m.locations if row[loc[t]]]
+        return out
 
 
 def is_obvious_non_job(job) -> bool:
-    title = strip_html(job.get("title", ""))
-    url = str(job.get("url") or "").strip().lower()
-    source = norm(job.get("source", ""))
+    title = strip_html(job.title)
+    url = str(job.url or "").strip().lower()
+    source = norm(job.source)
     if not title:
         return True
     if source == "gesinesjobtipps" and norm(title) in {"gesines jobtipps", "gesinesjobtipps"}:
@@ -696,68 +2428,978 @@ def is_obvious_non_job(job) -> bool:
     return False
 
 
+def uses_relevance(config) -> bool:
+    return norm(config.get("relevance")) == "tfidf"
+
+
+def relevance_ceiling(config) -> float:
+    # Most points the relevance blend can add (cosine similarity <= 1).
+    return float(config.get("relevanceWeight") or 0) if uses_relevance(config) else 0
+
+
+def relevance_terms(text) -> dict:
+    counts = {}
+    for tok in MATCH_TOKEN_RE.findall(norm(text)):
+        if tok not in DUP_STOPWORDS and (len(tok) > 1 or tok.isdigit()):
+            counts[tok] = counts.get(tok, 0) + 1
+    return counts
+
+
+class RelevanceModel:
+    """TF-IDF vectors of the candidates; a profile's keywords form the query, relevance is their cosine similarity."""
+
+    def __init__(self, jobs, docs: int, df, terms=None):
+        # terms: {id(job): relevance_terms(...)} already computed for the IDF statistics.
+        terms = terms or {}
+        self.rows = {id(j): i for i, j in enumerate(jobs)}
+        self.docs = docs
+        self.df = df
+        self.tf = [
+            {t: 1 + math.log(c) for t, c in (terms.get(id(j)) or relevance_terms(job_haystack(j))).items()} for j in jobs
+        ]
+        self.norms = [math.sqrt(sum((w * self.idf(t)) ** 2 for t, w in tf.items())) for tf in self.tf]
+        self._similarity = {}
+
+    def idf(self, term) -> float:
+        return math.log((1 + self.docs) / (1 + self.df.get(term, 0))) + 1
+
+    def query(self, config):
+        # Must keywords count double, like their higher rule weight.
+        weights = {}
+        for keywords, w in ((config.get("keywordsMust", []), 2), (config.get("keywordsNice", []), 1)):
+            for k in keywords:
+                for t in relevance_terms(k):
+                    weights[t] = weights.get(t, 0) + w
+        return {t: w * self.idf(t) for t, w in weights.items()}
+
+    def similarity(self, config):
+        # Cosine similarity per candidate row, computed once per keyword set and shared by both scoring backends.
+        key = (tuple(config.get("keywordsMust", [])), tuple(config.get("keywordsNice", [])))
+        if key in self._similarity:
+            return self._similarity[key]
+        query = self.query(config)
+        qnorm = math.sqrt(sum(v * v for v in query.values()))
+        np = numpy_module()
+        if not qnorm:
+            sims = [0.0] * len(self.tf)
+        elif np is not None:
+            terms = list(query)
+            docs = np.array([[tf.get(t, 0) * self.idf(t) for t in terms] for tf in self.tf]).reshape(len(self.tf), len(terms))
+            norms = np.array(self.norms)
+            dots = docs @ np.array([query[t] for t in terms])
+            sims = np.divide(dots, norms * qnorm, out=np.zeros_like(dots), where=norms > 0).tolist()
+        else:
+            sims = [
+                sum(w * self.idf(t) * query[t] for t, w in tf.items() if t in query) / (n * qnorm) if n else 0.0
+                for tf, n in zip(self.tf, self.norms)
+            ]
+        self._similarity[key] = sims
+        return sims
+
+
+def relevance_stats(corpus, terms, index=None):
+    # IDF statistics (docs, df): over every posting in the index, brought up to date with this run's,
+    # or over this run's corpus alone without an index. terms: relevance_terms per id(job).
+    by_key = {job_key(j): terms[id(j)].keys() for j in corpus}
+    if index is not None:
+        return index.sync_idf(by_key)
+    df = {}
+    for ts in by_key.values():
+        for t in ts:
+            df[t] = df.get(t, 0) + 1
+    return len(by_key), df
+
+
+def job_filters(config, hits=None, excluded=None):
+    # (name, fields read, keep predicate) in application order; hits caches match_job per job id.
+    # excluded(job) replaces the keyword scan for excludeKeywords (ScoreMatrix).
+    def scan_excluded(j):
+        if hits is None:
+            return contains_excluded(j, config)
+        if id(j) not in hits:
+            hits[id(j)] = match_job(j, config)
+        return contains_excluded(j, config, hits[id(j)])
+
+    excluded = excluded or scan_excluded
+    lookback = config["lookbackDays"]
+    filters = [
+        ("lookbackDays", {"publishedAt"}, lambda j: (age := days_since(j.publishedAt)) <= lookback or age == 9999),
+        ("allowedSources", {"source"}, lambda j: source_enabled(config, j.source)),
+        ("strictLocations", {"title", "location", "description", "url"}, lambda j: matches_strict_locations(j, config.get("strictLocations", []))),
+        ("excludeKeywords", {"title", "company", "location", "tags", "description"}, lambda j: not excluded(j)),
+        ("nonJob", {"title", "url", "source"}, lambda j: not is_obvious_non_job(j)),
+    ]
+    if config["remoteOnly"]:
+        filters.append(("remoteOnly", {"remote"}, lambda j: j.remote))
+    return filters
+
+
+def detail_fields(j, skip=frozenset()):
+    # Fields a detail fetch may still change for this job; filters reading none of them are decidable now.
+    if gesines_target(j, skip):
+        return GESINES_DETAIL_FIELDS
+    if stepstone_target(j, skip):
+        return {k for k, needed in stepstone_needs(j).items() if needed} | ({"description"} if not str(j.description or "").strip() else set())
+    return set()
+
+
+# A match in the fields already known excludes a job whatever its detail page adds.
+MONOTONE_FILTERS = {"excludeKeywords"}
+
+
+def pushdown_rejects(j, pending, name, fields, pred) -> bool:
+    # True if the filter rejects j whatever a detail fetch puts into the pending fields.
+    if not fields & pending:
+        return not pred(j)
+    if name in MONOTONE_FILTERS:
+        return not pred(j.copy(**{k: "" for k in fields & pending}))
+    return False
+
+
+def pushdown_filters(jobs, config, skip=frozenset(), record=True):
+    # Applies every filter the list-page data already decides, so only survivors are enriched.
+    # Filters that read fields a pending detail fetch may change are left for the final filter pass.
+    # Per record, so only valid once duplicates are merged; before that see pushdown_groups.
+    filters = job_filters(config)
+    kept, out, dropped, saved = [], [], {}, 0
+    for j in jobs:
+        pending = detail_fields(j, skip)
+        failed = next((f[0] for f in filters if pushdown_rejects(j, pending, *f)), None)
+        if failed is None:
+            kept.append(j)
+            continue
+        out.append(j)
+        dropped[failed] = dropped.get(failed, 0) + 1
+        saved += bool(pending)
+    if record:
+        for name, n in dropped.items():
+            METRICS.dropped(name, n, 0)
+    return kept, out, saved
+
+
+def group_rejected(group, filters, skip=frozenset()):
+    # Name of a filter the record this dedupe group merges into fails for sure, or None. Pending fields
+    # of any member count: siblings fill the merged record. A pending company may change which member
+    # wins the merge (title_quality) and the merged title, so then every member is tried as the winner.
+    pending = set().union(*(detail_fields(j, skip) for j in group))
+    if len(group) == 1:
+        merged = group
+    else:
+        winners = range(len(group))
+        if "company" in pending:
+            pending.add("title")
+        else:
+            best = best_of_group(group)
+            winners = [next(i for i, j in enumerate(group) if j is best)]
+        merged = []
+        for w in winners:
+            copies = [j.copy() for j in group]
+            merged.append(merge_job_group(copies, copies[w]))
+    failed = None
+    for m in merged:
+        failed = next((f[0] for f in filters if pushdown_rejects(m, pending, *f)), None)
+        if failed is None:
+            return None
+    return failed
+
+
+def pushdown_groups(jobs, config, skip=frozenset(), near_duplicates: bool = True, threshold: float = 0.8):
+    # pushdown_filters before dedupe: a record is dropped only together with its dedupe group, when the
+    # merged record fails as well, and only if no other group could turn out to be its near duplicate.
+    # Dedupe of the survivors then gives the same merged records as dedupe of everything.
+    groups = dedupe_groups(jobs)
+    merging = maybe_near_duplicates(groups, threshold) if near_duplicates else set()
+    filters = job_filters(config)
+    out_ids, dropped, saved = set(), {}, 0
+    for i, group in enumerate(groups):
+        failed = None if i in merging else group_rejected(group, filters, skip)
+        if failed is None:
+            continue
+        out_ids.update(id(j) for j in group)
+        dropped[failed] = dropped.get(failed, 0) + len(group)
+        saved += sum(bool(detail_fields(j, skip)) for j in group)
+    for name, n in dropped.items():
+        METRICS.dropped(name, n, 0)
+    kept = [j for j in jobs if id(j) not in out_ids]
+    return kept, [j for j in jobs if id(j) in out_ids], saved
+
+
+HAYSTACK_FIELDS = {"title", "company", "location", "tags", "description"}
+
+
+def score_upper_bound(job, config, pending=frozenset()) -> float:
+    # Best score the job can reach whatever its detail page puts into the pending fields; exact if none are pending.
+    hits = match_job(job.copy(**{k: "" for k in pending}), config)
+    if pending & HAYSTACK_FIELDS:
+        hits["must"] = list(config.get("keywordsMust", []))
+        hits["nice"] = list(config.get("keywordsNice", []))
+    if "location" in pending:
+        hits["location"] = list(config.get("locationsPreferred", []))
+    age = 0 if "publishedAt" in pending else days_since(job.publishedAt)
+    return score_points(hits, job.remote or "remote" in pending, age, config) + relevance_ceiling(config)
+
+
+def bound_pruned(jobs, config, skip=frozenset(), top_k=None):
+    # Enrichment candidates that cannot make the results even with a perfect detail page: their upper bound is
+    # below minimumScore or below the top_k-th exact score among jobs that need no detail fetch.
+    # Returns (pruned keys, upper bound by url for the rest). Only valid once duplicates are merged.
+    exact, bounds = [], []
+    for j in jobs:
+        pending = detail_fields(j, skip)
+        if pending:
+            bounds.append((score_upper_bound(j, config, pending), j))
+        else:
+            # Lower bound for the threshold: TF-IDF relevance may add nothing.
+            exact.append(score_upper_bound(j, config) - relevance_ceiling(config))
+    threshold = config["minimumScore"]
+    if top_k and len(exact) >= top_k:
+        threshold = max(threshold, sorted(exact, reverse=True)[top_k - 1])
+    pruned = {job_key(j) for b, j in bounds if b < threshold}
+    return pruned, {str(j.url or ""): b for b, j in bounds if job_key(j) not in pruned}
+
+
+INDEXED_FIELDS = ["company", "location", "publishedAt", "description"]
+# Stored as well, so postings on pages a paginated crawl no longer visits can be carried over.
+LISTING_FIELDS = ["source", "title", "url", "remote", "tags"]
+
+
+def listing_hashes(jobs):
+    # Content hash of the list-page data per posting; siblings with the same key are hashed together.
+    parts = {}
+    for j in jobs:
+        raw = json.dumps([getattr(j, k) for k in ["source", "title", "company", "location", "description", "publishedAt", "url"]], ensure_ascii=False)
+        parts.setdefault(job_key(j), []).append(raw)
+    return {k: hashlib.sha1("\n".join(sorted(v)).encode("utf-8")).hexdigest() for k, v in parts.items()}
+
+
+class JobIndex:
+    """SQLite index of all postings seen so far, keyed by job_key (canonical URL, else title and company), not native IDs."""
+
+    def __init__(self, path):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(path))
+        self.db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                key TEXT PRIMARY KEY,
+                first_seen TEXT NOT NULL,
+                last_seen TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                data TEXT NOT NULL
+            )
+            """
+        )
+        # Document frequencies for the TF-IDF relevance mode; the row with term '' holds the document count.
+        # idf_docs lists the postings counted there with their terms, so pruned or changed rows can be taken out.
+        counted = self.db.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'idf_docs'").fetchone()
+        with self.db:
+            self.db.execute("CREATE TABLE IF NOT EXISTS idf (term TEXT PRIMARY KEY, df INTEGER NOT NULL)")
+            self.db.execute("CREATE TABLE IF NOT EXISTS idf_docs (key TEXT PRIMARY KEY, terms TEXT NOT NULL)")
+            if not counted:
+                # Counts from before idf_docs cannot be attributed to postings; sync_idf() rebuilds them.
+                self.db.execute("DELETE FROM idf")
+
+    def idf_stats(self):
+        df = dict(self.db.execute("SELECT term, df FROM idf"))
+        return df.pop("", 0), df
+
+    def sync_idf(self, terms=None):
+        # Counts every stored posting that is not in the document frequencies yet: new this run, changed
+        # since it was counted, or recorded while relevance was off. terms: {key: term set} already computed
+        # for this run's postings. Returns idf_stats(), which then covers exactly the stored postings.
+        terms = terms or {}
+        counts = {"": 0}
+        docs = []
+        rows = self.db.execute("SELECT j.key, j.data FROM jobs j LEFT JOIN idf_docs d ON d.key = j.key WHERE d.key IS NULL").fetchall()
+        for key, data in rows:
+            ts = sorted(terms[key] if key in terms else relevance_terms(job_haystack(Job.from_dict(json.loads(data)))))
+            docs.append((key, json.dumps(ts, ensure_ascii=False)))
+            counts[""] += 1
+            for t in ts:
+                counts[t] = counts.get(t, 0) + 1
+        if docs:
+            with self.db:
+                self.db.executemany("INSERT INTO idf_docs (key, terms) VALUES (?, ?)", docs)
+                self.db.executemany(
+                    "INSERT INTO idf (term, df) VALUES (?, ?) ON CONFLICT(term) DO UPDATE SET df = df + excluded.df", counts.items()
+                )
+        return self.idf_stats()
+
+    def _drop_idf(self, rows) -> None:
+        # Takes counted postings, given as (key, terms), out of the document frequencies; call inside a transaction.
+        counts = {}
+        for _, terms in rows:
+            counts[""] = counts.get("", 0) + 1
+            for t in json.loads(terms):
+                counts[t] = counts.get(t, 0) + 1
+        self.db.executemany("DELETE FROM idf_docs WHERE key = ?", [(key,) for key, _ in rows])
+        self.db.executemany("UPDATE idf SET df = df - ? WHERE term = ?", [(n, t) for t, n in counts.items()])
+        self.db.execute("DELETE FROM idf WHERE df <= 0")
+
+    def unchanged(self, hashes):
+        # Stored enrichment for postings whose list-page data did not change since the last run.
+        out = {}
+        keys = list(hashes)
+        for i in range(0, len(keys), 500):
+            chunk = keys[i : i + 500]
+            rows = self.db.execute(
+                f"SELECT key, content_hash, data FROM jobs WHERE key IN ({','.join('?' * len(chunk))})", chunk
+            ).fetchall()
+            for key, content_hash, data in rows:
+                if content_hash == hashes[key]:
+                    out[key] = json.loads(data)
+        return out
+
+    def known_keys(self, keys):
+        keys = list(keys)
+        known = set()
+        for i in range(0, len(keys), 500):
+            chunk = keys[i : i + 500]
+            known.update(r[0] for r in self.db.execute(f"SELECT key FROM jobs WHERE key IN ({','.join('?' * len(chunk))})", chunk))
+        return known
+
+    def keys(self):
+        return {r[0] for r in self.db.execute("SELECT key FROM jobs")}
+
+    def carry_over(self, sources, since: str, exclude):
+        # Postings of `sources` seen since `since` but not fetched this run, rebuilt from the stored listing data.
+        wanted = {norm(s) for s in sources}
+        out = []
+        for key, data in self.db.execute("SELECT key, data FROM jobs WHERE last_seen >= ?", (since,)):
+            if key in exclude:
+                continue
+            j = json.loads(data)
+            if norm(j.get("source")) in wanted and j.get("title") and j.get("url"):
+                out.append(Job.from_dict({k: j.get(k) for k in LISTING_FIELDS + INDEXED_FIELDS}))
+        return out
+
+    def record(self, jobs, hashes, seen_at: str):
+        # Upserts this run's postings and returns the keys that were not in the index before.
+        keys = {job_key(j): j for j in jobs}
+        new_keys = set(keys) - self.known_keys(keys)
+        rows = {key: json.dumps({k: getattr(j, k) for k in INDEXED_FIELDS + LISTING_FIELDS}, ensure_ascii=False) for key, j in keys.items()}
+        with self.db:
+            # Counted postings whose data changes leave the document frequencies until sync_idf() counts them again.
+            changed = []
+            pending = list(rows)
+            for i in range(0, len(pending), 500):
+                chunk = pending[i : i + 500]
+                changed.extend(
+                    (key, terms)
+                    for key, terms, data in self.db.execute(
+                        f"SELECT d.key, d.terms, j.data FROM idf_docs d JOIN jobs j ON j.key = d.key WHERE d.key IN ({','.join('?' * len(chunk))})",
+                        chunk,
+                    )
+                    if data != rows[key]
+                )
+            self._drop_idf(changed)
+            for key, data in rows.items():
+                self.db.execute(
+                    """
+                    INSERT INTO jobs (key, first_seen, last_seen, content_hash, data) VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT(key) DO UPDATE SET last_seen = excluded.last_seen,
+                        content_hash = excluded.content_hash, data = excluded.data
+                    """,
+                    (key, seen_at, seen_at, hashes.get(key, ""), data),
+                )
+        return new_keys
+
+    def prune(self, retention_days: float) -> None:
+        cutoff = datetime.fromtimestamp(datetime.now(timezone.utc).timestamp() - retention_days * 86400, timezone.utc).isoformat()
+        with self.db:
+            self._drop_idf(
+                self.db.execute(
+                    "SELECT d.key, d.terms FROM idf_docs d JOIN jobs j ON j.key = d.key WHERE j.last_seen < ?", (cutoff,)
+                ).fetchall()
+            )
+            self.db.execute("DELETE FROM jobs WHERE last_seen < ?", (cutoff,))
+
+    def close(self) -> None:
+        self.db.close()
+
+
+def apply_indexed(jobs, stored):
+    # Reuses the enrichment of unchanged postings; returns their keys so enrichers can skip them.
+    reused = set()
+    for j in jobs:
+        data = stored.get(job_key(j))
+        if data is None:
+            continue
+        j.update(**{k: data[k] for k in INDEXED_FIELDS if data.get(k) not in (None, "")})
+        reused.add(job_key(j))
+    return reused
+
+
+def rank_jobs(candidates, cfg, copy: bool = False, matrix=None, relevance=None, score_all: bool = False):
+    # Final filter pass and scoring for one profile; returns (filtered, ranked). With copy, ranked jobs
+    # are copies, so several profiles can score the same candidates. With a ScoreMatrix over the
+    # candidates, exclusion and scores come from it and only the ranked jobs get their reasons built.
+    # With a RelevanceModel and relevance "tfidf", relevanceWeight * cosine similarity is added to the
+    # rule score before minimumScore and sorting. With score_all every filtered job is scored, reasons
+    # included, and filtered holds those scored jobs (ranked is a subset of them).
+    def keep(name, items, pred):
+        kept = [j for j in items if pred(j)]
+        METRICS.dropped(name, len(items), len(kept))
+        return kept
+
+    # One keyword pass per job, shared by the exclusion filter and scoring.
+    hits = {}
+    excluded = None
+    if matrix is not None:
+        scores, excl = matrix.scores(cfg)
+        excluded = lambda j: excl[matrix.rows[id(j)]]
+    with METRICS.stage("filter", len(candidates)) as st:
+        filtered = candidates
+        for name, fields, pred in job_filters(cfg, hits, excluded):
+            filtered = keep(name, filtered, pred)
+        st["out"] = len(filtered)
+
+    sims = relevance.similarity(cfg) if relevance is not None and uses_relevance(cfg) else None
+    weight = float(cfg.get("relevanceWeight") or 0)
+    with METRICS.stage("score", len(filtered)) as st:
+        if matrix is None:
+            ranked = []
+            for j in filtered:
+                r = score(j.copy() if copy else j, cfg, hits[id(j)])
+                if sims is not None:
+                    sim = sims[relevance.rows[id(j)]]
+                    r.score += weight * sim
+                    r.reasons.append(f"relevanz: {sim:.2f}")
+                ranked.append(r)
+            if score_all:
+                filtered = list(ranked)
+            ranked = keep("minimumScore", ranked, lambda j: j.score >= cfg["minimumScore"])
+            ranked.sort(key=lambda x: x.score, reverse=True)
+            METRICS.dropped("maxResults", len(ranked), min(len(ranked), int(cfg["maxResults"])))
+            ranked = ranked[: int(cfg["maxResults"])]
+            if sims is not None:
+                for j in filtered if score_all else ranked:
+                    j.score = round(j.score, 2)
+        else:
+            np = numpy_module()
+            rows = np.array([matrix.rows[id(j)] for j in filtered], dtype=np.int64)
+            sc = scores[rows]
+            if sims is not None:
+                rel = np.asarray(sims)[[relevance.rows[id(j)] for j in filtered]]
+                sc = sc + weight * rel
+            above = np.flatnonzero(sc >= cfg["minimumScore"])
+            METRICS.dropped("minimumScore", len(filtered), len(above))
+            # Stable like list.sort(reverse=True): equal scores keep their filter order.
+            order = above[np.argsort(-sc[above], kind="stable")]
+            METRICS.dropped("maxResults", len(order), min(len(order), int(cfg["maxResults"])))
+            order = order[: int(cfg["maxResults"])]
+
+            def scored(k):
+                j = filtered[k].copy() if copy else filtered[k]
+                j.reasons = score_reasons(matrix.hits(filtered[k], cfg), j.remote)
+                j.score = int(sc[k]) if sims is None else round(float(sc[k]), 2)
+                if sims is not None:
+                    j.reasons.append(f"relevanz: {rel[k]:.2f}")
+                return j
+
+            if score_all:
+                filtered = [scored(k) for k in range(len(filtered))]
+                ranked = [filtered[k] for k in order]
+            else:
+                ranked = [scored(k) for k in order]
+        st["out"] = len(ranked)
+    return filtered, ranked
+
+
+def run_pipeline(cfg, index=None, full: bool = False, fetch=fetch_sources, profiles=None, score_all: bool = False):
+    # One crawl: fetch, pushdown, enrich, dedupe, filter, score, index update. fetch(cfg, known, stopped)
+    # returns (jobs, warnings); the daemon passes one that only refreshes due sources.
+    # With profiles (batch mode, cfg = crawl_config(profiles)) the crawl is shared and filtering and
+    # scoring run per profile; returns one result per profile then. With score_all each result also
+    # carries every filtered job, scored, as "candidates" for a selection of its own (the mail's quotas);
+    # no detail fetch is skipped by score bound then. Expects configure_* to have run; the index stays open.
+    ranking = profiles or [cfg]
+    run_started = datetime.now(timezone.utc).isoformat()
+    METRICS.reset()
+    known = index.keys() if index is not None and not full else frozenset()
+    stopped = set()
+    carried_keys = set()
+    with METRICS.stage("fetch") as st:
+        jobs, warnings = fetch(cfg, known, stopped)
+        # API feeds drop filtered postings while parsing; they still count towards the total.
+        st["droppedWhileParsing"] = sum(METRICS.to_dict()["filtersDropped"].values())
+        if stopped:
+            # Paginated sources stopped at pages of known postings; the postings behind them stay in this run.
+            since = (datetime.now(timezone.utc) - timedelta(days=float(cfg["lookbackDays"]))).isoformat()
+            carried = index.carry_over(stopped, since, {job_key(j) for j in jobs})
+            carried_keys = {job_key(j) for j in carried}
+            jobs.extend(carried)
+            st["carriedOver"] = len(carried)
+        st["out"] = len(jobs)
+    SOURCE_HEALTH.save()
+    hashes = listing_hashes(jobs)
+    fetched_keys = {dedupe_key(j) for j in jobs}
+    reused = set()
+    if index is not None and not full:
+        reused = apply_indexed(jobs, index.unchanged(hashes))
+    # Filters decidable from list-page data run before enrichment, so detail pages are only fetched for survivors.
+    with METRICS.stage("pushdown", len(jobs)) as st:
+        jobs, pushed_out, saved = pushdown_groups(jobs, cfg, reused, bool(cfg["nearDuplicates"]), float(cfg["nearDuplicateThreshold"]))
+        st["out"] = len(jobs)
+        st["detailFetchesSaved"] = saved
+    unenriched = {job_key(j) for j in pushed_out if detail_fields(j, reused)}
+    # The Gesines budget goes best-first by score upper bound. Nothing is cut here: duplicates are merged
+    # afterwards, which can still lower the top-K threshold and change which record represents a group.
+    with METRICS.stage("enrich", len(jobs)):
+        bounds = {}
+        for p in ranking:
+            for url, b in bound_pruned(jobs, p, reused)[1].items():
+                bounds[url] = max(b, bounds.get(url, b))
+        jobs = enrich_gesines_jobs(jobs, warnings, skip=reused, priority=bounds)
+    # From here on Gesines postings count as enriched: no further detail fetch can change them.
+    done = reused | {job_key(j) for j in jobs if gesines_target(j)}
+    with METRICS.stage("dedupe", len(jobs)) as st:
+        deduped = dedupe_and_merge_jobs(jobs, bool(cfg["nearDuplicates"]), float(cfg["nearDuplicateThreshold"]))
+        st["out"] = len(deduped)
+    # Gesines postings are enriched and duplicates merged by now, so more filters are decidable before StepStone details.
+    with METRICS.stage("pushdown") as st:
+        candidates, _, more_saved = pushdown_filters(deduped, cfg, done)
+        st["out"] = len(candidates)
+        st["detailFetchesSaved"] = saved = saved + more_saved
+
+    with METRICS.stage("enrich", len(candidates)) as st:
+        # A detail fetch is skipped only if no profile can use the job: filtered out or below its top-K.
+        pruned = None
+        for p in ranking:
+            kept, out, _ = pushdown_filters(candidates, p, done, record=False) if profiles else (candidates, [], 0)
+            useless = {job_key(j) for j in out}
+            # With score_all every filtered job is handed out, whatever its score.
+            if not score_all:
+                useless |= bound_pruned(kept, p, done, top_k=int(p["maxResults"]))[0]
+            pruned = useless if pruned is None else pruned & useless
+        enrich_stepstone_jobs(candidates, warnings, skip=done | pruned)
+        unenriched |= pruned
+        st["boundPruned"] = len(pruned)
+    for j in candidates:
+        j.ageDays = days_since(j.publishedAt)
+
+    matrix = None
+    if any(norm(p.get("scoringBackend")) == "numpy" for p in ranking):
+        if numpy_module() is None:
+            warnings.append("scoringBackend numpy: numpy ist nicht installiert - Bewertung in Python")
+        else:
+            with METRICS.stage("scoreMatrix", len(candidates)):
+                matrix = ScoreMatrix(candidates, [p for p in ranking if uses_score_matrix(p)])
+    # Carried-over postings were not seen this run: their last_seen must not move and they are counted in the IDF already.
+    seen = [j for j in deduped + pushed_out if job_key(j) not in carried_keys]
+    new_keys = None
+    if index is not None:
+        # Postings that skipped their detail fetch are stored without a content hash, so a later run
+        # enriches them instead of reusing their list-page fields as enrichment.
+        stored_hashes = {k: h for k, h in hashes.items() if k not in unenriched}
+        new_keys = index.record(seen, stored_hashes, run_started)
+        index.prune(float(cfg["indexRetentionDays"]))
+    relevance = None
+    if any(uses_relevance(p) for p in ranking):
+        with METRICS.stage("relevance", len(candidates)) as st:
+            terms = {id(j): relevance_terms(job_haystack(j)) for j in seen}
+            docs, df = relevance_stats(seen, terms, index)
+            relevance = RelevanceModel(candidates, docs, df, terms)
+            st["docs"] = docs
+            st["terms"] = len(df)
+    ranked_by_profile = [
+        rank_jobs(candidates, p, copy=bool(profiles), matrix=matrix if uses_score_matrix(p) else None, relevance=relevance, score_all=score_all)
+        for p in ranking
+    ]
+    # Postings after dedupe: merged rows, groups pushed out before dedupe (never near duplicates of
+    # others) and postings dropped while parsing that share no dedupe key with a fetched one.
+    total = len(deduped) + len({dedupe_key(j) for j in pushed_out}) + len(METRICS.streamed_out - fetched_keys)
+    results = []
+    for filtered, ranked in ranked_by_profile:
+        delta = [j for j in ranked if new_keys is not None and job_key(j) in new_keys]
+        metrics = METRICS.to_dict()
+        metrics["health"] = SOURCE_HEALTH.report()
+        metrics.update({"startedAt": run_started, "total": total, "current": len(filtered), "hits": len(ranked), "warnings": len(warnings)})
+        results.append(
+            {
+                "ranked": ranked,
+                "delta": delta,
+                "newKeys": new_keys,
+                "reused": len(reused),
+                "total": total,
+                "current": len(filtered),
+                "candidates": filtered if score_all else None,
+                "warnings": warnings,
+                "metrics": metrics,
+                "startedAt": run_started,
+            }
+        )
+    return results if profiles else results[0]
+
+
+def render_markdown(ranked, config_path) -> str:
+    lines = ["# Job-Finder Ergebnis", "", f"Profil: `{config_path}`", f"Erstellt: {datetime.now().isoformat()}", ""]
+    if not ranked:
+        lines.append("Keine Treffer. Passe ggf. `minimumScore` oder Keywords an.")
+    else:
+        for i, j in enumerate(ranked, 1):
+            lines.extend(
+                [
+                    f"## {i}. {j.title} ({j.company})",
+                    f"- Score: **{j.score}**",
+                    f"- Quelle: {j.source}",
+                    f"- Ort: {j.location or 'unbekannt'}",
+                    f"- Veröffentlicht vor: {j.ageDays} Tagen",
+                    f"- Gründe: {' | '.join(j.reasons or ['keine'])}",
+                    f"- Link: {j.url}",
+                    "",
+                ]
+            )
+    return "\n".join(lines)
+
+
+def jobs_json(jobs) -> str:
+    return json.dumps([j.to_dict() for j in jobs], indent=2, ensure_ascii=False)
+
+
+def summary_lines(result) -> list:
+    lines = [f"Gesamt: {result['total']}, aktuell: {result['current']}, Treffer: {len(result['ranked'])}"]
+    lines.extend(f"Quellen-Status: {line}" for line in SOURCE_HEALTH.summary_lines())
+    if result["newKeys"] is not None:
+        lines.append(f"Neu seit letztem Lauf: {len(result['delta'])} Treffer, {len(result['newKeys'])} neue Stellen gesamt, unveraendert aus Index: {result['reused']}")
+    return lines
+
+
+def load_config(config) -> dict:
+    # Profile path or dict, on top of the defaults.
+    cfg = DEFAULT_CONFIG.copy()
+    cfg.update(config if isinstance(config, dict) else json.loads(Path(config).read_text(encoding="utf-8")))
+    return cfg
+
+
+class PageTemplate(dict):
+    """format_map values that leave {page} in place for the crawler."""
+
+    def __missing__(self, key):
+        return "{" + key + "}"
+
+
+def crawl_config(profiles) -> dict:
+    # One crawl config for several profiles: every source any profile enables, each with the URLs all
+    # profiles resolve it to, the widest lookback and no profile-specific filters. Filtering and scoring
+    # then run per profile (run_pipeline(profiles=...)). A single profile is crawled as it is.
+    if len(profiles) == 1:
+        return profiles[0]
+    specs = {}
+    for p in profiles:
+        values = PageTemplate(template_vars(p))
+        for spec in source_registry(p):
+            if not source_enabled(p, spec["name"]):
+                continue
+            merged = specs.setdefault(spec["name"], {**spec, "urls": []})
+            for template in spec.get("urls") or []:
+                url = str(template).strip().format_map(values)
+                if url not in merged["urls"]:
+                    merged["urls"].append(url)
+    cfg = dict(profiles[0])
+    cfg.update(
+        {
+            "sources": list(specs.values()),
+            "allowedSources": list(specs),
+            "lookbackDays": max(float(p["lookbackDays"]) for p in profiles),
+            "strictLocations": [],
+            "excludeKeywords": [],
+            "remoteOnly": False,
+        }
+    )
+    return cfg
+
+
+def configure_run(cfg, cache_dir=None, health=None, record=None, upstream=None) -> None:
+    # Sets up the module-level HTTP, cache and health state for run_pipeline(); cache_dir None disables caching.
+    configure_replay(record, upstream)
+    configure_cache(cache_dir, cfg["cacheMaxMB"])
+    configure_session(Path(cache_dir) / "cookies.lwp" if cache_dir else None)
+    configure_http(cfg)
+    configure_stream_filters(cfg)
+    configure_health(health or (Path(cache_dir) / "source_health.json" if cache_dir else None), cfg)
+
+
+def find_jobs(config, cache_dir=DEFAULT_CACHE_DIR, full: bool = False, workers=None) -> dict:
+    # Library entry point: one crawl in this process, results as plain Python objects
+    # (jobs and delta as dicts, warnings, summary lines, metrics). Not safe for concurrent calls in one process.
+    return find_jobs_batch([config], cache_dir, full, workers)[0]
+
+
+def find_jobs_batch(configs, cache_dir=DEFAULT_CACHE_DIR, full: bool = False, workers=None, candidates: bool = False) -> list:
+    # Like find_jobs, for several profiles sharing one crawl; one result per profile, in order.
+    # candidates: also return every filtered job, scored (run_pipeline score_all).
+    profiles = [load_config(c) for c in configs]
+    cfg = crawl_config(profiles)
+    if workers is not None:
+        cfg["crawlConcurrency"] = workers
+    configure_run(cfg, cache_dir)
+    index = JobIndex(Path(cache_dir) / "jobs.sqlite") if cache_dir else None
+    try:
+        results = run_pipeline(cfg, index, full, profiles=profiles if len(profiles) > 1 else None, score_all=candidates)
+    finally:
+        if index is not None:
+            index.close()
+        close_session()
+        if HTTP_CACHE is not None:
+            HTTP_CACHE.evict()
+    return [
+        {
+            "jobs": [j.to_dict() for j in result["ranked"]],
+            "delta": [j.to_dict() for j in result["delta"]],
+            **({"candidates": [j.to_dict() for j in result["candidates"]]} if candidates else {}),
+            "warnings": result["warnings"],
+            "summary": summary_lines(result),
+            "metrics": result["metrics"],
+        }
+        for result in (results if len(profiles) > 1 else [results])
+    ]
+
+
+def write_outputs(result, args, config_path, per_profile: bool = False) -> None:
+    # per_profile: batch mode, each output path gets the profile name (jobs.json -> jobs.<profil>.json).
+    def path(p):
+        p = Path(p)
+        return p.with_name(f"{p.stem}.{Path(config_path).stem}{p.suffix}") if per_profile else p
+
+    if args.out:
+        path(args.out).write_text(render_markdown(result["ranked"], config_path), encoding="utf-8")
+    if args.json:
+        path(args.json).write_text(jobs_json(result["ranked"]), encoding="utf-8")
+    if args.delta:
+        path(args.delta).write_text(jobs_json(result["delta"]), encoding="utf-8")
+    if args.metrics:
+        path(args.metrics).write_text(json.dumps(result["metrics"], indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+class JobFinderDaemon:
+    """Resident crawler: refreshes each source on its own interval and serves the latest ranking."""
+
+    TICK_SECONDS = 60
+
+    def __init__(self, cfg, index, args):
+        self.cfg = cfg
+        self.index = index
+        self.args = args
+        default = float(cfg.get("daemonRefreshMinutes") or 60) * 60
+        self.sources = [spec["name"] for spec in source_registry(cfg) if source_enabled(cfg, spec["name"])]
+        self.interval = {spec["name"]: float(spec.get("refreshHours") or 0) * 3600 or default for spec in source_registry(cfg)}
+        self.next_due = dict.fromkeys(self.sources, 0.0)
+        self.last_run = {}
+        # Jobs of the last successful crawl per source, as dicts: the pipeline patches Job records in place.
+        self.retained = {}
+        # Sources whose last refresh stopped early at known pages; their older postings come from the index.
+        self.stopped = set()
+        self.wake = threading.Event()
+        self.stopping = threading.Event()
+        self.lock = threading.Lock()
+        self.snapshot = None
+        self.cycles = 0
+
+    def due(self, now: float):
+        return {s for s in self.sources if self.next_due[s] <= now}
+
+    def fetch(self, cfg, known, stopped):
+        now = time.time()
+        due = self.due(now)
+        by_source = {}
+        jobs, warnings = fetch_sources(cfg, known, stopped, only=due, by_source=by_source)
+        for source in due:
+            ok, source_jobs = by_source.get(source, (False, []))
+            # A failed or skipped source keeps its previous postings until the next successful refresh.
+            if ok:
+                self.retained[source] = [j.to_dict() for j in source_jobs]
+                self.stopped.discard(source)
+                if source in stopped:
+                    self.stopped.add(source)
+            self.last_run[source] = {"at": datetime.now(timezone.utc).isoformat(), "ok": ok, "jobs": len(source_jobs)}
+            self.next_due[source] = now + self.interval[source]
+        stopped.update(self.stopped - due)
+        merged = []
+        for source in self.sources:
+            if source in due and by_source.get(source, (False,))[0]:
+                merged.extend(by_source[source][1])
+            else:
+                merged.extend(Job.from_dict(d) for d in self.retained.get(source, []))
+        return merged, warnings
+
+    def cycle(self) -> None:
+        result = run_pipeline(self.cfg, self.index, self.args.full, fetch=self.fetch)
+        write_outputs(result, self.args, self.args.config[0])
+        snapshot = {
+            "results": jobs_json(result["ranked"]).encode("utf-8"),
+            "markdown": render_markdown(result["ranked"], self.args.config[0]).encode("utf-8"),
+            "delta": jobs_json(result["delta"]).encode("utf-8"),
+            "metrics": json.dumps(result["metrics"], indent=2, ensure_ascii=False).encode("utf-8"),
+        }
+        with self.lock:
+            # Counted together with its snapshot, so a client seeing the new cycle also gets its results.
+            self.snapshot = snapshot
+            self.cycles += 1
+        if HTTP_CACHE is not None:
+            HTTP_CACHE.evict()
+        for w in result["warnings"]:
+            print(f"[Warnung] {w}", file=sys.stderr)
+        print(f"[{datetime.now().isoformat(timespec='seconds')}] Gesamt: {result['total']}, aktuell: {result['current']}, Treffer: {len(result['ranked'])}, neu: {len(result['delta'])}", flush=True)
+
+    def status(self) -> dict:
+        now = time.time()
+        with self.lock:
+            return {
+                "cycles": self.cycles,
+                "sources": {
+                    s: {**self.last_run.get(s, {}), "retained": len(self.retained.get(s, [])), "nextDueSeconds": max(0, round(self.next_due[s] - now))}
+                    for s in self.sources
+                },
+            }
+
+    def run(self) -> None:
+        while not self.stopping.is_set():
+            if self.wake.is_set():
+                self.wake.clear()
+                self.next_due = dict.fromkeys(self.sources, 0.0)
+            if self.due(time.time()):
+                self.cycle()
+            wait = min(self.next_due.values(), default=time.time() + self.TICK_SECONDS) - time.time()
+            self.wake.wait(max(1.0, min(wait, self.TICK_SECONDS)))
+
+
+class DaemonHandler(BaseHTTPRequestHandler):
+    ROUTES = {
+        "/results": ("results", "application/json"),
+        "/results.md": ("markdown", "text/markdown"),
+        "/delta": ("delta", "application/json"),
+        "/metrics": ("metrics", "application/json"),
+    }
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        daemon = self.server.job_finder
+        path = urlparse(self.path).path.rstrip("/") or "/"
+        if path in ("/status", "/health"):
+            data = daemon.status() if path == "/status" else SOURCE_HEALTH.report()
+            self._send(200, "application/json", json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8"))
+            return
+        if path not in self.ROUTES:
+            self._send(404, "text/plain", b"Unbekannter Pfad")
+            return
+        with daemon.lock:
+            snapshot = daemon.snapshot
+        if snapshot is None:
+            self._send(503, "text/plain", "Erster Lauf noch nicht fertig".encode("utf-8"))
+            return
+        key, ctype = self.ROUTES[path]
+        self._send(200, ctype, snapshot[key])
+
+    def do_POST(self):
+        if urlparse(self.path).path.rstrip("/") != "/refresh":
+            self._send(404, "text/plain", b"Unbekannter Pfad")
+            return
+        self.server.job_finder.wake.set()
+        self._send(202, "text/plain", b"Aktualisierung angestossen")
+
+    def _send(self, status: int, ctype: str, data: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", f"{ctype}; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def serve(cfg, index, args) -> None:
+    host, _, port = args.serve.rpartition(":")
+    daemon = JobFinderDaemon(cfg, index, args)
+    server = ThreadingHTTPServer((host or "127.0.0.1", int(port)), DaemonHandler)
+    server.daemon_threads = True
+    server.job_finder = daemon
+    threading.Thread(target=server.serve_forever, name="job-finder-http", daemon=True).start()
+    signal.signal(signal.SIGTERM, lambda *_: (daemon.stopping.set(), daemon.wake.set()))
+    print(f"Job-Finder-Daemon auf http://{server.server_address[0]}:{server.server_address[1]} ({len(daemon.sources)} Quellen)", flush=True)
+    try:
+        daemon.run()
+    except KeyboardInterrupt:
+        pass
+    server.shutdown()
+    server.server_close()
+
+
 def main():
     ap = argparse.ArgumentParser()
-    ap.add_argument("--config", required=True)
+    ap.add_argument("--config", required=True, action="append", help="Profil-JSON; mehrfach angeben, um mehrere Profile mit einem gemeinsamen Crawl zu bewerten")
     ap.add_argument("--out")
     ap.add_argument("--json")
+    ap.add_argument("--workers", type=int, help="Parallele Quellen-Abrufe (1 = sequentiell)")
+    ap.add_argument("--cache-dir", default=str(DEFAULT_CACHE_DIR), help="Verzeichnis fuer den HTTP-/Parse-Cache")
+    ap.add_argument("--no-cache", action="store_true", help="HTTP-/Parse-Cache deaktivieren")
+    ap.add_argument("--index", help="SQLite-Stellenindex (Standard: <cache-dir>/jobs.sqlite, aus mit --no-cache)")
+    ap.add_argument("--full", action="store_true", help="Alle Stellen neu anreichern, auch unveraenderte aus dem Index")
+    ap.add_argument("--delta", help="JSON-Datei fuer Treffer, die seit dem letzten Lauf neu sind")
+    ap.add_argument("--health", help="JSON-Datei fuer den Quellen-Zustand (Standard: <cache-dir>/source_health.json, aus mit --no-cache)")
+    ap.add_argument("--metrics", help="JSON-Datei fuer Laufzeit-/Volumen-Metriken pro Quelle und Stufe")
+    ap.add_argument("--record", help="Alle Antworten in dieses Archiv (.jsonl.gz) aufzeichnen")
+    ap.add_argument("--replay", nargs="?", const="", help="Antworten aus dem Archiv ueber einen lokalen Stand-in-Server ausliefern (ohne Netz)")
+    ap.add_argument("--upstream", help="Laufenden Stand-in-Server (host:port) statt Live-Seiten verwenden")
+    ap.add_argument("--fake-sources", type=int, default=0, help="Anzahl synthetischer Quellen des Stand-in-Servers")
+    ap.add_argument("--latency-ms", type=int, default=0, help="Stand-in: kuenstliche Latenz pro Request")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="Stand-in: Anteil der URLs mit injiziertem Fehler")
+    ap.add_argument("--serve", metavar="[HOST:]PORT", help="Als Daemon laufen: Quellen nach Zeitplan auffrischen, Ergebnisse per HTTP ausliefern")
     args = ap.parse_args()
+    batch = len(args.config) > 1
+    if batch and args.serve:
+        ap.error("--serve unterstuetzt nur ein --config")
 
-    cfg = DEFAULT_CONFIG.copy()
-    cfg.update(json.loads(Path(args.config).read_text(encoding="utf-8")))
-
-    jobs, warnings = fetch_sources(cfg)
-    jobs = enrich_gesines_jobs(jobs, warnings)
-    deduped = dedupe_and_merge_jobs(jobs)
-    for j in deduped:
-        j["ageDays"] = days_since(j.get("publishedAt"))
-
-    enrich_stepstone_jobs(deduped, warnings)
-    for j in deduped:
-        j["ageDays"] = days_since(j.get("publishedAt"))
-
-    filtered = [j for j in deduped if (j["ageDays"] <= cfg["lookbackDays"] or j["ageDays"] == 9999)]
-    filtered = [j for j in filtered if source_enabled(cfg, j.get("source", ""))]
-    filtered = [j for j in filtered if matches_strict_locations(j, cfg.get("strictLocations", []))]
-    filtered = [j for j in filtered if not contains_excluded(j, cfg)]
-    filtered = [j for j in filtered if not is_obvious_non_job(j)]
-    if cfg["remoteOnly"]:
-        filtered = [j for j in filtered if j.get("remote")]
-
-    ranked = [score(j, cfg) for j in filtered]
-    ranked = [j for j in ranked if j["score"] >= cfg["minimumScore"]]
-    ranked.sort(key=lambda x: x["score"], reverse=True)
-    ranked = ranked[: int(cfg["maxResults"])]
-
-    for w in warnings:
-        print(f"[Warnung] {w}", file=sys.stderr)
-    print(f"Gesamt: {len(deduped)}, aktuell: {len(filtered)}, Treffer: {len(ranked)}")
-    for i, j in enumerate(ranked, 1):
-        print(f"{i}. [{j['score']}] {j['title']} @ {j['company']} ({j.get('location') or 'n/a'})")
-        print(f"   {j.get('url')}")
+    profiles = [load_config(c) for c in args.config]
 
-    if args.out:
-        lines = ["# Job-Finder Ergebnis", "", f"Profil: `{args.config}`", f"Erstellt: {datetime.now().isoformat()}", ""]
-        if not ranked:
-            lines.append("Keine Treffer. Passe ggf. `minimumScore` oder Keywords an.")
-        else:
-            for i, j in enumerate(ranked, 1):
-                lines.extend(
-                    [
-                        f"## {i}. {j['title']} ({j['company']})",
-                        f"- Score: **{j['score']}**",
-                        f"- Quelle: {j['source']}",
-                        f"- Ort: {j.get('location') or 'unbekannt'}",
-                        f"- Veröffentlicht vor: {j['ageDays']} Tagen",
-                        f"- Gründe: {' | '.join(j.get('reasons') or ['keine'])}",
-                        f"- Link: {j.get('url')}",
-                        "",
-                    ]
-                )
-        Path(args.out).write_text("\n".join(lines), encoding="utf-8")
+    standin = None
+    upstream = None
+    if args.replay is not None or args.upstream:
+        from standin_server import StandIn, fake_source_entries
 
-    if args.json:
-        Path(args.json).write_text(json.dumps(ranked, indent=2, ensure_ascii=False), encoding="utf-8")
+        if args.upstream:
+            host, _, port = args.upstream.rpartition(":")
+            upstream = (host or "127.0.0.1", int(port))
+        else:
+            standin = StandIn(args.replay or None, args.fake_sources, args.latency_ms, error_rate=args.error_rate)
+            upstream = standin.start()
+        fake = fake_source_entries(args.fake_sources)
+        for cfg in profiles:
+            cfg["sources"] = list(cfg.get("sources") or []) + fake
+            if cfg.get("allowedSources"):
+                cfg["allowedSources"] = list(cfg["allowedSources"]) + [f["name"] for f in fake]
+    cfg = crawl_config(profiles)
+    if args.workers is not None:
+        cfg["crawlConcurrency"] = args.workers
+    configure_run(cfg, None if args.no_cache else args.cache_dir, args.health, args.record, upstream)
+    index_path = args.index or (None if args.no_cache else Path(args.cache_dir) / "jobs.sqlite")
+    index = JobIndex(index_path) if index_path else None
+
+    if args.serve:
+        serve(cfg, index, args)
+    else:
+        results = run_pipeline(cfg, index, args.full, profiles=profiles if batch else None)
+        results = results if batch else [results]
+        for w in results[0]["warnings"]:
+            print(f"[Warnung] {w}", file=sys.stderr)
+        for config_path, result in zip(args.config, results):
+            if batch:
+                print(f"== Profil: {config_path} ==")
+            for line in summary_lines(result):
+                print(line)
+            for i, j in enumerate(result["ranked"], 1):
+                print(f"{i}. [{j.score}] {j.title} @ {j.company} ({j.location or 'n/a'})")
+                print(f"   {j.url}")
+            write_outputs(result, args, config_path, batch)
+    if index is not None:
+        index.close()
+
+    close_session()
+    if standin is not None:
+        print(f"Stand-in: {json.dumps(standin.stats())}", file=sys.stderr)
+        standin.stop()
+    if HTTP_CACHE is not None:
+        HTTP_CACHE.evict()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+import argparse
+import gzip
+import hashlib
+import json
+import random
+import socket
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from datetime import date, timedelta
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from job_finder import HttpArchive  # noqa: E402
+
+FAKE_HOST = "jobs-{n:03d}.standin.test"
+FAKE_JOBS_PER_SOURCE = 25
+FAKE_PAGES = 8
+ERROR_KINDS = ["503", "500", "reset", "stall"]
+
+ROLES = ["Referent", "Referentin", "Sachbearbeiter", "Projektmanager", "Leitung", "Koordinator", "Berater"]
+TOPICS = ["Politik", "Digitalpolitik", "Kommunikation", "Public Affairs", "Haushalt", "Grundsatzfragen", "Datenschutz", "Bildung"]
+EMPLOYERS = ["Bundesministerium des Innern", "Stiftung Zukunft", "Verband Digitales e.V.", "Land Berlin", "Agentur Nord AG"]
+PLACES = ["Berlin", "Potsdam", "Hamburg", "Remote", "Bonn"]
+
+
+def fake_source_entries(count: int) -> list[dict]:
+    # "sources" entries for job_finder; the stand-in answers these URLs with synthesized listings.
+    return [
+        {"name": f"StandIn{n:03d}", "url": f"http://{FAKE_HOST.format(n=n)}/stellenangebote?page={{page}}", "pagination": {"maxPages": FAKE_PAGES}}
+        for n in range(count)
+    ]
+
+
+def fake_listing(url: str, count: int) -> tuple[str, str] | None:
+    p = urlparse(url)
+    host = (p.hostname or "").lower()
+    if not host.endswith(".standin.test") or not host.startswith("jobs-"):
+        return None
+    try:
+        n = int(host.split(".", 1)[0][5:])
+    except ValueError:
+        return None
+    if n >= count:
+        return None
+    page = int((parse_qs(p.query).get("page") or ["1"])[0] or 1)
+    rng = random.Random(f"{host}{p.path}{page}")
+    if p.path.startswith("/stelle/"):
+        title = f"{rng.choice(ROLES)} {rng.choice(TOPICS)} (m/w/d)"
+        return "text/html; charset=utf-8", f"<html><head><meta name=\"description\" content=\"{title} in {rng.choice(PLACES)}\"></head><body><h1>{title}</h1></body></html>"
+
+    # Newest first: page p holds postings published 7*(p-1) to 7*p-1 days ago; pages past FAKE_PAGES are empty.
+    jobs = []
+    for k in range(FAKE_JOBS_PER_SOURCE if page <= FAKE_PAGES else 0):
+        jobs.append(
+            {
+                "title": f"{rng.choice(ROLES)} {rng.choice(TOPICS)} (m/w/d)",
+                "company": rng.choice(EMPLOYERS),
+                "location": rng.choice(PLACES),
+                "url": f"/stelle/{n}-{page}-{k}.html",
+                "date": (date.today() - timedelta(days=7 * (page - 1) + k * 7 // FAKE_JOBS_PER_SOURCE)).isoformat(),
+            }
+        )
+    if n % 2:
+        # Odd sources publish JSON-LD, even ones plain anchor lists.
+        graph = [
+            {
+                "@type": "JobPosting",
+                "title": j["title"],
+                "url": j["url"],
+                "hiringOrganization": {"name": j["company"]},
+                "jobLocation": {"@type": "Place", "address": {"@type": "PostalAddress", "addressLocality": j["location"]}},
+                "datePosted": j["date"],
+            }
+            for j in jobs
+        ]
+        body = f'<html><head><script type="application/ld+json">{json.dumps({"@graph": graph}, ensure_ascii=False)}</script></head><body></body></html>'
+    else:
+        items = "".join(f'<li><a href="{j["url"]}">{j["title"]} – {j["company"]}</a></li>' for j in jobs)
+        body = f"<html><body><nav><a href=\"/\">Start</a><a href=\"/kontakt\">Kontakt</a></nav><ul>{items}</ul></body></html>"
+    return "text/html; charset=utf-8", body
+
+
+class StandIn:
+    """Local HTTP stand-in for the job portals: replays an archive, synthesizes fake sources, injects latency and faults."""
+
+    def __init__(self, archive=None, fake_sources: int = 0, latency_ms: int = 0, jitter_ms: int = 0,
+                 error_rate: float = 0.0, error_kinds=("503",), stall_seconds: float = 30.0, seed: str = ""):
+        self.entries = HttpArchive(archive).entries if archive else {}
+        self.fake_sources = fake_sources
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_kinds = [k for k in error_kinds if k in ERROR_KINDS] or ["503"]
+        self.stall_seconds = stall_seconds
+        self.seed = seed
+        self.server = None
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        self.counters = {"requests": 0, "notFound": 0, "notModified": 0, "faults": 0}
+        self.peak_per_host = {}
+
+    def _roll(self, url: str, salt: str) -> int:
+        # Deterministic per URL, so the same URLs fail in every run regardless of thread timing.
+        return zlib.crc32(f"{self.seed}|{salt}|{url}".encode("utf-8"))
+
+    def fault_for(self, url: str) -> str:
+        if self.error_rate <= 0 or self._roll(url, "fault") % 10000 >= self.error_rate * 10000:
+            return ""
+        return self.error_kinds[self._roll(url, "kind") % len(self.error_kinds)]
+
+    def lookup(self, url: str):
+        entry = self.entries.get(url)
+        if entry is not None:
+            headers = {k: v for k, v in (entry.get("headers") or {}).items() if v}
+            body = entry.get("body") or ""
+            ctype = headers.get("Content-Type") or ("application/json" if body.lstrip()[:1] in {"{", "["} else "text/html")
+            # Bodies are archived decoded, so they are always served as UTF-8.
+            headers["Content-Type"] = ctype.split(";", 1)[0].strip() + "; charset=utf-8"
+            return int(entry.get("status") or 200), headers, body
+        found = fake_listing(url, self.fake_sources)
+        if found:
+            return 200, {"Content-Type": found[0]}, found[1]
+        return None
+
+    def enter(self, host: str) -> None:
+        with self._lock:
+            self.counters["requests"] += 1
+            n = self._in_flight.get(host, 0) + 1
+            self._in_flight[host] = n
+            self.peak_per_host[host] = max(self.peak_per_host.get(host, 0), n)
+
+    def leave(self, host: str) -> None:
+        with self._lock:
+            self._in_flight[host] -= 1
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            self.counters[name] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            peaks = sorted(self.peak_per_host.values())
+            return {**self.counters, "hosts": len(peaks), "peakPerHost": peaks[-1] if peaks else 0}
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> tuple[str, int]:
+        self.server = ThreadingHTTPServer((host, port), StandInHandler)
+        self.server.daemon_threads = True
+        self.server.standin = self
+        threading.Thread(target=self.server.serve_forever, name="standin", daemon=True).start()
+        return self.server.server_address[:2]
+
+    def stop(self) -> None:
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        standin = self.server.standin
+        url = self.path if "://" in self.path else f"http://{self.headers.get('Host', '')}{self.path}"
+        host = (urlparse(url).hostname or "").lower()
+        standin.enter(host)
+        try:
+            self._serve(standin, url)
+        finally:
+            standin.leave(host)
+
+    def _serve(self, standin: StandIn, url: str) -> None:
+        delay = standin.latency_ms + (standin._roll(url, "jitter") % (standin.jitter_ms + 1) if standin.jitter_ms else 0)
+        if delay:
+            time.sleep(delay / 1000)
+
+        fault = standin.fault_for(url)
+        if fault:
+            standin.count("faults")
+        if fault == "reset":
+            self.close_connection = True
+            self.connection.shutdown(socket.SHUT_RDWR)
+            return
+        if fault == "stall":
+            time.sleep(standin.stall_seconds)
+            self.close_connection = True
+            return
+        if fault:
+            self._send(int(fault), {"Content-Type": "text/plain; charset=utf-8", "Retry-After": "1"}, f"Injected {fault}")
+            return
+
+        found = standin.lookup(url)
+        if found is None:
+            standin.count("notFound")
+            self._send(404, {"Content-Type": "text/plain; charset=utf-8"}, "Not archived")
+            return
+        status, headers, body = found
+        if status != 200:
+            self._send(status, {"Content-Type": "text/plain; charset=utf-8"}, "")
+            return
+        etag = headers.get("ETag") or '"' + hashlib.sha1(body.encode("utf-8")).hexdigest()[:16] + '"'
+        headers["ETag"] = etag
+        if self.headers.get("If-None-Match") == etag:
+            standin.count("notModified")
+            self._send(304, {"ETag": etag}, None)
+            return
+        self._send(200, headers, body)
+
+    def _send(self, status: int, headers: dict, body) -> None:
+        data = b"" if body is None else body.encode("utf-8")
+        if data and len(data) > 1024 and "gzip" in (self.headers.get("Accept-Encoding") or ""):
+            data = gzip.compress(data, compresslevel=1)
+            headers = {**headers, "Content-Encoding": "gzip"}
+        self.send_response(status)
+        for k, v in headers.items():
+            self.send_header(k, v)
+        if status != 304:
+            self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(data)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Local stand-in server for job_finder (replay, fake sources, latency, faults).")
+    ap.add_argument("--archive", help="archive written by job_finder.py --record")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--fake-sources", type=int, default=0, help="number of synthesized listing sources")
+    ap.add_argument("--latency-ms", type=int, default=0)
+    ap.add_argument("--jitter-ms", type=int, default=0)
+    ap.add_argument("--error-rate", type=float, default=0.0, help="share of URLs answered with an injected fault")
+    ap.add_argument("--error-kinds", default="503", help=f"comma-separated, from {','.join(ERROR_KINDS)}")
+    ap.add_argument("--stall-seconds", type=float, default=30.0)
+    ap.add_argument("--seed", default="")
+    ap.add_argument("--print-sources", action="store_true", help='print "sources" JSON for the fake sources and exit')
+    args = ap.parse_args()
+
+    if args.print_sources:
+        print(json.dumps(fake_source_entries(args.fake_sources), indent=2))
+        return 0
+
+    standin = StandIn(args.archive, args.fake_sources, args.latency_ms, args.jitter_ms, args.error_rate,
+                      args.error_kinds.split(","), args.stall_seconds, args.seed)
+    host, port = standin.start(args.host, args.port)
+    print(f"Stand-in listening on {host}:{port} ({len(standin.entries)} archived URLs, {args.fake_sources} fake sources)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    standin.stop()
+    print(json.dumps(standin.stats()))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
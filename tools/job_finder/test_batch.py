@@ -0,0 +1,48 @@
+import job_finder
+from standin_server import fake_source_entries
+
+SEARCH = {"name": "Suche", "url": "https://suche.test/jobs?q={keyword}&page={page}"}
+
+
+def profile(**overrides):
+    return {**job_finder.DEFAULT_CONFIG, "minimumScore": 0, "maxResults": 20, **overrides}
+
+
+def test_crawl_config_merges_sources_and_drops_profile_filters():
+    a = profile(sources=[SEARCH], allowedSources=["Suche", "Arbeitnow"], keywordsMust=["referent"], lookbackDays=14,
+                strictLocations=["berlin"], excludeKeywords=["praktikum"])
+    b = profile(sources=[SEARCH], allowedSources=["Suche", "Interamt"], keywordsMust=["politik"], lookbackDays=30, remoteOnly=True)
+    c = profile(sources=[SEARCH], allowedSources=["Suche"], keywordsMust=["referent"], lookbackDays=7)
+
+    cfg = job_finder.crawl_config([a, b, c])
+    specs = {s["name"]: s for s in cfg["sources"]}
+
+    assert sorted(cfg["allowedSources"]) == ["Arbeitnow", "Interamt", "Suche"]
+    # Each profile's keyword fills the template once; {page} is left for the paginator.
+    assert specs["Suche"]["urls"] == ["https://suche.test/jobs?q=referent&page={page}", "https://suche.test/jobs?q=politik&page={page}"]
+    assert cfg["lookbackDays"] == 30
+    assert (cfg["strictLocations"], cfg["excludeKeywords"], cfg["remoteOnly"]) == ([], [], False)
+    assert job_finder.crawl_config([a]) is a
+
+
+def test_batch_gives_each_profile_its_own_run(standin):
+    server = standin(fake_sources=3)
+    sources = fake_source_entries(3)
+    profiles = [
+        profile(sources=sources, allowedSources=["StandIn000", "StandIn001"], keywordsMust=["referent"], keywordsNice=["digital"],
+                excludeKeywords=["hamburg"], lookbackDays=14),
+        profile(sources=sources, allowedSources=["StandIn001", "StandIn002"], keywordsMust=["politik"],
+                strictLocations=["berlin", "potsdam"], lookbackDays=30, maxResults=5),
+    ]
+
+    single = []
+    for p in profiles:
+        single.append([j.to_dict() for j in job_finder.run_pipeline(p)["ranked"]])
+    requests = server.stats()["requests"]
+
+    batch = job_finder.run_pipeline(job_finder.crawl_config(profiles), profiles=profiles)
+
+    assert [[j.to_dict() for j in r["ranked"]] for r in batch] == single
+    assert all(single)
+    # StandIn001 is crawled once for both profiles.
+    assert server.stats()["requests"] - requests < requests
@@ -0,0 +1,103 @@
+import json
+import random
+from datetime import date, timedelta
+
+import job_finder
+
+TITLES = ["Referent Digitalpolitik", "Sachbearbeiter Haushalt", "Projektmanager Kommunikation", "Referentin Grundsatzfragen"]
+COMPANIES = ["", "StepStone", "Verband Digitales e.V.", "Land Berlin"]
+PLACES = ["", "Berlin", "Potsdam", "Hamburg"]
+DESCRIPTIONS = ["", "Politik und Kommunikation", "Haushalt, remote moeglich", "Digitalpolitik in Berlin"]
+CFG = dict(
+    job_finder.DEFAULT_CONFIG,
+    keywordsMust=["referent", "politik"],
+    keywordsNice=["digital", "kommunikation"],
+    locationsPreferred=["berlin", "potsdam"],
+    excludeKeywords=["hamburg"],
+    minimumScore=5,
+)
+
+
+def days_ago(n):
+    return (date.today() - timedelta(days=n)).isoformat()
+
+
+def stepstone_job(rng, n):
+    return job_finder.Job(
+        source="StepStone",
+        title=f"{rng.choice(TITLES)} {n}",
+        company=rng.choice(COMPANIES),
+        location=rng.choice(PLACES),
+        remote=rng.random() < 0.3,
+        description=rng.choice(DESCRIPTIONS),
+        url=f"https://www.stepstone.de/stellenangebote--job-{n}-inline.html",
+        publishedAt=rng.choice(["", days_ago(1), days_ago(5), days_ago(12)]),
+    )
+
+
+def test_upper_bound_holds_whatever_the_detail_page_adds():
+    rng = random.Random(7)
+    for n in range(300):
+        job = stepstone_job(rng, n)
+        pending = job_finder.detail_fields(job)
+        bound = job_finder.score_upper_bound(job, CFG, pending)
+        patch = {
+            "company": rng.choice(COMPANIES[2:]),
+            "location": rng.choice(PLACES[1:]),
+            "publishedAt": days_ago(rng.choice([0, 4, 20])),
+            "description": rng.choice(DESCRIPTIONS[1:]),
+            "remote": True,
+        }
+        detailed = job.copy(**{k: v for k, v in patch.items() if k in pending})
+        detailed.ageDays = job_finder.days_since(detailed.publishedAt)
+        assert job_finder.score(detailed, CFG).score <= bound
+        if not pending:
+            assert job_finder.score(detailed, CFG).score == bound
+
+
+def test_prunes_below_minimum_score_and_below_the_top_k():
+    complete = dict(company="Land Berlin", location="Berlin", description="Politik", publishedAt=days_ago(1))
+    exact = [
+        job_finder.Job(source="StepStone", title=f"Referent Digitalpolitik {n}", url=f"https://www.stepstone.de/stellenangebote--exact-{n}.html", **complete)
+        for n in range(3)
+    ]
+    # Only the date is left to the detail page: no must keyword can appear any more, or at most 15 points.
+    weak = job_finder.Job(source="StepStone", title="Sachbearbeiter Haushalt", company="Land Berlin", location="Berlin",
+                          description="Haushalt", url="https://www.stepstone.de/stellenangebote--weak.html")
+    open_ended = job_finder.Job(source="StepStone", title="Referent Politik", company="Land Berlin", location="Potsdam",
+                                description="Verwaltung", url="https://www.stepstone.de/stellenangebote--open.html")
+    jobs = exact + [weak, open_ended]
+
+    pruned, bounds = job_finder.bound_pruned(jobs, CFG)
+    assert pruned == {job_finder.job_key(weak)}
+    assert set(bounds) == {open_ended.url}
+
+    # Three complete postings at 17 points fill a top 3 the open one cannot reach; a top 4 it still can.
+    assert (job_finder.score_upper_bound(exact[0], CFG), bounds[open_ended.url]) == (17, 15)
+    assert job_finder.bound_pruned(jobs, CFG, top_k=3)[0] == {job_finder.job_key(weak), job_finder.job_key(open_ended)}
+    assert job_finder.bound_pruned(jobs, CFG, top_k=4)[0] == {job_finder.job_key(weak)}
+
+
+def detail_page(rng):
+    posting = {"@type": "JobPosting", "title": "x", "hiringOrganization": {"name": rng.choice(COMPANIES[2:])},
+               "jobLocation": {"@type": "Place", "address": {"addressLocality": rng.choice(PLACES[1:])}},
+               "datePosted": days_ago(rng.choice([0, 4, 20])), "description": rng.choice(DESCRIPTIONS[1:])}
+    return f'<html><head><script type="application/ld+json">{json.dumps(posting)}</script></head><body></body></html>'
+
+
+def test_pruned_detail_fetches_do_not_change_the_results(standin, monkeypatch):
+    rng = random.Random(3)
+    jobs = [stepstone_job(rng, n) for n in range(60)]
+    server = standin({j.url: detail_page(rng) for j in jobs})
+    cfg = dict(CFG, maxResults=5)
+
+    def run():
+        result = job_finder.run_pipeline(cfg, fetch=lambda *a: ([j.copy() for j in jobs], []))
+        return [j.to_dict() for j in result["ranked"]], result["metrics"]["stages"]["enrich"].get("boundPruned")
+
+    ranked, pruned = run()
+    fetched = server.stats()["requests"]
+    monkeypatch.setattr(job_finder, "bound_pruned", lambda *a, **k: (set(), {}))
+    assert run() == (ranked, 0)
+    assert pruned > 0
+    assert server.stats()["requests"] - fetched == fetched + pruned
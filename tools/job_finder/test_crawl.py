@@ -0,0 +1,98 @@
+import json
+from datetime import date, timedelta
+
+import job_finder
+
+TEMPLATE = "https://portal.test/jobs?page={page}"
+SPEC = {"name": "Portal", "url": TEMPLATE, "pagination": {"maxPages": 5}, "hostConcurrency": 1}
+CFG = dict(job_finder.DEFAULT_CONFIG, sources=[SPEC], allowedSources=["Portal"], keywordsMust=["referent"], lookbackDays=30,
+           minimumScore=-100, maxResults=100)
+
+
+def postings(first, count, age=1):
+    return [{"@type": "JobPosting", "title": f"Referent Politik {n}", "url": f"https://portal.test/stelle-{n}.html",
+             "hiringOrganization": {"name": "Land Berlin"}, "datePosted": (date.today() - timedelta(days=age)).isoformat()}
+            for n in range(first, first + count)]
+
+
+def page(items):
+    return f'<html><head><script type="application/ld+json">{json.dumps({"@graph": items})}</script></head><body></body></html>'
+
+
+def crawl(known=frozenset()):
+    stopped = set()
+    spec = job_finder.source_registry(CFG)[-1]
+    jobs = job_finder.crawl_source_url(spec, spec["urls"][0], {}, job_finder.RequestBudget(0), 30, known, stopped)
+    return jobs, stopped
+
+
+def test_crawl_stops_after_a_page_of_known_postings(standin):
+    server = standin({TEMPLATE.format(page=p): page(postings(10 * p, 5)) for p in range(1, 6)})
+    known = {job_finder.job_key(job_finder.Job(source="Portal", title=p["title"], url=p["url"])) for p in postings(20, 5)}
+
+    jobs, stopped = crawl(known)
+    # Page 2 repeats known postings: it is kept, page 3 is never asked for.
+    assert server.stats()["requests"] == 2 and stopped == {"Portal"}
+    assert sorted(j.url for j in jobs) == sorted(p["url"] for p in postings(10, 5) + postings(20, 5))
+
+
+def test_crawl_stops_after_a_page_of_old_postings(standin):
+    server = standin({TEMPLATE.format(page=1): page(postings(10, 5)), TEMPLATE.format(page=2): page(postings(20, 5, age=60)),
+                      TEMPLATE.format(page=3): page(postings(30, 5))})
+
+    jobs, stopped = crawl()
+    # Too old rather than known: nothing to carry over from the index.
+    assert server.stats()["requests"] == 2 and stopped == set()
+    assert len(jobs) == 10
+
+
+def test_stopped_source_keeps_its_earlier_postings_from_the_index(standin, tmp_path):
+    server = standin({TEMPLATE.format(page=p): page(postings(10 * p, 5) if p < 4 else []) for p in range(1, 6)})
+    index = job_finder.JobIndex(tmp_path / "jobs.sqlite")
+
+    first = job_finder.run_pipeline(CFG, index)
+    assert server.stats()["requests"] == 4 and len(first["ranked"]) == 15
+
+    # Page 1 is all known now: the crawl ends there and pages 2 and 3 come from the index.
+    again = job_finder.run_pipeline(CFG, index)
+    assert server.stats()["requests"] == 5
+    assert again["metrics"]["stages"]["fetch"]["carriedOver"] == 10
+    assert [j.to_dict() for j in again["ranked"]] == [j.to_dict() for j in first["ranked"]]
+    assert again["delta"] == []
+    index.close()
+
+
+def test_registry_entries_override_builtins_by_name_and_add_new_sources():
+    cfg = dict(CFG, sources=[
+        {"name": "stepstone", "pagination": {"maxPages": 2}, "hostConcurrency": 1},
+        {"name": "Arbeitnow", "enabled": False},
+        {"name": "  "},
+        "Interamt",
+        SPEC,
+    ])
+    specs = {s["name"]: s for s in job_finder.source_registry(cfg)}
+
+    # Matched case-insensitively; the override keeps the built-in name, URLs and parser.
+    assert specs["StepStone"]["urls"] == ["https://www.stepstone.de/jobs/{keyword}/in-{stepstoneLocation}?page={page}"]
+    assert (specs["StepStone"]["pagination"], specs["StepStone"]["hostConcurrency"], specs["StepStone"]["parser"]) == ({"maxPages": 2}, 1, "listing")
+    assert "Arbeitnow" not in specs and "stepstone" not in specs
+    assert specs["Interamt"]["urls"] == ["{interamtSearchUrl}"]
+    # A new source takes its url as the only URL and the defaults for the rest.
+    assert (specs["Portal"]["urls"], specs["Portal"]["parser"], specs["Portal"]["requestBudget"]) == ([TEMPLATE], "listing", 0)
+    assert list(specs)[-1] == "Portal"
+
+
+def test_request_budget_caps_the_pages_of_all_urls_of_a_source(standin):
+    server = standin({TEMPLATE.format(page=p): page(postings(10 * p, 5)) for p in range(1, 6)}
+                     | {f"https://portal.test/archiv?page={p}": page(postings(100 + 10 * p, 5)) for p in range(1, 6)})
+    cfg = dict(CFG, sources=[{"name": "Portal", "urls": [TEMPLATE, "https://portal.test/archiv?page={page}"], "pagination": {"maxPages": 5},
+                              "hostConcurrency": 1, "requestBudget": 3}])
+
+    jobs, _ = job_finder.fetch_sources(cfg)
+    # Three pages in all: the first URL spends the budget, the second gets nothing.
+    assert server.stats()["requests"] == 3 and len(jobs) == 15
+    assert job_finder.HOST_LIMITS == {"portal.test": 1}
+
+    budget = job_finder.RequestBudget(3)
+    assert [budget.take(2), budget.take(2), budget.take(1)] == [2, 1, 0]
+    assert job_finder.RequestBudget(0).take(50) == 50
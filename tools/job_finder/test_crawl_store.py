@@ -0,0 +1,109 @@
+import fcntl
+import json
+import threading
+import time
+
+import pytest
+
+from crawl_store import CrawlStore
+
+
+@pytest.fixture
+def profiles(tmp_path):
+    paths = []
+    for name in ("a", "b"):
+        path = tmp_path / f"{name}.json"
+        path.write_text(json.dumps({"keywordsMust": [name]}), encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+def crawler(calls):
+    def crawl(paths):
+        calls.append(list(paths))
+        return [({"jobs": [path], "error": ""}, True) for path in paths]
+
+    return crawl
+
+
+def hold_lock(store):
+    # Another process crawling: flock locks belong to the open file, so a second open() contends.
+    store.root.mkdir(parents=True, exist_ok=True)
+    lock = open(store.root / "crawl.lock", "a+")
+    fcntl.flock(lock, fcntl.LOCK_EX)
+    return lock
+
+
+def test_fresh_entry_is_reused_and_missing_profiles_crawled_in_one_batch(tmp_path, profiles):
+    store = CrawlStore(tmp_path / "store")
+    calls = []
+
+    assert store.fetch(profiles[:1], "2026-01-01T08", crawler(calls)) == [({"jobs": [profiles[0]], "error": ""}, "fresh")]
+    assert store.fetch(profiles, "2026-01-01T08", crawler(calls)) == [
+        ({"jobs": [profiles[0]], "error": ""}, "reused"),
+        ({"jobs": [profiles[1]], "error": ""}, "fresh"),
+    ]
+    assert calls == [profiles[:1], profiles[1:]]
+
+
+def test_entry_past_its_ttl_is_crawled_again(tmp_path, profiles):
+    store = CrawlStore(tmp_path / "store", fresh_seconds=0.2)
+    calls = []
+    store.fetch(profiles[:1], "2026-01-01T08", crawler(calls))
+    time.sleep(0.3)
+
+    assert store.fetch(profiles[:1], "2026-01-01T08", crawler(calls))[0][1] == "fresh"
+    assert len(calls) == 2
+
+
+def test_failed_crawl_is_not_stored(tmp_path, profiles):
+    store = CrawlStore(tmp_path / "store")
+    store.fetch(profiles[:1], "2026-01-01T08", lambda paths: [({"jobs": [], "error": "boom"}, False)])
+
+    assert store.get(store.profile_key(profiles[0]), "2026-01-01T08") is None
+
+
+def test_waiter_reuses_what_the_lock_holder_stored(tmp_path, profiles):
+    store = CrawlStore(tmp_path / "store")
+    lock = hold_lock(store)
+
+    def finish():
+        # The other process stores its crawl and releases the lock inside the stale-wait window.
+        time.sleep(0.5)
+        store.put(store.profile_key(profiles[0]), "2026-01-01T08", {"jobs": ["other"], "error": ""})
+        fcntl.flock(lock, fcntl.LOCK_UN)
+
+    thread = threading.Thread(target=finish)
+    thread.start()
+    calls = []
+    try:
+        assert store.fetch(profiles[:1], "2026-01-01T08", crawler(calls)) == [({"jobs": ["other"], "error": ""}, "reused")]
+    finally:
+        thread.join()
+        lock.close()
+    assert calls == []
+
+
+def test_waiter_serves_a_stale_entry_while_the_lock_is_held(tmp_path, profiles):
+    store = CrawlStore(tmp_path / "store", stale_wait_seconds=0)
+    store.put(store.profile_key(profiles[0]), "2026-01-01T07", {"jobs": ["yesterday"], "error": ""})
+    lock = hold_lock(store)
+    calls = []
+    try:
+        assert store.fetch(profiles[:1], "2026-01-01T08", crawler(calls)) == [({"jobs": ["yesterday"], "error": ""}, "stale")]
+    finally:
+        lock.close()
+    assert calls == []
+
+
+def test_stuck_lock_holder_is_crawled_around_after_the_timeout(tmp_path, profiles):
+    # No stale entry to fall back on: after lock_timeout_seconds the waiter crawls itself.
+    store = CrawlStore(tmp_path / "store", stale_wait_seconds=0, lock_timeout_seconds=0)
+    lock = hold_lock(store)
+    calls = []
+    try:
+        assert store.fetch(profiles[:1], "2026-01-01T08", crawler(calls)) == [({"jobs": [profiles[0]], "error": ""}, "fresh")]
+    finally:
+        lock.close()
+    assert calls == [profiles[:1]]
+    assert store.get(store.profile_key(profiles[0]), "2026-01-01T08") is not None
@@ -0,0 +1,116 @@
+import json
+import threading
+import time
+from argparse import Namespace
+from http.server import ThreadingHTTPServer
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import pytest
+
+import job_finder
+
+SOURCES = [
+    {"name": "StandIn000", "url": "http://jobs-000.standin.test/stellenangebote?page=1"},
+    {"name": "StandIn001", "url": "http://jobs-001.standin.test/stellenangebote?page=1", "refreshHours": 24},
+]
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    cfg = dict(job_finder.DEFAULT_CONFIG, sources=SOURCES, allowedSources=[s["name"] for s in SOURCES], minimumScore=-100, maxResults=100)
+    args = Namespace(full=False, config=["profile.json"], out=None, json=str(tmp_path / "jobs.json"), delta=None, metrics=None)
+    index = job_finder.JobIndex(tmp_path / "jobs.sqlite")
+    yield job_finder.JobFinderDaemon(cfg, index, args)
+    index.close()
+
+
+def sources_of(path):
+    return sorted({j["source"] for j in json.loads(path.read_text(encoding="utf-8"))})
+
+
+def test_only_due_sources_are_refreshed(standin, daemon, tmp_path):
+    server = standin(fake_sources=2)
+
+    daemon.cycle()
+    assert server.stats()["requests"] == 2
+    assert sources_of(tmp_path / "jobs.json") == ["StandIn000", "StandIn001"]
+    assert daemon.status()["sources"]["StandIn001"]["nextDueSeconds"] > 23 * 3600
+
+    daemon.next_due["StandIn000"] = 0.0
+    assert daemon.due(time.time()) == {"StandIn000"}
+    daemon.cycle()
+    assert server.stats()["requests"] == 3
+    assert sources_of(tmp_path / "jobs.json") == ["StandIn000", "StandIn001"]
+
+
+def test_failed_refresh_keeps_the_previous_postings(standin, daemon, tmp_path):
+    standin(fake_sources=2)
+    daemon.cycle()
+    retained = len(daemon.retained["StandIn001"])
+
+    # The second stand-in only knows source 000, so refreshing 001 fails; pooled connections still reach the first.
+    job_finder.close_session()
+    standin(fake_sources=1)
+    daemon.next_due = dict.fromkeys(daemon.sources, 0.0)
+    daemon.cycle()
+
+    assert daemon.last_run["StandIn001"]["ok"] is False
+    assert len(daemon.retained["StandIn001"]) == retained > 0
+    assert sources_of(tmp_path / "jobs.json") == ["StandIn000", "StandIn001"]
+
+
+def request(base, path, method="GET"):
+    try:
+        with urlopen(Request(base + path, method=method), timeout=10) as r:
+            return r.status, r.read()
+    except HTTPError as e:
+        return e.code, e.read()
+
+
+def test_http_api_and_refresh(standin, daemon, tmp_path):
+    standin(fake_sources=2)
+    http = ThreadingHTTPServer(("127.0.0.1", 0), job_finder.DaemonHandler)
+    http.job_finder = daemon
+    threading.Thread(target=http.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{http.server_address[1]}"
+    seen = {"before": request(base, "/results")[0]}
+
+    def client():
+        # The loop owns the index and has to run in the thread that opened it; requests come from here.
+        try:
+            wait_for(lambda: daemon.cycles >= 1)
+            seen["results"] = request(base, "/results")
+            seen["markdown"] = request(base, "/results.md")[1]
+            seen["status"] = json.loads(request(base, "/status")[1])
+            seen["missing"] = request(base, "/nope")[0]
+            seen["refresh"] = request(base, "/refresh", "POST")[0]
+            wait_for(lambda: daemon.cycles >= 2)
+            seen["delta"] = json.loads(request(base, "/delta")[1])
+        finally:
+            daemon.stopping.set()
+            daemon.wake.set()
+
+    thread = threading.Thread(target=client, daemon=True)
+    thread.start()
+    try:
+        daemon.run()
+    finally:
+        thread.join(timeout=10)
+        http.shutdown()
+        http.server_close()
+
+    assert seen["before"] == 503
+    assert seen["results"][0] == 200 and json.loads(seen["results"][1]) == json.loads((tmp_path / "jobs.json").read_text(encoding="utf-8"))
+    assert seen["markdown"].startswith("# Job-Finder Ergebnis".encode("utf-8"))
+    assert set(seen["status"]["sources"]) == {"StandIn000", "StandIn001"}
+    assert seen["missing"] == 404
+    # POST /refresh makes every source due again at once instead of after refreshHours.
+    assert seen["refresh"] == 202
+    assert daemon.cycles == 2 and seen["delta"] == []
+
+
+def wait_for(condition, timeout=20):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.05)
@@ -0,0 +1,67 @@
+import job_finder
+
+# Long enough that titles differing only in their unit number are still similar by Jaccard.
+LONG_TITLE = "Referent Digitalpolitik Netzpolitik Grundsatzfragen Europa Datenschutz Medienpolitik Bundestag"
+
+
+def job(source, title, company="", location="Berlin", url="", **fields):
+    return job_finder.Job(source=source, title=title, company=company, location=location, url=url, **fields)
+
+
+def titles(jobs, **kwargs):
+    return sorted(j.title for j in job_finder.dedupe_and_merge_jobs(jobs, **kwargs))
+
+
+def test_same_posting_from_another_source_is_merged():
+    jobs = [
+        job("Interamt", "Referentin (m/w/d) Digitalpolitik und Netzpolitik", "Stiftung Zukunft gGmbH", url="https://interamt.de/koop/app/stelle?id=4711",
+            publishedAt="2026-10-01"),
+        job("GoodJobs", "Referent:in Digitalpolitik, Netzpolitik", "GoodJobs", url="https://goodjobs.eu/jobs/referent-digitalpolitik",
+            description="Aufgaben im Team Digitales", remote=True),
+        # Reworded: one extra word, same employer with another legal form.
+        job("BMI", "Referent Digitalpolitik Netzpolitik Grundsatzfragen Europa", "Stiftung Zukunft", url="https://example.org/a"),
+        job("Arbeitnow", "Referent Digitalpolitik Netzpolitik Grundsatzfragen Europa Team", "Stiftung Zukunft e.V.", url="https://example.org/b"),
+    ]
+
+    merged = job_finder.dedupe_and_merge_jobs(jobs)
+    assert len(merged) == 2
+    first = next(j for j in merged if j.source in {"Interamt", "GoodJobs"})
+    # The merged record keeps the real employer and takes what its sibling knew.
+    assert (first.company, first.publishedAt, first.remote) == ("Stiftung Zukunft gGmbH", "2026-10-01", True)
+    assert first.description == "Aufgaben im Team Digitales"
+    assert len(titles(jobs, near_duplicates=False)) == 4
+
+
+def test_similar_but_distinct_postings_stay_apart():
+    jobs = [
+        job("Interamt", "Referent Digitalpolitik (m/w/d)", "Bundesministerium des Innern", url="https://example.org/1"),
+        job("Interamt", "Referent Haushalt (m/w/d)", "Bundesministerium des Innern", url="https://example.org/2"),
+        # Same role, different unit number, place or employer.
+        job("BMI", f"{LONG_TITLE} Referat 3", "Bundesministerium des Innern", url="https://example.org/3"),
+        job("BMI", f"{LONG_TITLE} Referat 4", "Bundesministerium des Innern", url="https://example.org/4"),
+        job("BMI", "Referent Digitalpolitik (m/w/d)", "Bundesministerium des Innern", "Bonn", url="https://example.org/5"),
+        job("GoodJobs", "Referent Digitalpolitik (m/w/d)", "Verband Digitales e.V.", url="https://example.org/6"),
+        # Without known employers short titles are not enough.
+        job("Arbeitnow", "Referent Digitalpolitik", "Arbeitnow", url="https://example.org/7"),
+    ]
+
+    assert len(job_finder.dedupe_and_merge_jobs([j.copy() for j in jobs])) == len(jobs)
+
+
+def test_native_id_matches_win_over_urls_and_titles():
+    jobs = [
+        job("StepStone", "Referent Politik (m/w/d)", "Verband Digitales e.V.",
+            url="https://www.stepstone.de/stellenangebote--Referent-Politik-Berlin-Verband--12345678-inline.html?rltr=1_1"),
+        # Same posting ID behind another URL and a title no near-duplicate test would accept.
+        job("StepStone", "Projektleitung Kommunikation", "StepStone", url="https://www.stepstone.de/job/12345678"),
+        # Same slug, other posting ID: a posting of its own.
+        job("StepStone", "Referent Politik Kommunikation Berlin (m/w/d)", "Verband Digitales e.V.",
+            url="https://www.stepstone.de/stellenangebote--Referent-Politik-Berlin-Verband--87654321-inline.html"),
+    ]
+
+    assert job_finder.dedupe_key(jobs[0]) == job_finder.dedupe_key(jobs[1]) == "stepstone:12345678"
+    merged = job_finder.dedupe_and_merge_jobs([j.copy() for j in jobs])
+    assert [(j.title, j.company) for j in merged] == [
+        ("Referent Politik (m/w/d)", "Verband Digitales e.V."),
+        ("Referent Politik Kommunikation Berlin (m/w/d)", "Verband Digitales e.V."),
+    ]
@@ -0,0 +1,49 @@
+import json
+
+import job_finder
+
+POSTING = {"@type": "JobPosting", "title": "Referent Digitalpolitik", "description": "<p>Aufgaben: <a href='/x'>Politik</a></p>",
+           "hiringOrganization": {"name": "Land Berlin"}}
+# Tags with attributes in either quote style, JSON-LD containing markup, anchors with nested markup and
+# URLs in attributes and text; the first meta description wins.
+PAGE = (
+    '<!doctype html><html><head><title>Stellen</title>'
+    '<meta property="og:description" content="Stellen &amp; Praktika im Land Berlin">'
+    '<meta name="description" content="zweite Beschreibung">'
+    f'<script type="application/ld+json">{json.dumps(POSTING)}</script>'
+    "<script>var a = 1 < 2;</script>"
+    "</head><body><nav><a href='/impressum'>Impressum</a></nav>"
+    + "".join(
+        f'<div class="job"><a href="https://www.karriereportal-stellen.berlin.de/stellen-{n}.html" title="Stelle {n}">'
+        f"<h3>Referent&shy;in {n}</h3><span>Berlin</span></a> https://www.karriereportal-stellen.berlin.de/job-{n}</div>"
+        for n in range(12)
+    )
+    + '<script type="application/ld+json">{"@graph": [{"@type": "JobPosting", "title": "Sachbearbeiter"}]}</script>'
+    + "</body></html>"
+)
+
+
+def extracted(chunks, **kwargs):
+    page = job_finder.PageExtractor(url_pattern=job_finder.KARRIEREPORTAL_URL_RE, **kwargs)
+    for chunk in chunks:
+        page.feed(chunk)
+    page.close()
+    return page.jsonld, page.anchors, page.meta_description, page.urls
+
+
+def test_chunked_feed_matches_one_piece():
+    whole = extracted([PAGE])
+    assert len(whole[0]) == 2 and len(whole[1]) == 13 and whole[2] == "Stellen & Praktika im Land Berlin"
+    assert len(whole[3]) == 24
+
+    for cut in range(len(PAGE) + 1):
+        assert extracted([PAGE[:cut], PAGE[cut:]]) == whole, cut
+    for size in (1, 7, 64):
+        assert extracted([PAGE[i : i + size] for i in range(0, len(PAGE), size)]) == whole, size
+
+
+def test_stop_after_first_jobposting_whatever_the_chunks():
+    whole = extracted([PAGE], stop_after_jobposting=True, anchors=False)
+    assert whole[0] == [json.dumps(POSTING)] and whole[1] == []
+    for size in (1, 13):
+        assert extracted([PAGE[i : i + size] for i in range(0, len(PAGE), size)], stop_after_jobposting=True, anchors=False)[:3] == whole[:3]
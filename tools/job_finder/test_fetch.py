@@ -0,0 +1,89 @@
+import gzip
+import io
+import zlib
+from email.message import Message
+
+import pytest
+
+import job_finder
+
+PAGE = "<html><body>" + "".join(f"<p>Referent:in Grundsatzfragen Nr. {i} – Förderung, Maßnahmen</p>" for i in range(200)) + "</body></html>"
+
+
+class FakeResponse:
+    def __init__(self, data: bytes, **headers):
+        self.headers = Message()
+        for k, v in headers.items():
+            self.headers[k.replace("_", "-")] = v
+        self._body = io.BytesIO(data)
+
+    def read(self, n=-1):
+        return self._body.read(n)
+
+
+def test_second_fetch_revalidates_and_serves_cached_body(standin, tmp_path):
+    server = standin({"https://portal.test/jobs": PAGE})
+    job_finder.configure_cache(tmp_path / "cache", 10)
+
+    assert job_finder.fetch_text("https://portal.test/jobs") == PAGE
+    assert job_finder.HTTP_CACHE.get("https://portal.test/jobs")["etag"]
+    assert job_finder.fetch_text("https://portal.test/jobs") == PAGE
+    assert server.stats()["notModified"] == 1
+
+
+def test_fresh_cache_entry_skips_the_request(standin, tmp_path):
+    server = standin({"https://portal.test/jobs": PAGE})
+    job_finder.configure_cache(tmp_path / "cache", 10)
+
+    job_finder.fetch_text("https://portal.test/jobs", max_age_hours=1)
+    assert job_finder.fetch_text("https://portal.test/jobs", max_age_hours=1) == PAGE
+    assert server.stats()["requests"] == 1
+
+
+def test_unchanged_listing_is_not_tokenized_again(standin, tmp_path, monkeypatch):
+    listing = "<html><body>" + "".join(f'<a href="/stelle/{i}.html">Referent Politik {i}</a>' for i in range(20)) + "</body></html>"
+    standin({"https://portal.test/jobs": listing})
+    job_finder.configure_cache(tmp_path / "cache", 10)
+    fed = []
+    feed = job_finder.PageExtractor.feed
+    monkeypatch.setattr(job_finder.PageExtractor, "feed", lambda self, chunk: fed.append(len(chunk)) or feed(self, chunk))
+
+    jobs = job_finder.fetch_listing_jobs("Portal", "https://portal.test/jobs")
+    assert len(jobs) == 20 and fed
+    fed.clear()
+
+    # 304 and still-fresh bodies hit the parse cache by content digest before any tokenizing.
+    assert [j.to_dict() for j in job_finder.fetch_listing_jobs("Portal", "https://portal.test/jobs")] == [j.to_dict() for j in jobs]
+    assert [j.to_dict() for j in job_finder.fetch_listing_jobs("Portal", "https://portal.test/jobs", max_age_hours=1)] == [j.to_dict() for j in jobs]
+    assert fed == []
+
+
+def test_gzip_body_is_decoded_and_counted_compressed(standin):
+    standin({"https://portal.test/jobs": PAGE})
+
+    with job_finder.METRICS.attribute("Portal"):
+        assert job_finder.fetch_text("https://portal.test/jobs") == PAGE
+    assert 0 < job_finder.METRICS.to_dict()["sources"]["Portal"]["bytes"] < len(PAGE.encode("utf-8"))
+
+
+@pytest.mark.parametrize("wbits", [zlib.MAX_WBITS, -zlib.MAX_WBITS], ids=["zlib", "raw"])
+def test_deflate_with_and_without_zlib_header(wbits):
+    comp = zlib.compressobj(wbits=wbits)
+    data = comp.compress(PAGE.encode("utf-8")) + comp.flush()
+    r = FakeResponse(data, Content_Encoding="deflate", Content_Type="text/html; charset=utf-8")
+
+    assert "".join(job_finder.iter_response_text(r, 1 << 20)) == PAGE
+
+
+def test_charset_comes_from_content_type():
+    text = "Referentin für Förderung und Maßnahmen"
+    r = FakeResponse(text.encode("iso-8859-1"), Content_Type="text/html; charset=ISO-8859-1")
+
+    assert "".join(job_finder.iter_response_text(r, 1 << 20)) == text
+
+
+def test_size_limit_applies_to_decoded_body():
+    r = FakeResponse(gzip.compress(b"0" * 200_000), Content_Encoding="gzip")
+
+    with pytest.raises(ValueError):
+        b"".join(job_finder.iter_response_bytes(r, 50_000))
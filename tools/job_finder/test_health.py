@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import job_finder
+
+URL = "https://flaky.test/jobs"
+
+
+@pytest.fixture
+def no_wait(monkeypatch):
+    monkeypatch.setattr(job_finder, "RETRY_MAX_SECONDS", 0.01)
+
+
+def test_transient_status_is_retried_then_raised(standin, no_wait):
+    server = standin({URL: "<html></html>"}, error_rate=1.0, error_kinds=("503",))
+
+    with pytest.raises(job_finder.HTTPError) as err:
+        job_finder.fetch_text(URL)
+    assert err.value.code == 503
+    assert server.stats()["requests"] == 1 + job_finder.RETRY_ATTEMPTS
+
+
+def test_permanent_status_is_not_retried(standin, no_wait):
+    server = standin({})
+
+    with pytest.raises(job_finder.HTTPError):
+        job_finder.fetch_text(URL)
+    assert server.stats()["requests"] == 1
+
+
+def test_reset_connection_succeeds_on_retry(standin, no_wait, monkeypatch):
+    standin({URL: "<html>ok</html>"})
+    once = job_finder.fetch_text_once
+    calls = []
+
+    def flaky(url, on_chunk=None, keep=False):
+        calls.append(url)
+        if len(calls) == 1:
+            raise ConnectionResetError("reset")
+        return once(url, on_chunk, keep)
+
+    monkeypatch.setattr(job_finder, "fetch_text_once", flaky)
+    assert job_finder.fetch_text(URL) == "<html>ok</html>"
+    assert len(calls) == 2
+
+
+def test_no_retry_once_a_stream_consumer_saw_data(no_wait, monkeypatch):
+    def broken(url, on_chunk=None, keep=False):
+        on_chunk("{")
+        raise ConnectionResetError("reset")
+
+    monkeypatch.setattr(job_finder, "fetch_text_once", broken)
+    seen = []
+    with pytest.raises(ConnectionResetError):
+        job_finder.fetch_text(URL, on_chunk=seen.append)
+    assert seen == ["{"]
+
+
+def test_retry_after_wins_over_backoff_up_to_the_cap():
+    err = job_finder.HTTPError(URL, 429, "Too Many Requests", {"Retry-After": "3"}, None)
+
+    assert job_finder.retry_delay(0, err) == 3
+    assert job_finder.retry_delay(0, job_finder.HTTPError(URL, 429, "", {"Retry-After": "600"}, None)) == job_finder.RETRY_MAX_SECONDS
+
+
+def test_circuit_opens_probes_and_closes(tmp_path):
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    health = job_finder.SourceHealth(tmp_path / "health.json", failure_threshold=2, cooldown_hours=1)
+
+    health.record("Interamt", False, 1.0, "HTTP 503", now=now)
+    assert health.allow("Interamt", now=now)
+    health.record("Interamt", False, 1.0, "HTTP 503", now=now)
+    assert not health.allow("Interamt", now=now + timedelta(minutes=30))
+
+    # After the cooldown one probe run is let through; a failing probe opens the circuit again.
+    assert health.allow("Interamt", now=now + timedelta(hours=2))
+    health.record("Interamt", False, 1.0, "HTTP 503", now=now + timedelta(hours=2))
+    assert not health.allow("Interamt", now=now + timedelta(hours=2, minutes=1))
+
+    assert health.allow("Interamt", now=now + timedelta(hours=4))
+    health.record("Interamt", True, 0.5, now=now + timedelta(hours=4))
+    health.save()
+
+    reloaded = job_finder.SourceHealth(tmp_path / "health.json", failure_threshold=2, cooldown_hours=1)
+    assert reloaded.report()["Interamt"]["state"] == "closed"
+    assert reloaded.report()["Interamt"]["successRate"] == 0.25
+
+
+def test_open_source_is_skipped_without_a_request(standin, no_wait):
+    server = standin({})
+    cfg = dict(job_finder.DEFAULT_CONFIG, sources=[{"name": "Flaky", "url": URL}], allowedSources=["Flaky"])
+    job_finder.configure_health(None, dict(cfg, circuitFailureThreshold=1, circuitCooldownHours=1))
+
+    jobs, warnings = job_finder.fetch_sources(cfg)
+    assert jobs == [] and warnings[0].startswith("Flaky fehlgeschlagen")
+    requests = server.stats()["requests"]
+
+    jobs, warnings = job_finder.fetch_sources(cfg)
+    assert warnings[0].startswith("Flaky pausiert bis") and warnings[0].endswith("uebersprungen")
+    assert server.stats()["requests"] == requests
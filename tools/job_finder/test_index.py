@@ -0,0 +1,72 @@
+import json
+from datetime import date, datetime, timedelta, timezone
+
+import job_finder
+
+CFG = dict(job_finder.DEFAULT_CONFIG, keywordsMust=["referent"], minimumScore=-100, maxResults=100)
+
+
+def ago(days):
+    return (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+
+
+def stepstone(n, title="Referent Politik"):
+    return job_finder.Job(source="StepStone", title=f"{title} {n}", url=f"https://www.stepstone.de/stellenangebote--job-{n}-inline.html")
+
+
+def detail_page(n):
+    posting = {"@type": "JobPosting", "title": "x", "hiringOrganization": {"name": f"Verband {n} e.V."},
+               "jobLocation": {"@type": "Place", "address": {"addressLocality": "Berlin"}},
+               "datePosted": (date.today() - timedelta(days=n)).isoformat(), "description": f"Politik {n}"}
+    return f'<html><head><script type="application/ld+json">{json.dumps(posting)}</script></head><body></body></html>'
+
+
+def test_unchanged_postings_reuse_their_stored_details(standin, tmp_path):
+    jobs = [stepstone(n) for n in range(5)]
+    server = standin({j.url: detail_page(n) for n, j in enumerate(jobs)})
+    index = job_finder.JobIndex(tmp_path / "jobs.sqlite")
+
+    def run(listing):
+        result = job_finder.run_pipeline(CFG, index, fetch=lambda *a: ([j.copy() for j in listing], []))
+        return result, sorted((j.title, j.company, j.publishedAt) for j in result["ranked"])
+
+    first, ranked = run(jobs)
+    assert server.stats()["requests"] == 5 and first["reused"] == 0
+    assert len(first["delta"]) == 5
+
+    again, same = run(jobs)
+    assert server.stats()["requests"] == 5 and again["reused"] == 5
+    assert same == ranked and again["delta"] == []
+
+    # A posting whose list-page data changed is enriched again; the rest stay reused.
+    changed = jobs[:4] + [jobs[4].copy(title="Referentin Politik 4")]
+    third, _ = run(changed)
+    assert server.stats()["requests"] == 6 and third["reused"] == 4
+    index.close()
+
+
+def test_carry_over_rebuilds_recent_postings_of_stopped_sources(tmp_path):
+    index = job_finder.JobIndex(tmp_path / "jobs.sqlite")
+    recent = [stepstone(n).copy(company="Land Berlin", publishedAt="2026-10-01", tags=["politik"]) for n in range(3)]
+    other = job_finder.Job(source="Interamt", title="Referent Haushalt", url="https://interamt.de/koop/app/stelle?id=1")
+    index.record(recent + [other], {}, ago(1))
+    index.record([stepstone(9)], {}, ago(40))
+
+    carried = index.carry_over({"stepstone"}, ago(30), {job_finder.job_key(recent[0])})
+    assert sorted(j.to_dict()["url"] for j in carried) == sorted(j.url for j in recent[1:])
+    assert carried[0].to_dict() == next(j for j in recent if j.url == carried[0].url).to_dict()
+    index.close()
+
+
+def test_prune_drops_postings_not_seen_within_the_retention(tmp_path):
+    index = job_finder.JobIndex(tmp_path / "jobs.sqlite")
+    index.record([stepstone(1)], {}, ago(100))
+    index.record([stepstone(2)], {}, ago(1))
+    # Seen again recently: last_seen moves, first_seen stays.
+    index.record([stepstone(3)], {}, ago(100))
+    index.record([stepstone(3)], {}, ago(0))
+
+    index.prune(30)
+    assert index.keys() == {job_finder.job_key(stepstone(2)), job_finder.job_key(stepstone(3))}
+    assert index.record([stepstone(1), stepstone(2)], {}, ago(0)) == {job_finder.job_key(stepstone(1))}
+    index.close()
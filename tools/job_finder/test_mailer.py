@@ -0,0 +1,40 @@
+import job_finder
+from cloud_job_mailer import select_jobs
+
+CFG = dict(job_finder.DEFAULT_CONFIG, keywordsMust=["referent"], minimumScore=5, maxResults=12)
+
+
+def posting(source, n, title, age):
+    return {"source": source, "title": f"{title} {n}", "company": "Land Berlin", "url": f"https://{source.lower()}.test/{n}",
+            "ageDays": age, "score": 10 if title.startswith("Referent") else 0}
+
+
+def test_newest_first_with_caps_and_quota_top_up():
+    candidates = (
+        [posting("Interamt", n, "Referent", n) for n in range(8)]
+        + [posting("Arbeitnow", n, "Referent", 20 + n) for n in range(8)]
+        + [posting("StudySmarter", n, "Werkstudent", n) for n in range(3)]
+    )
+
+    picked = select_jobs(candidates, 5, 12)
+
+    # Interamt is capped at 5, newest first; Arbeitnow fills the list before the rest of Interamt could.
+    assert [j["title"] for j in picked if j["source"] == "Interamt"] == [f"Referent {n}" for n in range(5)]
+    assert [j["source"] for j in picked[5:]] == ["Arbeitnow"] * 7
+    # With room left the capped Interamt postings come next, then StudySmarter is topped up below minimumScore.
+    wider = select_jobs(candidates, 5, 20)
+    assert [j["source"] for j in wider[13:]] == ["Interamt"] * 3 + ["StudySmarter"] * 3
+
+
+def test_shared_crawl_keeps_score_order_and_adds_candidates():
+    jobs = [job_finder.Job(source="Interamt", title=t, url=f"https://interamt.test/{n}", publishedAt=None)
+            for n, t in enumerate(["Referent Politik", "Sachbearbeiter", "Referentin Haushalt", "Praktikum"])]
+
+    def run(score_all):
+        return job_finder.run_pipeline(CFG, fetch=lambda *a: ([j.copy() for j in jobs], []), score_all=score_all)
+
+    plain, shared = run(False), run(True)
+    assert [j.to_dict() for j in shared["ranked"]] == [j.to_dict() for j in plain["ranked"]]
+    assert plain["candidates"] is None
+    assert sorted(j.title for j in shared["candidates"]) == sorted(j.title for j in jobs)
+    assert all(j.reasons is not None for j in shared["candidates"])
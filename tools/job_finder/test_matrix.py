@@ -0,0 +1,44 @@
+import random
+from pathlib import Path
+
+import pytest
+
+import job_finder
+
+pytest.importorskip("numpy")
+
+from bench_job_finder import job_list  # noqa: E402
+
+HERE = Path(__file__).resolve().parent
+BASE = [job_finder.load_config(HERE / name) for name in ("job_profile.example.json", "job_profile.moritzfrisch.json")]
+PROFILES = BASE + [
+    dict(BASE[0], keywordMatch="word"),
+    dict(BASE[1], keywordsMust=[], excludeKeywords=["praktikum", "hamburg"], locationsPreferred=["berlin", "remote"]),
+]
+
+
+def test_matrix_scores_equal_python_scores():
+    jobs = job_list(random.Random(5), 600)
+    matrix = job_finder.ScoreMatrix(jobs, PROFILES)
+
+    for cfg in PROFILES:
+        scores, excluded = matrix.scores(cfg)
+        for k, j in enumerate(jobs):
+            hits = job_finder.match_job(j, cfg)
+            assert matrix.hits(j, cfg) == hits
+            assert int(scores[k]) == job_finder.score(j.copy(), cfg, hits).score
+            assert bool(excluded[k]) == job_finder.contains_excluded(j, cfg, hits)
+
+
+@pytest.mark.parametrize("relevance", ["rules", "tfidf"])
+def test_numpy_backend_ranks_like_python(relevance):
+    jobs = job_list(random.Random(11), 400)
+
+    def ranked(backend):
+        profiles = [dict(p, scoringBackend=backend, relevance=relevance, minimumScore=0, maxResults=50) for p in PROFILES]
+        results = job_finder.run_pipeline(job_finder.crawl_config(profiles), fetch=lambda *a: ([j.copy() for j in jobs], []), profiles=profiles)
+        return [[j.to_dict() for j in r["ranked"]] for r in results]
+
+    python = ranked("python")
+    assert any(python)
+    assert ranked("numpy") == python
@@ -0,0 +1,114 @@
+import json
+import random
+from datetime import date, timedelta
+
+import pytest
+
+import job_finder
+
+ROLES = ["Referent", "Referentin", "Sachbearbeiter", "Projektmanager"]
+TOPICS = ["Digitalpolitik", "Haushalt", "Praktikum Kommunikation", "Grundsatzfragen"]
+COMPANIES = ["Bundesministerium des Innern", "Stiftung Zukunft gGmbH", "Stiftung Zukunft", ""]
+PLACES = ["Berlin", "Hamburg", ""]
+PROFILES = [
+    {"excludeKeywords": ["praktikum"]},
+    {"strictLocations": ["berlin"], "keywordsNice": ["haushalt"]},
+    {"remoteOnly": True, "excludeKeywords": ["hamburg"]},
+]
+
+
+def days_ago(n):
+    return (date.today() - timedelta(days=n)).isoformat()
+
+
+def gesines_page(title, company, place, published):
+    posting = {"@type": "JobPosting", "title": title, "hiringOrganization": {"name": company}, "datePosted": published,
+               "jobLocation": {"@type": "Place", "address": {"addressLocality": place}}, "description": f"{title} bei {company}"}
+    return f'<html><head><script type="application/ld+json">{json.dumps(posting)}</script></head><body></body></html>'
+
+
+def postings(seed):
+    # List-page records with duplicate URLs, conflicting fields and near-duplicate titles, plus the Gesines
+    # detail pages that fill in what their listings leave out.
+    rng = random.Random(seed)
+    jobs, pages = [], {}
+    for n in range(40):
+        # Most titles are told apart by their Referat number; the rest can be near duplicates of each other.
+        title = f"{rng.choice(ROLES)} {rng.choice(TOPICS)}" + (f" Referat {rng.randrange(1, 9)}" if rng.random() < 0.7 else "") + rng.choice(["", " (m/w/d)"])
+        if rng.random() < 0.25:
+            url = f"https://gesinesjobtipps.de/job/{seed}-{n}/"
+            pages[url] = gesines_page(title, rng.choice(COMPANIES[:3]), rng.choice(PLACES), days_ago(rng.choice([1, 3, 40])))
+            jobs.append(job_finder.Job(source="GesinesJobtipps", title=title, company="GesinesJobtipps", url=url))
+            continue
+        url = f"https://www.bund.de/stelle/{rng.randrange(60)}.html"
+        jobs.append(
+            job_finder.Job(
+                source=rng.choice(["BMI", "Interamt", "GoodJobs"]),
+                title=title,
+                company=rng.choice(COMPANIES),
+                location=rng.choice(PLACES),
+                remote=rng.random() < 0.5,
+                description=rng.choice(["", "Aufgaben im Referat", "Pflichtpraktikum moeglich"]),
+                url=url,
+                publishedAt=rng.choice([None, days_ago(2), days_ago(30)]),
+            )
+        )
+    return jobs, pages
+
+
+def profile_config(profile):
+    return dict(job_finder.DEFAULT_CONFIG, keywordsMust=["referent"], minimumScore=0, maxResults=100, **profile)
+
+
+def run(profile, jobs, pushdown=True, monkeypatch=None):
+    cfg = profile_config(profile)
+    if not pushdown:
+        monkeypatch.setattr(job_finder, "pushdown_groups", lambda jobs, *a, **k: (jobs, [], 0))
+        monkeypatch.setattr(job_finder, "pushdown_filters", lambda jobs, *a, **k: (jobs, [], 0))
+    result = job_finder.run_pipeline(cfg, fetch=lambda *a: ([j.copy() for j in jobs], []))
+    monkeypatch.undo()
+    return [j.to_dict() for j in result["ranked"]], result["total"]
+
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("profile", PROFILES, ids=["exclude", "strict", "remote"])
+def test_pushdown_gives_the_same_results_as_filtering_after_dedupe(standin, monkeypatch, seed, profile):
+    jobs, pages = postings(seed)
+    standin(pages)
+
+    assert job_finder.pushdown_groups([j.copy() for j in jobs], profile_config(profile))[1]
+    assert run(profile, jobs, True, monkeypatch) == run(profile, jobs, False, monkeypatch)
+
+
+def test_group_survives_if_its_merged_record_passes(monkeypatch):
+    # One record of the group alone fails lookbackDays, another fails on its title; merged they pass.
+    old = days_ago(60)
+    jobs = [
+        job_finder.Job(source="BMI", title="Referent Digitalpolitik (m/w/d)", company="Bundesministerium des Innern", url="https://www.bmi.bund.de/stelle/1.html", publishedAt=old),
+        job_finder.Job(source="BMI", title="Referent Digitalpolitik", company="", url="https://www.bmi.bund.de/stelle/1.html"),
+        job_finder.Job(source="BMI", title="Referent Haushalt (m/w/d)", company="Bundesministerium des Innern", url="https://www.bmi.bund.de/stelle/2.html"),
+        job_finder.Job(source="BMI", title="Referent Praktikum Kommunikation", company="Bundesministerium des Innern", url="https://www.bmi.bund.de/stelle/3.html"),
+        job_finder.Job(source="BMI", title="Referentin Praktikum Kommunikation (m/w/d)", company="Bundesministerium des Innern", url="https://www.bmi.bund.de/stelle/3.html"),
+    ]
+    profile = {"excludeKeywords": ["praktikum"]}
+
+    ranked, total = run(profile, jobs, True, monkeypatch)
+    assert [j["title"] for j in ranked] == ["Referent Haushalt (m/w/d)"]
+    assert total == 3
+    assert (ranked, total) == run(profile, jobs, False, monkeypatch)
+
+
+def test_total_counts_streamed_drops_once(monkeypatch):
+    jobs = [
+        job_finder.Job(source="Arbeitnow", title="Referent Politik", url="https://www.arbeitnow.com/jobs/a"),
+        job_finder.Job(source="Arbeitnow", title="Referent Politik", url="https://www.arbeitnow.com/jobs/a"),
+        job_finder.Job(source="Arbeitnow", title="Referent Haushalt", url="https://www.arbeitnow.com/jobs/b"),
+    ]
+
+    def fetch(*a):
+        # The feed dropped a posting also fetched from another page, and one it never kept.
+        job_finder.METRICS.add_streamed_out({job_finder.dedupe_key(jobs[2]), "https://www.arbeitnow.com/jobs/c"})
+        return [j.copy() for j in jobs], []
+
+    cfg = dict(job_finder.DEFAULT_CONFIG, keywordsMust=["referent"], minimumScore=0)
+    assert job_finder.run_pipeline(cfg, fetch=fetch)["total"] == 3
@@ -0,0 +1,98 @@
+import json
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import job_finder
+
+CFG = dict(job_finder.DEFAULT_CONFIG, relevance="tfidf", keywordsMust=["referent"], keywordsNice=["digitalpolitik", "datenschutz"], minimumScore=0)
+
+
+def posting(n, title, description=""):
+    return job_finder.Job(source="Interamt", title=title, company="Land Berlin", location="Berlin", description=description,
+                          url=f"https://interamt.test/stelle/{n}.html")
+
+
+JOBS = [
+    posting(1, "Referent Digitalpolitik", "Digitalpolitik und Datenschutz im Referat"),
+    posting(2, "Referentin Haushalt", "Haushalt und Controlling"),
+    posting(3, "Sachbearbeiter Datenschutz"),
+    posting(4, "Projektmanager Kommunikation", "Kommunikation"),
+]
+
+
+def expected_stats(index):
+    # Document frequencies recounted from scratch over every stored posting.
+    df = {}
+    rows = index.db.execute("SELECT data FROM jobs").fetchall()
+    for (data,) in rows:
+        for t in job_finder.relevance_terms(job_finder.job_haystack(job_finder.Job.from_dict(json.loads(data)))):
+            df[t] = df.get(t, 0) + 1
+    return len(rows), df
+
+
+def ago(days):
+    return (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+
+
+def test_similarity_ranks_by_keywords_with_either_backend(monkeypatch):
+    docs, df = job_finder.relevance_stats(JOBS, {id(j): job_finder.relevance_terms(job_finder.job_haystack(j)) for j in JOBS})
+    model = job_finder.RelevanceModel(JOBS, docs, df)
+
+    sims = model.similarity(CFG)
+    assert sims[0] == max(sims) and sims[3] == 0.0
+    assert all(0.0 <= s <= 1.0 for s in sims)
+    assert model.similarity(dict(CFG, keywordsMust=[], keywordsNice=[])) == [0.0] * len(JOBS)
+
+    monkeypatch.setattr(job_finder, "numpy_module", lambda: None)
+    assert job_finder.RelevanceModel(JOBS, docs, df).similarity(CFG) == pytest.approx(sims)
+
+
+def test_document_frequencies_follow_record_change_and_prune(tmp_path):
+    index = job_finder.JobIndex(tmp_path / "jobs.sqlite")
+    # Recorded while relevance was off: counted by the next sync.
+    index.record(JOBS[:2], {}, ago(60))
+    index.record(JOBS[2:], {}, ago(0))
+    assert index.idf_stats() == (0, {})
+    assert index.sync_idf() == expected_stats(index)
+
+    changed = JOBS[3].copy(description="Kommunikation und Digitalpolitik")
+    index.record([changed], {}, ago(0))
+    assert index.sync_idf() == expected_stats(index)
+
+    # Pruned postings leave the counts; terms no remaining posting has disappear.
+    index.prune(30)
+    assert index.sync_idf() == expected_stats(index) == (2, expected_stats(index)[1])
+    assert "haushalt" not in index.idf_stats()[1]
+    index.close()
+
+
+def test_counts_without_posting_list_are_rebuilt(tmp_path):
+    path = tmp_path / "jobs.sqlite"
+    index = job_finder.JobIndex(path)
+    index.record(JOBS, {}, ago(0))
+    index.close()
+    db = sqlite3.connect(str(path))
+    with db:
+        db.execute("DROP TABLE idf_docs")
+        db.execute("INSERT INTO idf (term, df) VALUES ('', 99), ('referent', 42)")
+    db.close()
+
+    index = job_finder.JobIndex(path)
+    assert index.idf_stats() == (0, {})
+    assert index.sync_idf() == expected_stats(index)
+    index.close()
+
+
+def test_index_counts_match_the_run_without_index(tmp_path):
+    def run(cfg, index=None):
+        result = job_finder.run_pipeline(cfg, index, fetch=lambda *a: ([j.copy() for j in JOBS], []))
+        return [(j.title, j.score) for j in result["ranked"]]
+
+    index = job_finder.JobIndex(tmp_path / "jobs.sqlite")
+    # A rules run stores the postings without counting them; the TF-IDF run after it must not miss them.
+    run(dict(CFG, relevance="rules"), index)
+    assert run(CFG, index) == run(CFG)
+    assert index.idf_stats() == expected_stats(index)
+    index.close()
@@ -0,0 +1,80 @@
+import os
+
+import job_finder
+
+PORTAL = "https://portal.test"
+
+
+def test_keep_alive_connection_is_reused(standin):
+    standin({f"{PORTAL}/jobs?page=1": "<html>1</html>", f"{PORTAL}/jobs?page=2": "<html>2</html>"})
+    key = ("https", "portal.test", 443)
+
+    job_finder.fetch_text(f"{PORTAL}/jobs?page=1")
+    [conn] = job_finder.HTTP_POOL._idle[key]
+    job_finder.fetch_text(f"{PORTAL}/jobs?page=2")
+
+    assert job_finder.HTTP_POOL._idle[key] == [conn]
+
+
+class Done:
+    # A fully read keep-alive response / the connection it came on.
+    will_close = False
+
+    def isclosed(self):
+        return True
+
+    def close(self):
+        self.closed = True
+
+
+def test_idle_connections_are_capped_by_the_host_limit():
+    job_finder.HOST_LIMITS["portal.test"] = 4
+    job_finder.HOST_LIMITS["other.test:8080"] = 3
+    conns = {key: [Done() for _ in range(6)] for key in [("https", "portal.test", 443), ("http", "other.test", 8080), ("https", "plain.test", 443)]}
+    for key, group in conns.items():
+        for conn in group:
+            job_finder.HTTP_POOL.release(key, conn, Done())
+
+    # Registry limits win over hostConcurrency (2) for the hosts that have one.
+    assert {key[1]: len(job_finder.HTTP_POOL._idle[key]) for key in conns} == {"portal.test": 4, "other.test": 3, "plain.test": 2}
+    assert all(hasattr(c, "closed") == (c not in job_finder.HTTP_POOL._idle[key]) for key, group in conns.items() for c in group)
+
+
+def test_not_modified_response_keeps_its_connection(standin, tmp_path):
+    server = standin({f"{PORTAL}/jobs": "<html>jobs</html>"})
+    job_finder.configure_cache(tmp_path / "cache", 10)
+    key = ("https", "portal.test", 443)
+
+    job_finder.fetch_text(f"{PORTAL}/jobs")
+    [conn] = job_finder.HTTP_POOL._idle[key]
+    job_finder.fetch_text(f"{PORTAL}/jobs")
+
+    assert server.stats()["notModified"] == 1
+    assert job_finder.HTTP_POOL._idle[key] == [conn]
+
+
+def test_session_cookie_is_sent_back(standin, monkeypatch):
+    standin({f"{PORTAL}/login": (200, {"Set-Cookie": "session=abc; Path=/"}, "ok"), f"{PORTAL}/jobs": "jobs"})
+    sent = []
+    request = job_finder.HTTP_POOL.request
+    monkeypatch.setattr(job_finder.HTTP_POOL, "request", lambda url, headers: sent.append(headers) or request(url, headers))
+
+    job_finder.fetch_text(f"{PORTAL}/login")
+    job_finder.fetch_text(f"{PORTAL}/jobs")
+
+    assert "Cookie" not in sent[0]
+    assert sent[1]["Cookie"] == "session=abc"
+
+
+def test_cookie_jar_persists_session_cookies(standin, tmp_path):
+    standin({f"{PORTAL}/login": (200, {"Set-Cookie": "session=abc; Path=/"}, "ok")})
+    jar = tmp_path / "cookies.lwp"
+    job_finder.configure_session(jar)
+
+    job_finder.fetch_text(f"{PORTAL}/login")
+    job_finder.close_session()
+    job_finder.COOKIE_JAR.clear()
+    job_finder.configure_session(jar)
+
+    assert os.stat(jar).st_mode & 0o777 == 0o600
+    assert [(c.domain, c.name, c.value) for c in job_finder.COOKIE_JAR] == [("portal.test", "session", "abc")]
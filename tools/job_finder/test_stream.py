@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+import job_finder
+
+# An Arbeitnow feed page with top-level scalars a cut can leave looking complete ("-350." / "1.5e" / "fals"),
+# literals, escapes and nested members before and after the array.
+BODY = json.dumps(
+    {
+        "score": -350.0,
+        "meta": {"page": 1, "weight": 1.5e3},
+        "data": [
+            {"slug": "referent-digitalpolitik-berlin-1", "company_name": "Verband Digitales e.V.", "title": "Referent Digitalpolitik (m/w/d)",
+             "description": "<p>Politik &amp; Kommunikation – \"Grundsatzfragen\"</p>", "remote": False, "url": "https://www.arbeitnow.com/jobs/1",
+             "tags": ["politics", "public affairs"], "job_types": [], "location": "Berlin", "created_at": 1760000000, "salary": -350.0},
+            {"slug": "sachbearbeiter-haushalt-2", "company_name": "Land Berlin", "title": "Sachbearbeiter Haushalt", "description": "",
+             "remote": True, "url": "https://www.arbeitnow.com/jobs/2", "tags": [], "job_types": ["full time"], "location": None,
+             "created_at": 1759990000, "salary": 12e-1},
+            {"slug": "praktikum-3", "company_name": "Stiftung Zukunft", "title": "Praktikum Kommunikation", "description": "Praktikum",
+             "remote": False, "url": "https://www.arbeitnow.com/jobs/3", "tags": ["intern"], "job_types": [], "location": "Hamburg",
+             "created_at": 1759980000, "salary": 0},
+        ],
+        "links": {"first": "https://www.arbeitnow.com/api/job-board-api?page=1", "next": None},
+        "took": 1.5e3,
+        "cached": False,
+    },
+    indent=1,
+)
+
+
+def stream(chunks):
+    items = []
+    s = job_finder.JsonItemStream("data", items.append)
+    for chunk in chunks:
+        s.feed(chunk)
+    s.close()
+    return items, s.rest
+
+
+def test_every_split_gives_the_same_items_as_json_loads():
+    expected = json.loads(BODY)
+    rest = {k: v for k, v in expected.items() if k != "data"}
+    for cut in range(len(BODY) + 1):
+        assert stream([BODY[:cut], BODY[cut:]]) == (expected["data"], rest), cut
+    assert stream(BODY) == (expected["data"], rest)
+
+
+def test_truncated_body_is_an_error():
+    with pytest.raises(ValueError):
+        stream([BODY[: BODY.index('"links"')]])
+    with pytest.raises(ValueError):
+        stream(['{"score": -350.'])
+
+
+def test_feed_drops_filtered_postings_while_parsing():
+    filters = [("excludeKeywords", {"title"}, lambda j: "praktikum" not in job_finder.norm(j.title))]
+    feed = job_finder.ApiFeed("data", job_finder.arbeitnow_job, filters=filters, lookback_days=10**6)
+    for n in range(0, len(BODY), 7):
+        feed.feed(BODY[n : n + 7])
+    feed.close()
+
+    expected = [job_finder.arbeitnow_job(i) for i in json.loads(BODY)["data"]]
+    assert [j.to_dict() for j in feed.jobs] == [j.to_dict() for j in expected[:2]]
+    assert feed.dropped == {"excludeKeywords": 1}
+    assert feed.dropped_keys == {job_finder.dedupe_key(expected[2])}
+    assert feed.recent